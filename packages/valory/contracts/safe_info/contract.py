@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the class to read the parts of a Gnosis Safe's state which the `gnosis_safe` contract does not expose."""
+
+from typing import Any
+
+from aea.common import JSONLike
+from aea.configurations.base import PublicId
+from aea.contracts.base import Contract
+from aea.crypto.base import LedgerApi
+from aea_ledger_ethereum import EthereumApi
+
+
+PUBLIC_ID = PublicId.from_str("valory/safe_info:0.1.0")
+
+
+class SafeInfoContract(Contract):
+    """The Gnosis Safe info contract."""
+
+    contract_id = PUBLIC_ID
+
+    @classmethod
+    def get_raw_transaction(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> JSONLike:
+        """Get the Safe transaction."""
+        raise NotImplementedError
+
+    @classmethod
+    def get_raw_message(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> bytes:
+        """Get raw message."""
+        raise NotImplementedError
+
+    @classmethod
+    def get_state(
+        cls, ledger_api: LedgerApi, contract_address: str, **kwargs: Any
+    ) -> JSONLike:
+        """Get state."""
+        raise NotImplementedError
+
+    @classmethod
+    def get_domain(cls, ledger_api: EthereumApi, contract_address: str) -> JSONLike:
+        """
+        Get the Safe's version and the id of the chain on which it is deployed, which determine its EIP-712 domain.
+
+        :param ledger_api: the ledger API object
+        :param contract_address: the contract address
+        :return: the Safe's version and the chain id
+        """
+        safe_contract = cls.get_instance(ledger_api, contract_address)
+        version = safe_contract.functions.VERSION().call(block_identifier="latest")
+        return dict(version=version, chain_id=ledger_api.api.eth.chain_id)
+
+    @classmethod
+    def get_threshold(cls, ledger_api: EthereumApi, contract_address: str) -> JSONLike:
+        """
+        Get the number of the Safe's owners which are required to confirm a transaction.
+
+        :param ledger_api: the ledger API object
+        :param contract_address: the contract address
+        :return: the Safe's threshold
+        """
+        safe_contract = cls.get_instance(ledger_api, contract_address)
+        threshold = safe_contract.functions.getThreshold().call(
+            block_identifier="latest"
+        )
+        return dict(threshold=threshold)
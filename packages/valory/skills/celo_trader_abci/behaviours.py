@@ -20,13 +20,36 @@
 """This package contains round behaviours of CeloTraderAbciApp."""
 
 import json
+import re
 import uuid
 from abc import ABC
 from dataclasses import asdict
-from typing import Any, Dict, Generator, List, Optional, Set, Type, cast
+from itertools import groupby
+from operator import itemgetter
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    cast,
+)
 
-from packages.valory.contracts.gnosis_safe.contract import GnosisSafeContract
+from packages.valory.contracts.gnosis_safe.contract import (
+    GnosisSafeContract,
+    SafeOperation,
+)
+from packages.valory.contracts.multisend.contract import (
+    MultiSendContract,
+    MultiSendOperation,
+)
+from packages.valory.contracts.safe_info.contract import SafeInfoContract
 from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.protocols.ledger_api import LedgerApiMessage
 from packages.valory.skills.abstract_round_abci.base import AbstractRound
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
@@ -35,15 +58,25 @@ from packages.valory.skills.abstract_round_abci.behaviours import (
 from packages.valory.skills.celo_trader_abci.models import Params, SharedState
 from packages.valory.skills.celo_trader_abci.payloads import (
     DecisionMakingPayload,
-    PostTxDecisionMakingPayload,
+    SettlementRetryPayload,
+    UserRequestsPayload,
+)
+from packages.valory.skills.celo_trader_abci.prompt_cache import (
+    PromptCache,
+    get_cache_key,
 )
 from packages.valory.skills.celo_trader_abci.rounds import (
     CeloTraderAbciApp,
+    CollectUserRequestsRound,
     DecisionMakingRound,
     Event,
     PostTxDecisionMakingRound,
+    REQUEST_ID_KEY,
+    SettlementRetryRound,
     SynchronizedData,
+    TRANSFER_KEY,
 )
+from packages.valory.skills.celo_trader_abci.status import RequestStatus, STATUS_KEY
 from packages.valory.skills.mech_interact_abci.states.base import (
     MechInteractionResponse,
     MechMetadata,
@@ -62,10 +95,38 @@ CELO_CHAIN_ID = "celo"
 VALUE_KEY = "value"
 TO_ADDRESS_KEY = "to_address"
 EXPECTED_CALL_DATA = frozenset({VALUE_KEY, TO_ADDRESS_KEY})
+ADDRESS_REGEX = re.compile(r"0x[0-9a-fA-F]{40}")
 # the current POC only supports transfer transactions, therefore, the transaction data will always be empty
 TX_DATA = b"0x"
 
 
+def validate_transfer(transfer: Any, max_transfer_value_wei: int) -> Optional[str]:
+    """
+    Validate a structured transfer, whether it is received from a user or returned by the mech.
+
+    :param transfer: the transfer, as received.
+    :param max_transfer_value_wei: the maximum value of a transfer, or `0` if it is not limited.
+    :return: `None` if the transfer is valid, otherwise the reason why it is not.
+    """
+    if not isinstance(transfer, dict) or EXPECTED_CALL_DATA != frozenset(
+        transfer.keys()
+    ):
+        return f"Expected a JSON object with exactly the keys {sorted(EXPECTED_CALL_DATA)}."
+
+    to_address = transfer[TO_ADDRESS_KEY]
+    if not isinstance(to_address, str) or not ADDRESS_REGEX.fullmatch(to_address):
+        return f"Invalid {TO_ADDRESS_KEY!r}: {to_address!r}."
+
+    value = transfer[VALUE_KEY]
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        return f"Expected a non-negative integer {VALUE_KEY!r}. Received: {value!r}."
+
+    if max_transfer_value_wei and value > max_transfer_value_wei:
+        return f"The transfer value exceeds the maximum allowed: {value} > {max_transfer_value_wei}."
+
+    return None
+
+
 class CeloTraderBaseBehaviour(BaseBehaviour, ABC):
     """Base behaviour for the celo_trader_abci skill."""
 
@@ -84,6 +145,98 @@ class CeloTraderBaseBehaviour(BaseBehaviour, ABC):
         """Return the state."""
         return cast(SharedState, self.context.state)
 
+    def commit_user_requests(self) -> None:
+        """Remove the user requests which have been agreed by the service from the local queue."""
+        request_ids = {
+            request[REQUEST_ID_KEY] for request in self.synchronized_data.user_requests
+        }
+        self.local_state.commit_user_requests(request_ids)
+
+    def track_settlement(self) -> None:
+        """
+        Update the local state after the last settled tx, once per tx.
+
+        The settlement is tracked from the synchronized data by the behaviours which follow the post-settlement round,
+        as that round collects no payloads and may therefore end before its own behaviour acts.
+        """
+        tx_hash = self.synchronized_data.settled_tx_hash
+        if tx_hash is None or tx_hash == self.local_state.last_settled_tx_hash:
+            return
+        self.local_state.last_settled_tx_hash = tx_hash
+
+        # a transaction of the Safe has been settled
+        self.local_state.safe_states.on_settled(
+            cast(str, self.synchronized_data.settled_safe_address)
+        )
+        request_statuses = self.local_state.request_statuses
+        for nonce in self.synchronized_data.settled_nonces:
+            request_statuses.set_status_by_nonce(
+                nonce, RequestStatus.SETTLED, tx_hash=tx_hash
+            )
+        # the prompts missed the cache if their mech requests have actually been sent
+        if self.params.prompt_cache_size:
+            self.local_state.prompt_cache_misses += len(
+                self.synchronized_data.settled_user_requests
+            )
+
+    def dead_letter(self, nonce: str, n_attempts: int, reason: str) -> None:
+        """Move the transfer of the mech response with the given nonce to the dead-letter queue, for the given reason."""
+        self.context.logger.error(
+            f"Moving the transfer for the mech response with nonce {nonce!r} to the dead-letter queue. {reason}"
+        )
+        request_statuses = self.local_state.request_statuses
+        mech_response = next(
+            (
+                mech_response
+                for mech_response in (
+                    *self.synchronized_data.retry_mech_responses,
+                    *self.synchronized_data.mech_responses_queue,
+                )
+                if mech_response.nonce == nonce
+            ),
+            None,
+        )
+        self.local_state.dead_letters.append(
+            {
+                "nonce": nonce,
+                REQUEST_ID_KEY: request_statuses.get_request_id(nonce),
+                "result": None if mech_response is None else mech_response.result,
+                "attempts": n_attempts,
+                "reason": reason,
+            }
+        )
+        request_statuses.set_status_by_nonce(
+            nonce, RequestStatus.REJECTED, reason=reason
+        )
+
+
+class CollectUserRequestsBehaviour(CeloTraderBaseBehaviour):
+    """Shares the locally received user requests with the rest of the agents."""
+
+    matching_round: Type[AbstractRound] = CollectUserRequestsRound
+
+    def async_act(self) -> Generator:
+        """Do the act, supporting asynchronous execution."""
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            user_requests = self.local_state.user_requests
+            if user_requests:
+                self.context.logger.info(
+                    f"Sharing {len(user_requests)} locally received user request(s)."
+                )
+            payload = UserRequestsPayload(
+                sender=self.context.agent_address,
+                content=json.dumps(user_requests, sort_keys=True),
+            )
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
+
+        # the requests are only cleared locally once they have been committed to the synchronized data
+        self.commit_user_requests()
+        self.set_done()
+
 
 class DecisionMakingBehaviour(CeloTraderBaseBehaviour):
     """DecisionMakingBehaviour"""
@@ -94,6 +247,9 @@ class DecisionMakingBehaviour(CeloTraderBaseBehaviour):
         """Do the act, supporting asynchronous execution."""
 
         with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            self.track_settlement()
+            self.commit_user_requests()
+            yield from self.refresh_safe_states()
             payload_data = yield from self.get_payload_data()
             payload = DecisionMakingPayload(
                 sender=self.context.agent_address,
@@ -113,75 +269,862 @@ class DecisionMakingBehaviour(CeloTraderBaseBehaviour):
         data = dict(
             event=Event.DONE.value,
             mech_requests=[],
-            mech_responses=[],
+            mech_responses_cursor=0,
             tx_hash="",
+            settling_nonces=[],
+            retry_nonces=list(self.synchronized_data.retry_nonces),
             post_tx_event="",
             chain_id=CELO_CHAIN_ID,
+            # the mech requests are always paid by the service's Safe
+            safe_contract_address=self.params.safe_pool[0],
+            local_mech_responses=[],
+            served_request_ids=[],
+            mech_request_followers={},
+            prompt_cache_entries=[],
+            prompt_cache_hits=[],
+            prompt_cache_timestamp=self.round_sequence.last_round_transition_timestamp.timestamp(),
         )
 
-        # If there are user requests, we need to send mech requests
-        n_pending = len(self.local_state.user_requests)
-        if n_pending:
-            self.context.logger.info(f"{n_pending} pending user request(s).")
-            data["event"] = Event.MECH.value
-            data["mech_requests"] = self.get_mech_requests()
-            # go back to mech response after settling
-            data["post_tx_event"] = Event.MECH.value
+        # the failed transfers which are due are retried before anything else,
+        # while the rest are kept, even across periods, and checked again by the next decisions instead of being awaited
+        now = self.round_sequence.last_round_transition_timestamp.timestamp()
+        is_retrying = yield from self.prepare_retry(data, now)
+        if is_retrying:
+            return data
+
+        # the received mech responses are settled first, then the results of the new user requests which are obtained locally,
+        # and the rest of the user requests are dispatched to the mech last
+        is_settling = yield from self.prepare_settlement(data)
+        if not is_settling:
+            is_settling = yield from self.prepare_local_responses(data)
+        if is_settling:
+            return data
+
+        if not self.params.pipelined_mech_requests:
+            # go back to mech response after settling the mech requests
+            self.prepare_mech_requests(data, Event.MECH)
             return data
 
-        # If there are mech responses, we settle them
-        mech_responses = self.synchronized_data.mech_responses
-        if mech_responses:
-            mech_response = mech_responses.pop(0)  # remove the response to be processed
-            tx_hash = yield from self.process_next_mech_response(mech_response)
-            data["mech_responses"] = [asdict(response) for response in mech_responses]
+        # In the pipelined mode, the pending mech deliveries are awaited last, so that no stage waits while another one has work
+        if not self.prepare_mech_requests(data, Event.DECISION_MAKING):
+            self.prepare_mech_response(data)
+        return data
+
+    def prepare_retry(
+        self, data: Dict[str, Any], now: float
+    ) -> Generator[None, None, bool]:
+        """
+        Prepare the settlement of the next transfer whose settlement has failed and is due to be retried, if any.
+
+        The mech responses' transfers are retried one response at a time,
+        so that a failing transfer cannot hold back the rest of its batch.
+        The retries which are not due yet are kept in the payload's `retry_nonces`.
+
+        :param data: the payload data to update.
+        :param now: the timestamp to compare the retries' deadlines against, as agreed by the service.
+        :return: whether there is a transfer to retry.
+        """
+        retry_nonces = list(data["retry_nonces"])
+        if not retry_nonces:
+            return False
 
-            # If the mech tool has decided not to trade, we skip trading.
+        deadlines = self.synchronized_data.retry_deadlines
+        mech_responses = {
+            mech_response.nonce: mech_response
+            for mech_response in self.synchronized_data.retry_mech_responses
+        }
+        not_due = []
+        while retry_nonces:
+            nonce = retry_nonces.pop(0)
+            if deadlines.get(nonce, now) > now:
+                not_due.append(nonce)
+                continue
+            n_attempts = self.synchronized_data.settlement_attempts.get(nonce, 0)
+            mech_response = mech_responses.get(nonce, None)
+            if mech_response is None:
+                self.dead_letter(
+                    nonce, n_attempts, "The mech response to retry could not be found."
+                )
+                continue
+            transfers = self.process_next_mech_response(mech_response)
+            if transfers is None:
+                self.dead_letter(
+                    nonce, n_attempts, "The mech response to retry is invalid."
+                )
+                continue
+            safe_address = yield from self.select_safe(transfers)
+            transfers, _ = yield from self.preflight_transfers(
+                transfers, [nonce] * len(transfers), safe_address
+            )
+            if not transfers:
+                continue
+            if self.params.coalesce_transfers:
+                transfers = self.coalesce_transfers(transfers)
+            tx_hash = yield from self.build_settlement_tx_hash(transfers, safe_address)
             if not tx_hash:
-                return data
+                self.dead_letter(
+                    nonce,
+                    n_attempts,
+                    "The transaction to retry the transfer could not be prepared.",
+                )
+                continue
 
-            # We are settling a transaction
+            self.context.logger.info(
+                f"Retrying the settlement of the transfer(s) for the mech response with nonce {nonce!r}."
+            )
             data["event"] = Event.SETTLE.value
             data["tx_hash"] = tx_hash
-            # come back to this skill after settling
+            data["settling_nonces"] = [nonce]
+            data["retry_nonces"] = [*not_due, *retry_nonces]
+            data["safe_contract_address"] = safe_address
+            # the settlement of the pending mech responses may have skipped the ones without any valid transfers
+            data["mech_responses_cursor"] = max(
+                data["mech_responses_cursor"],
+                self.synchronized_data.mech_responses_cursor,
+            )
             data["post_tx_event"] = Event.DECISION_MAKING.value
+            return True
 
-        # Reset
-        return data
+        data["retry_nonces"] = not_due
+        return False
 
-    def get_mech_requests(self) -> List[Dict[str, str]]:
-        """Get mech requests"""
+    def prepare_mech_requests(self, data: Dict[str, Any], post_tx_event: Event) -> bool:
+        """
+        Prepare the mech requests for the pending user requests, if any.
 
-        mech_requests = [
-            asdict(
-                MechMetadata(
-                    nonce=str(uuid.uuid4()),
-                    tool=self.params.celo_tool_name,
-                    prompt=request["prompt"],
-                )
+        :param data: the payload data to update.
+        :param post_tx_event: the event to follow the settlement of the mech requests.
+        :return: whether there are mech requests to send.
+        """
+        served_request_ids = set(data["served_request_ids"])
+        user_requests = [
+            request
+            for request in self.synchronized_data.user_requests
+            if request[REQUEST_ID_KEY] not in served_request_ids
+        ]
+        n_pending = len(user_requests)
+        if not n_pending:
+            return False
+
+        # the mech requests whose tx has failed are sent again once their backoff is over, possibly in a later period
+        now = self.round_sequence.last_round_transition_timestamp.timestamp()
+        deadline = self.synchronized_data.mech_request_tx_deadline
+        if deadline > now:
+            self.context.logger.info(
+                f"Waiting for {deadline - now} seconds before sending the mech requests for "
+                f"{n_pending} pending user request(s) again."
             )
-            for request in self.local_state.user_requests
+            return False
+
+        self.context.logger.info(f"{n_pending} pending user request(s).")
+        mech_requests, followers = self.get_mech_requests(user_requests)
+        data["mech_request_followers"] = followers
+        if not mech_requests:
+            # all the user requests follow the mech requests in flight
+            data["served_request_ids"].extend(
+                request[REQUEST_ID_KEY] for request in user_requests
+            )
+            return False
+
+        data["event"] = Event.MECH.value
+        data["mech_requests"] = mech_requests
+        data["post_tx_event"] = post_tx_event.value
+        return True
+
+    @property
+    def prompt_cache(self) -> PromptCache:
+        """Get the cache of the mech's results per prompt, as agreed by the service."""
+        return PromptCache.from_json(
+            self.synchronized_data.prompt_cache,
+            self.params.prompt_cache_size,
+            self.params.prompt_cache_ttl,
+        )
+
+    def prepare_local_responses(
+        self, data: Dict[str, Any]
+    ) -> Generator[None, None, bool]:
+        """
+        Prepare the settlement of the pending user requests whose results can be obtained locally, if any.
+
+        The results are either given directly by the structured transfer requests, cached,
+        or produced in-process by the local tools for the prompts of trusted formats.
+        They are settled as if the mech had just returned them, without paying for and waiting for a mech request.
+
+        :param data: the payload data to update.
+        :return: whether there is a batch of transfers to settle.
+        """
+        user_requests = self.synchronized_data.user_requests
+        if not user_requests:
+            return False
+
+        local_tools = self.local_state.local_tools
+        use_cache = bool(self.params.prompt_cache_size)
+        prompt_cache = self.prompt_cache
+        now = data["prompt_cache_timestamp"]
+        request_statuses = self.local_state.request_statuses
+        local_responses = []
+        n_cache_hits = 0
+        for request in user_requests:
+            transfer = request.get(TRANSFER_KEY, None)
+            if transfer is not None:
+                # the structured transfers bypass the mech entirely
+                result: Optional[str] = json.dumps(transfer, sort_keys=True)
+            else:
+                key = get_cache_key(self.params.celo_tool_name, request["prompt"])
+                result = prompt_cache.get(key, now) if use_cache else None
+                if result is not None:
+                    n_cache_hits += 1
+                    data["prompt_cache_hits"].append(key)
+                else:
+                    result = local_tools.execute(request["prompt"])
+            if result is None:
+                continue
+
+            nonce = self.get_mech_request_nonce(request)
+            request_id = request[REQUEST_ID_KEY]
+            request_statuses.map_nonce(nonce, request_id)
+            request_statuses.set_status(request_id, RequestStatus.MECH_RESPONDED)
+            local_responses.append(MechInteractionResponse(nonce=nonce, result=result))
+            data["served_request_ids"].append(request_id)
+
+        n_local = len(local_responses)
+        if not n_local:
+            return False
+
+        self.context.logger.info(
+            f"Serving {n_local} user request(s) locally, {n_cache_hits} of them from the cached results of the mech."
+        )
+        self.local_state.prompt_cache_hits += n_cache_hits
+        data["local_mech_responses"] = [
+            asdict(response) for response in local_responses
         ]
+        cursor = data["mech_responses_cursor"]
+        is_settling = yield from self.prepare_batch(data, local_responses, 0)
+        if is_settling:
+            return True
+
+        # the local responses only replace the queue of mech responses when their transaction is settled
+        data["mech_responses_cursor"] = cursor
+        data["local_mech_responses"] = []
+        # the served requests are consumed, so the ones which are not settled must not be left pending forever
+        for response in local_responses:
+            request_id = cast(str, request_statuses.get_request_id(response.nonce))
+            status = request_statuses.get(request_id)
+            if (
+                status is None
+                or status[STATUS_KEY] == RequestStatus.MECH_RESPONDED.value
+            ):
+                request_statuses.set_status(
+                    request_id,
+                    RequestStatus.REJECTED,
+                    reason="The transaction to settle the transfer(s) could not be prepared.",
+                )
+        return False
+
+    def get_prompt_cache_entries(
+        self, mech_responses: Sequence[MechInteractionResponse], nonces: List[str]
+    ) -> List[List[str]]:
+        """Get the cache entries for the valid results of the mech requests with the given nonces."""
+        prompts = {
+            mech_request.nonce: mech_request.prompt
+            for mech_request in self.synchronized_data.mech_requests
+        }
+        results = {
+            mech_response.nonce: mech_response.result
+            for mech_response in mech_responses
+        }
+        entries = []
+        for nonce in dict.fromkeys(nonces):
+            prompt = prompts.get(nonce, None)
+            result = results.get(nonce, None)
+            if prompt is not None and result is not None:
+                key = get_cache_key(self.params.celo_tool_name, prompt)
+                entries.append([key, result])
+        return entries
+
+    def prepare_settlement(self, data: Dict[str, Any]) -> Generator[None, None, bool]:
+        """
+        Prepare the settlement of the next batch of mech responses, if any.
+
+        :param data: the payload data to update.
+        :return: whether there is a batch of transfers to settle.
+        """
+        if not self.synchronized_data.n_pending_mech_responses:
+            return False
+
+        mech_responses = self.synchronized_data.mech_responses_queue
+        cursor = self.synchronized_data.mech_responses_cursor
+        if not cursor:
+            self.track_mech_responses(mech_responses)
+
+        is_settling = yield from self.prepare_batch(
+            data, mech_responses, cursor, cache_results=True
+        )
+        return is_settling
+
+    def prepare_batch(
+        self,
+        data: Dict[str, Any],
+        mech_responses: Sequence[MechInteractionResponse],
+        cursor: int,
+        cache_results: bool = False,
+    ) -> Generator[None, None, bool]:
+        """
+        Prepare the settlement of the next batch of the given mech responses, if any.
+
+        :param data: the payload data to update.
+        :param mech_responses: the queue of mech responses.
+        :param cursor: the index of the first mech response which has not been processed yet.
+        :param cache_results: whether to cache the valid results of the mech responses.
+        :return: whether there is a batch of transfers to settle.
+        """
+        transfers: List[Dict[str, Any]] = []
+        nonces: List[str] = []
+        safe_address = self.params.safe_pool[0]
+        # the batches whose transfers are all dropped by the pre-flight checks are skipped
+        while not transfers and cursor < len(mech_responses):
+            transfers, nonces, cursor = self.get_transfers_batch(mech_responses, cursor)
+            if cache_results and self.params.prompt_cache_size:
+                data["prompt_cache_entries"].extend(
+                    self.get_prompt_cache_entries(mech_responses, nonces)
+                )
+            safe_address = yield from self.select_safe(transfers)
+            transfers, nonces = yield from self.preflight_transfers(
+                transfers, nonces, safe_address
+            )
+        data["mech_responses_cursor"] = cursor
+
+        # If the mech tool has decided not to trade, we skip trading.
+        if not transfers:
+            return False
+
+        if self.params.coalesce_transfers:
+            transfers = self.coalesce_transfers(transfers)
+        tx_hash = yield from self.build_settlement_tx_hash(transfers, safe_address)
+        if not tx_hash:
+            return False
+
+        # We are settling a transaction
+        data["event"] = Event.SETTLE.value
+        data["tx_hash"] = tx_hash
+        # a mech response may contain several transfers
+        data["settling_nonces"] = list(dict.fromkeys(nonces))
+        data["safe_contract_address"] = safe_address
+        # come back to this skill after settling
+        data["post_tx_event"] = Event.DECISION_MAKING.value
+        return True
+
+    def prepare_mech_response(self, data: Dict[str, Any]) -> None:
+        """
+        Prepare to await the oldest pending mech delivery, if it was dispatched during a previous period.
+
+        The deliveries of the current period are left pending while the service resets and collects new user requests.
+        The delivery is awaited in the mech interaction's response round, which blocks the service until the mech delivers it
+        or the round times out, as the deliveries are not polled without blocking.
+
+        :param data: the payload data to update.
+        """
+        deliveries = self.synchronized_data.pending_mech_deliveries
+        if not deliveries:
+            return
+
+        if deliveries[0]["period"] < self.synchronized_data.period_count:
+            self.context.logger.info(
+                f"Awaiting the oldest of {len(deliveries)} pending mech delivery(ies)."
+            )
+            data["event"] = Event.MECH_RESPONSE.value
+
+    def track_mech_responses(
+        self, mech_responses: Sequence[MechInteractionResponse]
+    ) -> None:
+        """Mark the user requests for which the mech has responded."""
+        request_statuses = self.local_state.request_statuses
+        for mech_response in mech_responses:
+            request_statuses.set_status_by_nonce(
+                mech_response.nonce, RequestStatus.MECH_RESPONDED
+            )
+
+    def get_transfers_batch(
+        self, mech_responses: Sequence[MechInteractionResponse], cursor: int
+    ) -> Tuple[List[Dict[str, Any]], List[str], int]:
+        """
+        Get the next batch of valid transfers.
+
+        When the transfers are coalesced, the batch is limited by the number of distinct recipients instead of transfers,
+        as every recipient results in a single call of the multisend transaction.
+        The transfers of a mech response are never split across batches, as they are settled together.
+
+        :param mech_responses: the queue of mech responses.
+        :param cursor: the index of the first mech response which has not been processed yet.
+        :return: the transfers, the nonce of the mech response which each transfer originates from, and the advanced cursor.
+        """
+        transfers: List[Dict[str, Any]] = []
+        nonces: List[str] = []
+        recipients: Set[str] = set()
+        n_responses = len(mech_responses)
+        batch_size = self.params.multisend_batch_size
+        start = cursor
+        while cursor < n_responses:
+            mech_response = mech_responses[cursor]
+            response_transfers = self.process_next_mech_response(mech_response)
+            if response_transfers is not None:
+                response_recipients = {
+                    transfer[TO_ADDRESS_KEY].lower() for transfer in response_transfers
+                }
+                if self.params.coalesce_transfers:
+                    n_calls = len(recipients | response_recipients)
+                else:
+                    n_calls = len(transfers) + len(response_transfers)
+                # a mech response with more transfers than the batch size is settled on its own
+                if transfers and n_calls > batch_size:
+                    break
+                recipients |= response_recipients
+                transfers.extend(response_transfers)
+                nonces.extend([mech_response.nonce] * len(response_transfers))
+            cursor += 1
+
+        self.context.logger.info(
+            f"Prepared {len(transfers)} transfer(s) to {len(recipients)} recipient(s) "
+            f"out of {cursor - start} mech response(s). {n_responses - cursor} mech response(s) remaining."
+        )
+        return transfers, nonces, cursor
+
+    @staticmethod
+    def coalesce_transfers(transfers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Coalesce the transfers to the same recipient into a single transfer of their summed value.
+
+        The `max_transfer_value_wei` limit has already been enforced per original transfer,
+        and the settled transfers are mapped back to their user requests through the nonces of their mech responses.
+
+        :param transfers: the transfers' call data.
+        :return: one transfer per recipient, in the order in which the recipients first appear.
+        """
+        coalesced: Dict[str, Dict[str, Any]] = {}
+        for transfer in transfers:
+            recipient = transfer[TO_ADDRESS_KEY].lower()
+            if recipient in coalesced:
+                coalesced[recipient][VALUE_KEY] += transfer[VALUE_KEY]
+                continue
+            coalesced[recipient] = dict(transfer)
+        return list(coalesced.values())
+
+    def select_safe(
+        self, transfers: List[Dict[str, Any]]
+    ) -> Generator[None, None, str]:
+        """
+        Select the Safe of the pool which settles the given transfers.
+
+        The Safes are used in a round-robin fashion, starting after the one which settled the previous transaction,
+        so that consecutive transactions are spread over the Safes' nonce streams.
+        The Safes whose balance is known to be insufficient for the transfers are skipped.
+
+        :param transfers: the transfers' call data.
+        :return: the address of the selected Safe.
+        """
+        pool = self.params.safe_pool
+        previous_safe = self.synchronized_data.settling_safe_address
+        start = pool.index(previous_safe) + 1 if previous_safe in pool else 0
+        candidates = pool[start:] + pool[:start]
+        total_value = sum(transfer[VALUE_KEY] for transfer in transfers)
+        for safe_address in candidates:
+            balance = yield from self._get_safe_balance(safe_address)
+            if balance is None or balance >= total_value:
+                return safe_address
+
+        # none of the Safes can fund all the transfers, the pre-flight checks drop the ones which cannot be funded
+        return candidates[0]
+
+    def preflight_transfers(
+        self, transfers: List[Dict[str, Any]], nonces: List[str], safe_address: str
+    ) -> Generator[None, None, Tuple[List[Dict[str, Any]], List[str]]]:
+        """
+        Simulate the given transfers against the Safe's current state, and drop the ones which would fail.
+
+        The Safe's balance is read once for the whole batch, and every recipient is simulated at most once per period,
+        so that the transfers which are bound to revert are dropped before any consensus or gas is spent on them.
+
+        :param transfers: the transfers' call data.
+        :param nonces: the nonce of the mech response which each transfer originates from.
+        :param safe_address: the address of the Safe which settles the transfers.
+        :return: the transfers which are expected to succeed, and their nonces.
+        """
+        if not self.params.preflight_transfers or not transfers:
+            return transfers, nonces
+
+        balance = yield from self._get_safe_balance(safe_address)
+        if balance is None:
+            # the pre-flight checks are best effort, the transfers are settled regardless
+            return transfers, nonces
+
+        valid_transfers: List[Dict[str, Any]] = []
+        valid_nonces: List[str] = []
+        total_value = 0
+        # the transfers of a mech response are settled together, hence they are also dropped together
+        for nonce, group in groupby(zip(transfers, nonces), key=itemgetter(1)):
+            group_transfers = [transfer for transfer, _ in group]
+            group_value = sum(transfer[VALUE_KEY] for transfer in group_transfers)
+            reason = None
+            if total_value + group_value > balance:
+                reason = "The Safe's balance is insufficient for the transfer(s)."
+            else:
+                for transfer in group_transfers:
+                    succeeds = yield from self._simulate_transfer(
+                        safe_address, transfer[TO_ADDRESS_KEY], transfer[VALUE_KEY]
+                    )
+                    if not succeeds:
+                        reason = (
+                            f"The transfer to {transfer[TO_ADDRESS_KEY]} would revert."
+                        )
+                        break
+
+            if reason is None:
+                total_value += group_value
+                valid_transfers.extend(group_transfers)
+                valid_nonces.extend([nonce] * len(group_transfers))
+                continue
+
+            self.context.logger.warning(
+                f"Dropping the transfer(s) for the mech response with nonce {nonce!r}: {reason}"
+            )
+            self.local_state.request_statuses.set_status_by_nonce(
+                nonce, RequestStatus.REJECTED, reason=reason
+            )
+
+        return valid_transfers, valid_nonces
+
+    def _get_safe_balance(
+        self, safe_address: str
+    ) -> Generator[None, None, Optional[int]]:
+        """Get the Safe's native balance, from the local cache if it is fresh, otherwise from the ledger."""
+        period = self.synchronized_data.period_count
+        state = self.local_state.safe_states.get(safe_address, period)
+        if state is not None and state.balance is not None:
+            return state.balance
+
+        response_msg = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="get_balance",
+            account=safe_address,
+            chain_id=CELO_CHAIN_ID,
+        )
+
+        if response_msg.performative != LedgerApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                "Couldn't get the safe's balance. Expected response performative "
+                f"{LedgerApiMessage.Performative.STATE.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        balance = response_msg.state.body.get("get_balance_result", None)
+        if balance is None:
+            self.context.logger.warning(
+                f"Invalid safe balance response: {response_msg}."
+            )
+            return None
+
+        self.local_state.safe_states.update(safe_address, period, balance=balance)
+        return balance
+
+    def _simulate_transfer(
+        self, safe_address: str, to_address: str, value: int
+    ) -> Generator[None, None, bool]:
+        """Simulate a transfer from the Safe to the given recipient, reusing the outcome of this period's simulation if any."""
+        period = self.synchronized_data.period_count
+        preflight_results = self.local_state.preflight_results
+        succeeds, simulation_period = preflight_results.get(to_address, (True, None))
+        if simulation_period == period:
+            return succeeds
+
+        # the gas estimation executes the transfer against the latest state, and fails if the transfer reverts
+        response_msg = yield from self.get_ledger_api_response(
+            performative=LedgerApiMessage.Performative.GET_STATE,  # type: ignore
+            ledger_callable="estimate_gas",
+            transaction={
+                "from": safe_address,
+                "to": to_address,
+                "value": value,
+            },
+            chain_id=CELO_CHAIN_ID,
+        )
+        succeeds = response_msg.performative == LedgerApiMessage.Performative.STATE
+        preflight_results[to_address] = (succeeds, period)
+        return succeeds
+
+    def get_mech_request_nonce(self, request: Dict[str, Any]) -> str:
+        """
+        Derive a mech request's nonce from the user request's content and the current period.
+
+        All the agents derive the same nonce for the same request,
+        therefore, their decision making payloads match and consensus is reached in a single round.
+
+        :param request: the user request.
+        :return: the nonce, in the form of a UUID.
+        """
+        tool = self.params.celo_tool_name
+        period = self.synchronized_data.period_count
+        seed = json.dumps([period, tool, request], sort_keys=True)
+        return str(uuid.uuid5(uuid.NAMESPACE_OID, seed))
+
+    def get_mech_requests(
+        self, user_requests: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, List[str]]]:
+        """
+        Get the mech requests for the given user requests.
+
+        The user requests with the same prompt share a single mech request, and so do the user requests
+        whose prompt is the same as the one of a mech request in flight. The mech's response is fanned out to all of them.
+
+        :param user_requests: the user requests.
+        :return: the mech requests, and the nonces of the deduplicated requests per the nonce of the mech request they follow.
+        """
+        tool = self.params.celo_tool_name
+        in_flight = {
+            get_cache_key(mech_request["tool"], mech_request["prompt"]): mech_request[
+                "nonce"
+            ]
+            for delivery in self.synchronized_data.pending_mech_deliveries
+            for mech_request in delivery["mech_requests"]
+        }
+
+        # the agreed user requests are ordered in the same way for all the agents
+        mech_requests = []
+        followers: Dict[str, List[str]] = {}
+        request_statuses = self.local_state.request_statuses
+        for request in user_requests:
+            nonce = self.get_mech_request_nonce(request)
+            request_id = request[REQUEST_ID_KEY]
+            request_statuses.map_nonce(nonce, request_id)
+            request_statuses.set_status(request_id, RequestStatus.MECH_REQUESTED)
+
+            key = get_cache_key(tool, request["prompt"])
+            leader_nonce = in_flight.get(key, None)
+            if leader_nonce is not None:
+                followers.setdefault(leader_nonce, []).append(nonce)
+                continue
+
+            in_flight[key] = nonce
+            metadata = MechMetadata(nonce=nonce, tool=tool, prompt=request["prompt"])
+            mech_requests.append(asdict(metadata))
+
+        n_deduplicated = sum(len(nonces) for nonces in followers.values())
+        if n_deduplicated:
+            self.context.logger.info(
+                f"{n_deduplicated} user request(s) share the mech request of an identical prompt."
+            )
+        return mech_requests, followers
+
+    def refresh_safe_states(self) -> Generator:
+        """Refresh the cached state of the pool's Safes which have not been fetched during the current period."""
+        period = self.synchronized_data.period_count
+        for safe_address in self.params.safe_pool:
+            if self.local_state.safe_states.get(safe_address, period) is not None:
+                continue
+
+            yield from self._get_safe_nonce(safe_address)
+            yield from self._get_safe_balance(safe_address)
+            yield from self._get_safe_owners(safe_address)
+            yield from self._get_safe_threshold(safe_address)
+
+    def _get_safe_nonce(
+        self, safe_address: str
+    ) -> Generator[None, None, Optional[int]]:
+        """Get the Safe's nonce, from the local cache if it is fresh, otherwise from the contract."""
+        period = self.synchronized_data.period_count
+        state = self.local_state.safe_states.get(safe_address, period)
+        if state is not None and state.nonce is not None:
+            return state.nonce
+
+        response_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=safe_address,
+            contract_id=str(GnosisSafeContract.contract_id),
+            contract_callable="get_safe_nonce",
+            chain_id=CELO_CHAIN_ID,
+        )
 
-        # Clear pending requests
-        # TODO: for multi-agent, this has to be done after this round
-        self.local_state.user_requests = []
+        if response_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.error(
+                "Couldn't get the safe's nonce. Expected response performative "
+                f"{ContractApiMessage.Performative.STATE.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        nonce = response_msg.state.body.get("safe_nonce", None)
+        if nonce is None:
+            self.context.logger.error(f"Invalid safe nonce response: {response_msg}.")
+            return None
+
+        self.local_state.safe_states.update(safe_address, period, nonce=nonce)
+        return nonce
+
+    def _get_safe_owners(
+        self, safe_address: str
+    ) -> Generator[None, None, Optional[List[str]]]:
+        """Get the Safe's owners, from the local cache if they are fresh, otherwise from the contract."""
+        period = self.synchronized_data.period_count
+        state = self.local_state.safe_states.get(safe_address, period)
+        if state is not None and state.owners is not None:
+            return state.owners
 
-        return mech_requests
+        response_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=safe_address,
+            contract_id=str(GnosisSafeContract.contract_id),
+            contract_callable="get_owners",
+            chain_id=CELO_CHAIN_ID,
+        )
 
-    def _build_safe_tx_hash(
-        self, **kwargs: Any
+        if response_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                "Couldn't get the safe's owners. Expected response performative "
+                f"{ContractApiMessage.Performative.STATE.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        owners = response_msg.state.body.get("owners", None)
+        if owners is None:
+            self.context.logger.warning(
+                f"Invalid safe owners response: {response_msg}."
+            )
+            return None
+
+        self.local_state.safe_states.update(safe_address, period, owners=owners)
+        return owners
+
+    def _get_safe_threshold(
+        self, safe_address: str
+    ) -> Generator[None, None, Optional[int]]:
+        """Get the Safe's threshold, from the local cache if it is fresh, otherwise from the contract."""
+        period = self.synchronized_data.period_count
+        state = self.local_state.safe_states.get(safe_address, period)
+        if state is not None and state.threshold is not None:
+            return state.threshold
+
+        response_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=safe_address,
+            contract_id=str(SafeInfoContract.contract_id),
+            contract_callable="get_threshold",
+            chain_id=CELO_CHAIN_ID,
+        )
+
+        if response_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                "Couldn't get the safe's threshold. Expected response performative "
+                f"{ContractApiMessage.Performative.STATE.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        threshold = response_msg.state.body.get("threshold", None)
+        if not isinstance(threshold, int):
+            self.context.logger.warning(
+                f"Invalid safe threshold response: {response_msg}."
+            )
+            return None
+
+        self.local_state.safe_states.update(safe_address, period, threshold=threshold)
+        return threshold
+
+    def _build_safe_tx_hash(  # pylint: disable=too-many-arguments
+        self,
+        safe_address: str,
+        to_address: str,
+        value: int,
+        data: bytes = TX_DATA,
+        operation: int = SafeOperation.CALL.value,
+    ) -> Generator[None, None, Optional[str]]:
+        """Prepares and returns the safe tx hash, computing it locally whenever possible."""
+        nonce = yield from self._get_safe_nonce(safe_address)
+        domain = yield from self._get_safe_domain(safe_address)
+        if nonce is not None and domain is not None:
+            version, chain_id = domain
+            try:
+                return self.local_state.safe_tx_hash_engine.get_safe_tx_hash(
+                    chain_id,
+                    safe_address,
+                    version,
+                    to_address,
+                    value,
+                    data,
+                    operation,
+                    SAFE_GAS,
+                    nonce,
+                )
+            except (ValueError, TypeError) as exc:
+                self.context.logger.warning(
+                    f"Could not compute the safe tx hash locally: {exc}. Falling back to the contract."
+                )
+
+        tx_hash = yield from self._get_safe_tx_hash_from_contract(
+            safe_address, to_address, value, data, operation
+        )
+        return tx_hash
+
+    def _get_safe_domain(
+        self, safe_address: str
+    ) -> Generator[None, None, Optional[Tuple[str, int]]]:
+        """Get the Safe's version and chain id, which determine its EIP-712 domain, from the local cache if possible."""
+        domain = self.local_state.safe_states.get_domain(safe_address)
+        if domain is not None:
+            return domain
+
+        response_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
+            contract_address=safe_address,
+            contract_id=str(SafeInfoContract.contract_id),
+            contract_callable="get_domain",
+            chain_id=CELO_CHAIN_ID,
+        )
+
+        if response_msg.performative != ContractApiMessage.Performative.STATE:
+            self.context.logger.warning(
+                "Couldn't get the safe's version. Expected response performative "
+                f"{ContractApiMessage.Performative.STATE.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        version = response_msg.state.body.get("version", None)
+        chain_id = response_msg.state.body.get("chain_id", None)
+        if not isinstance(version, str) or not isinstance(chain_id, int):
+            self.context.logger.warning(
+                f"Invalid safe version response: {response_msg}."
+            )
+            return None
+
+        if chain_id != self.params.safe_chain_id:
+            self.context.logger.warning(
+                f"The configured `safe_chain_id` {self.params.safe_chain_id} does not match "
+                f"the id of the chain on which the Safe {safe_address} is deployed: {chain_id}. Using the latter."
+            )
+        self.local_state.safe_states.set_domain(safe_address, version, chain_id)
+        return version, chain_id
+
+    def _get_safe_tx_hash_from_contract(  # pylint: disable=too-many-arguments
+        self,
+        safe_address: str,
+        to_address: str,
+        value: int,
+        data: bytes,
+        operation: int,
     ) -> Generator[None, None, Optional[str]]:
-        """Prepares and returns the safe tx hash for a multisend tx."""
+        """Prepares and returns the safe tx hash using the contract."""
         response_msg = yield from self.get_contract_api_response(
             performative=ContractApiMessage.Performative.GET_STATE,  # type: ignore
-            contract_address=self.synchronized_data.safe_contract_address,
+            contract_address=safe_address,
             contract_id=str(GnosisSafeContract.contract_id),
             contract_callable="get_raw_safe_transaction_hash",
-            data=TX_DATA,
+            to_address=to_address,
+            value=value,
+            data=data,
+            operation=operation,
             safe_tx_gas=SAFE_GAS,
             chain_id=CELO_CHAIN_ID,
-            **kwargs,
         )
 
         if response_msg.performative != ContractApiMessage.Performative.STATE:
@@ -203,16 +1146,122 @@ class DecisionMakingBehaviour(CeloTraderBaseBehaviour):
         # strip "0x" from the response hash
         return tx_hash[2:]
 
+    def _build_multisend_data(
+        self, transfers: List[Dict[str, Any]]
+    ) -> Generator[None, None, Optional[bytes]]:
+        """Get the multisend tx data which performs all the given transfers."""
+        multisend_txs = [
+            {
+                "operation": MultiSendOperation.CALL,
+                "to": transfer[TO_ADDRESS_KEY],
+                "value": transfer[VALUE_KEY],
+                "data": TX_DATA,
+            }
+            for transfer in transfers
+        ]
+
+        response_msg = yield from self.get_contract_api_response(
+            performative=ContractApiMessage.Performative.GET_RAW_TRANSACTION,  # type: ignore
+            contract_address=self.params.multisend_address,
+            contract_id=str(MultiSendContract.contract_id),
+            contract_callable="get_tx_data",
+            multi_send_txs=multisend_txs,
+            chain_id=CELO_CHAIN_ID,
+        )
+
+        if response_msg.performative != ContractApiMessage.Performative.RAW_TRANSACTION:
+            self.context.logger.error(
+                "Couldn't compile the multisend tx. Expected response performative "
+                f"{ContractApiMessage.Performative.RAW_TRANSACTION.value!r}, "  # type: ignore
+                f"received {response_msg.performative.value!r}: {response_msg}."
+            )
+            return None
+
+        multisend_data = response_msg.raw_transaction.body.get("data", None)
+        if multisend_data is None:
+            self.context.logger.error(
+                f"Something went wrong while trying to prepare the multisend data: {response_msg}"
+            )
+            return None
+
+        # strip "0x" from the response
+        return bytes.fromhex(multisend_data[2:])
+
+    def build_settlement_tx_hash(
+        self, transfers: List[Dict[str, Any]], safe_address: str
+    ) -> Generator[None, None, Optional[str]]:
+        """
+        Build the hash of the Safe transaction which settles the given transfers.
+
+        A single transfer is sent directly from the Safe,
+        while multiple transfers are batched in a multisend transaction.
+
+        :param transfers: the transfers' call data.
+        :param safe_address: the address of the Safe which settles the transfers.
+        :return: the tx hash, as expected by the transaction settlement skill.
+        """
+        if len(transfers) == 1:
+            transfer = transfers[0]
+            to_address = transfer[TO_ADDRESS_KEY]
+            value = transfer[VALUE_KEY]
+            data = TX_DATA
+            operation = SafeOperation.CALL.value
+        else:
+            multisend_data = yield from self._build_multisend_data(transfers)
+            if multisend_data is None:
+                return None
+            to_address = self.params.multisend_address
+            value = 0
+            data = multisend_data
+            operation = SafeOperation.DELEGATE_CALL.value
+
+        safe_tx_hash = yield from self._build_safe_tx_hash(
+            safe_address, to_address, value, data, operation
+        )
+        if safe_tx_hash is None:
+            self.context.logger.error("Could not build the safe transaction's hash.")
+            return None
+
+        tx_hash = hash_payload_to_hex(
+            safe_tx_hash,
+            value,
+            SAFE_GAS,
+            to_address,
+            data,
+            operation,
+        )
+
+        return tx_hash
+
+    def reject_mech_response(
+        self, mech_response: MechInteractionResponse, reason: str
+    ) -> None:
+        """Mark the user request for which the given mech response was returned as rejected."""
+        self.local_state.request_statuses.set_status_by_nonce(
+            mech_response.nonce, RequestStatus.REJECTED, reason=reason
+        )
+
     def process_next_mech_response(
         self, mech_response: MechInteractionResponse
-    ) -> Generator[None, None, Optional[str]]:
-        """Get the call data from the mech response."""
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the validated transfers' call data from the mech response.
+
+        The mech may return either a single transfer or a list of transfers, which are settled together.
+        If any of the transfers is invalid, the whole response is rejected.
+
+        :param mech_response: the mech response.
+        :return: the transfers' call data, or `None` if the response is invalid.
+        """
 
         encoded_response = mech_response.result
         if encoded_response is None:
             self.context.logger.error(
                 f"No result was returned for mech with request id {mech_response.requestId!r}."
             )
+            self.reject_mech_response(
+                mech_response, "No result was returned by the mech."
+            )
             return None
 
         try:
@@ -221,38 +1270,166 @@ class DecisionMakingBehaviour(CeloTraderBaseBehaviour):
             self.context.logger.error(
                 f"Could not decode the mech's {encoded_response=}."
             )
+            self.reject_mech_response(
+                mech_response, "Could not decode the mech's response."
+            )
             return None
 
-        # Security measure to limit the transaction amount
-        max_transfer_value_wei = self.params.max_transfer_value_wei
-        if max_transfer_value_wei and call_data[VALUE_KEY] > max_transfer_value_wei:
+        transfers = call_data if isinstance(call_data, list) else [call_data]
+        if not transfers:
             self.context.logger.error(
-                f"Transfer value is too high. Transfer skipped. Please adjust your max_transfer_value_wei parameter: {call_data[VALUE_KEY]} > {max_transfer_value_wei}"
+                f"No transfers were returned in the given mech response. Received {call_data=}."
+            )
+            self.reject_mech_response(
+                mech_response, "No transfers were returned by the mech."
             )
             return None
 
-        mismatch = EXPECTED_CALL_DATA != frozenset(call_data.keys())
-        if mismatch:
+        # the transfers are validated like the ones received from the users, as the mech cannot be trusted either
+        for transfer in transfers:
+            reason = validate_transfer(transfer, self.params.max_transfer_value_wei)
+            if reason is not None:
+                self.context.logger.error(
+                    f"Invalid transfer in the given mech response. Transfer skipped: {reason} Received {call_data=}."
+                )
+                self.reject_mech_response(
+                    mech_response, f"Invalid transfer returned by the mech: {reason}"
+                )
+                return None
+
+        # the cached balances are fresh for the current period, and transfers which exceed all of them are bound to fail
+        total_value = sum(transfer[VALUE_KEY] for transfer in transfers)
+        max_balance = self.local_state.safe_states.max_balance(
+            self.params.safe_pool, self.synchronized_data.period_count
+        )
+        if max_balance is not None and total_value > max_balance:
             self.context.logger.error(
-                "Incorrect call data were detected in the given mech response. "
-                f"Expected {EXPECTED_CALL_DATA} to be present. Received {call_data=}."
+                f"Transfer value exceeds the Safes' balance. Transfer skipped: {total_value} > {max_balance}"
+            )
+            self.reject_mech_response(
+                mech_response, "The transfer value exceeds the Safes' balance."
             )
             return None
 
-        safe_tx_hash = yield from self._build_safe_tx_hash(**call_data)
-        if safe_tx_hash is None:
-            self.context.logger.error("Could not build the safe transaction's hash.")
-            return None
+        return transfers
 
-        tx_hash = hash_payload_to_hex(
-            safe_tx_hash,
-            call_data[VALUE_KEY],
-            SAFE_GAS,
-            call_data[TO_ADDRESS_KEY],
-            TX_DATA,
+
+class SettlementRetryBehaviour(CeloTraderBaseBehaviour):
+    """
+    Decides how to retry a failed settlement.
+
+    Every transfer's failed attempts are tracked, and the retries are delayed with an exponential backoff.
+    The retries' deadlines are agreed in the synchronized data, so that decision making can go on with the rest of the work,
+    or reset, until they are due, instead of waiting here.
+    The mech requests whose tx has failed are sent again by decision making once their own deadline is due.
+    The transfers which exhaust their attempts are moved to the dead-letter queue instead of being retried.
+    """
+
+    matching_round: Type[AbstractRound] = SettlementRetryRound
+
+    def async_act(self) -> Generator:
+        """Do the act, supporting asynchronous execution."""
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            self.track_settlement()
+            # the failed tx may or may not have used the Safe's nonce
+            self.local_state.safe_states.invalidate(
+                cast(str, self.synchronized_data.settling_safe_address)
+            )
+            payload_data = self.get_payload_data()
+            payload = SettlementRetryPayload(
+                sender=self.context.agent_address,
+                content=json.dumps(payload_data, sort_keys=True),
+            )
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
+
+        self.set_done()
+
+    def get_backoff(self, n_attempts: int) -> float:
+        """Get the seconds to wait before retrying a settlement which has failed the given number of times."""
+        backoff = self.params.settlement_retry_backoff * 2 ** (n_attempts - 1)
+        return min(backoff, self.params.max_settlement_retry_backoff)
+
+    def get_payload_data(self) -> Dict[str, Any]:
+        """Get the payload data."""
+        max_attempts = self.params.max_settlement_attempts
+        now = self.round_sequence.last_round_transition_timestamp.timestamp()
+        data: Dict[str, Any] = dict(
+            event=Event.DECISION_MAKING.value,
+            settlement_attempts=self.synchronized_data.settlement_attempts,
+            retry_nonces=self.synchronized_data.retry_nonces,
+            retry_deadlines=self.synchronized_data.retry_deadlines,
+            retry_mech_responses=[
+                asdict(mech_response)
+                for mech_response in self.synchronized_data.retry_mech_responses
+            ],
+            mech_request_tx_attempts=self.synchronized_data.mech_request_tx_attempts,
+            mech_request_tx_deadline=self.synchronized_data.mech_request_tx_deadline,
+            drop_dispatched_user_requests=False,
         )
 
-        return tx_hash
+        settling_nonces = self.synchronized_data.settling_nonces
+        if not settling_nonces:
+            # the mech requests' tx has failed, and its user requests are dispatched again once the backoff is over
+            n_attempts = self.synchronized_data.mech_request_tx_attempts + 1
+            if n_attempts < max_attempts:
+                backoff = self.get_backoff(n_attempts)
+                self.context.logger.info(
+                    f"The mech requests' tx has failed. Sending the mech requests again in {backoff} seconds."
+                )
+                data["mech_request_tx_attempts"] = n_attempts
+                data["mech_request_tx_deadline"] = now + backoff
+                return data
+
+            self.context.logger.error(
+                f"The mech requests' tx has failed {n_attempts} times. Giving up."
+            )
+            for mech_request in self.synchronized_data.mech_requests:
+                self.local_state.request_statuses.set_status_by_nonce(
+                    mech_request.nonce,
+                    RequestStatus.REJECTED,
+                    reason="The mech request could not be sent.",
+                )
+            data["mech_request_tx_attempts"] = 0
+            data["mech_request_tx_deadline"] = 0.0
+            data["drop_dispatched_user_requests"] = True
+            return data
+
+        attempts = dict(self.synchronized_data.settlement_attempts)
+        deadlines = dict(self.synchronized_data.retry_deadlines)
+        retry_nonces = []
+        for nonce in settling_nonces:
+            n_attempts = attempts.get(nonce, 0) + 1
+            attempts[nonce] = n_attempts
+            if n_attempts < max_attempts:
+                retry_nonces.append(nonce)
+                deadlines[nonce] = now + self.get_backoff(n_attempts)
+            else:
+                reason = (
+                    f"The transfer could not be settled after {n_attempts} attempts."
+                )
+                self.dead_letter(nonce, n_attempts, reason)
+
+        data["settlement_attempts"] = attempts
+        data["retry_nonces"] = [*retry_nonces, *self.synchronized_data.retry_nonces]
+        data["retry_deadlines"] = deadlines
+        # the retried mech responses are kept apart from the queue, which is cleared or replaced before they are due
+        mech_responses = {
+            mech_response.nonce: mech_response
+            for mech_response in (
+                *self.synchronized_data.mech_responses_queue,
+                *self.synchronized_data.retry_mech_responses,
+            )
+        }
+        data["retry_mech_responses"] = [
+            asdict(mech_responses[nonce])
+            for nonce in data["retry_nonces"]
+            if nonce in mech_responses
+        ]
+        return data
 
 
 class PostTxDecisionMakingBehaviour(CeloTraderBaseBehaviour):
@@ -263,13 +1440,9 @@ class PostTxDecisionMakingBehaviour(CeloTraderBaseBehaviour):
     def async_act(self) -> Generator:
         """Do the act, supporting asynchronous execution."""
 
-        with self.context.benchmark_tool.measure(self.behaviour_id).local():
-            event = cast(str, self.synchronized_data.post_tx_event)
-            sender = self.context.agent_address
-            payload = PostTxDecisionMakingPayload(sender=sender, event=event)
-
+        # the round routes on the agreed `post_tx_event` without any votes, so there is no payload to send,
+        # and the settlement is tracked by the behaviours of the next rounds
         with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
-            yield from self.send_a2a_transaction(payload)
             yield from self.wait_until_round_end()
 
         self.set_done()
@@ -278,9 +1451,17 @@ class PostTxDecisionMakingBehaviour(CeloTraderBaseBehaviour):
 class CeloTraderRoundBehaviour(AbstractRoundBehaviour):
     """CeloTraderRoundBehaviour"""
 
-    initial_behaviour_cls = DecisionMakingBehaviour
+    initial_behaviour_cls = CollectUserRequestsBehaviour
     abci_app_cls = CeloTraderAbciApp  # type: ignore
     behaviours: Set[Type[BaseBehaviour]] = [
+        CollectUserRequestsBehaviour,
         DecisionMakingBehaviour,
         PostTxDecisionMakingBehaviour,
+        SettlementRetryBehaviour,
     ]
+
+    def act(self) -> None:
+        """Implement the behaviour."""
+        # respond to the long-polling clients whose timeout has expired, even if no http messages are received
+        cast(SharedState, self.context.state).request_statuses.expire_waiters()
+        super().act()
@@ -21,13 +21,15 @@
 
 import json
 import re
+import uuid
 from datetime import datetime
 from enum import Enum
-from typing import Callable, Dict, Optional, Tuple, cast
-from urllib.parse import urlparse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple, cast
+from urllib.parse import parse_qs, urlparse
 
 from aea.protocols.base import Message
 
+from packages.valory.connections.http_server.connection import HTTPChannel
 from packages.valory.connections.http_server.connection import (
     PUBLIC_ID as HTTP_SERVER_PUBLIC_ID,
 )
@@ -53,12 +55,21 @@ from packages.valory.skills.abstract_round_abci.handlers import (
 from packages.valory.skills.abstract_round_abci.handlers import (
     TendermintHandler as BaseTendermintHandler,
 )
+from packages.valory.skills.celo_trader_abci.behaviours import (
+    TO_ADDRESS_KEY,
+    VALUE_KEY,
+    validate_transfer,
+)
 from packages.valory.skills.celo_trader_abci.dialogues import (
     HttpDialogue,
     HttpDialogues,
 )
 from packages.valory.skills.celo_trader_abci.models import SharedState
-from packages.valory.skills.celo_trader_abci.rounds import SynchronizedData
+from packages.valory.skills.celo_trader_abci.rounds import (
+    REQUEST_ID_KEY,
+    SynchronizedData,
+    TRANSFER_KEY,
+)
 
 
 ABCIHandler = BaseABCIRoundHandler
@@ -70,6 +81,18 @@ IpfsHandler = BaseIpfsHandler
 
 OK_CODE = 200
 BAD_REQUEST_CODE = 400
+NOT_FOUND_CODE = 404
+TOO_MANY_REQUESTS_CODE = 429
+SERVICE_UNAVAILABLE_CODE = 503
+QUEUE_DEPTH_HEADER = "X-Queue-Depth"
+PATH_PARAMETER_REGEX = re.compile(r"{(\w+)}")
+PROMPT_KEY = "prompt"
+TIMEOUT_QUERY_KEY = "timeout"
+JSON_WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+URL_NETLOC_REGEX = re.compile(r"([a-zA-Z][a-zA-Z0-9+.-]*:)?//")
+# the http server times out the requests which are not handled in time, so the long polls are answered before that
+LONG_POLL_RESPONSE_MARGIN = 1.0
+MAX_LONG_POLL_TIMEOUT = HTTPChannel.RESPONSE_TIMEOUT - LONG_POLL_RESPONSE_MARGIN
 
 
 class HttpMethod(Enum):
@@ -80,6 +103,119 @@ class HttpMethod(Enum):
     POST = "post"
 
 
+def iter_bulk_items(body: str) -> Iterator[Tuple[Any, Optional[str]]]:
+    """
+    Parse the items of a bulk body incrementally.
+
+    The body is either a JSON array, or newline delimited JSON (NDJSON).
+    An NDJSON line which cannot be decoded only invalidates its own item,
+    while a malformed JSON array invalidates the rest of the array.
+
+    :param body: the decoded body.
+    :yield: the items, along with the reason why they could not be decoded, if any.
+    """
+    start = JSON_WHITESPACE_REGEX.match(body).end()  # type: ignore
+    if not body.startswith("[", start):
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line), None
+            except json.decoder.JSONDecodeError as e:
+                yield None, f"Invalid JSON: {e}."
+        return
+
+    decoder = json.JSONDecoder()
+    index = JSON_WHITESPACE_REGEX.match(body, start + 1).end()  # type: ignore
+    if body.startswith("]", index):
+        return
+    while True:
+        try:
+            item, index = decoder.raw_decode(body, index)
+        except json.decoder.JSONDecodeError as e:
+            yield None, f"Invalid JSON: {e}."
+            return
+        yield item, None
+
+        index = JSON_WHITESPACE_REGEX.match(body, index).end()  # type: ignore
+        if body.startswith(",", index):
+            index = JSON_WHITESPACE_REGEX.match(body, index + 1).end()  # type: ignore
+            continue
+        if not body.startswith("]", index):
+            yield None, f"Invalid JSON: expected ',' or ']' at char {index}."
+        elif body[index + 1 :].strip():
+            yield None, f"Invalid JSON: extra data after the array at char {index + 1}."
+        return
+
+
+class Router:
+    """
+    A table-driven router for the HTTP requests.
+
+    The patterns are compiled once, when the routes are added.
+    Each url is parsed once and routes are looked up per method,
+    first among the static paths, with a dictionary lookup, and then among the paths with parameters.
+    """
+
+    def __init__(self, hostname_regex: str) -> None:
+        """Initialize the router."""
+        self._hostname_pattern = re.compile(hostname_regex)
+        # method -> path -> handler
+        self._static_routes: Dict[str, Dict[str, Callable]] = {}
+        # method -> [(path pattern, handler)]
+        self._parametrized_routes: Dict[str, List[Tuple[Pattern, Callable]]] = {}
+
+    def add_route(self, methods: Tuple[str, ...], path: str, handler: Callable) -> None:
+        """
+        Add a route.
+
+        :param methods: the methods which are served by the route.
+        :param path: the route's path. Path parameters are given in braces, e.g., `/request/{id}`.
+        :param handler: the handler of the route, which receives the path parameters as keyword arguments.
+        """
+        path = path.rstrip("/")
+        path_pattern = (
+            re.compile(PATH_PARAMETER_REGEX.sub(r"(?P<\1>[^/]+)", path))
+            if PATH_PARAMETER_REGEX.search(path)
+            else None
+        )
+        for method in methods:
+            if path_pattern is None:
+                self._static_routes.setdefault(method, {})[path] = handler
+            else:
+                self._parametrized_routes.setdefault(method, []).append(
+                    (path_pattern, handler)
+                )
+
+    def match(
+        self, url: str, method: str
+    ) -> Tuple[bool, Optional[Callable], Dict[str, str]]:
+        """
+        Match a url to a route.
+
+        :param url: the url to match.
+        :param method: the method of the request.
+        :return: whether the url is meant for this router, the route's handler if any matches, and the path parameters.
+        """
+        # the url may lack a scheme, while a `//` elsewhere in it, e.g., in the query, does not start a netloc
+        parsed_url = urlparse(url if URL_NETLOC_REGEX.match(url) else f"//{url}")
+        hostname = parsed_url.hostname
+        if hostname is None or not self._hostname_pattern.fullmatch(hostname):
+            return False, None, {}
+
+        path = parsed_url.path.rstrip("/")
+        handler = self._static_routes.get(method, {}).get(path, None)
+        if handler is not None:
+            return True, handler, {}
+
+        for path_pattern, handler in self._parametrized_routes.get(method, ()):
+            match = path_pattern.fullmatch(path)
+            if match is not None:
+                return True, handler, match.groupdict()
+
+        return True, None, {}
+
+
 class HttpHandler(BaseHttpHandler):
     """This implements the echo handler."""
 
@@ -92,27 +228,66 @@ class HttpHandler(BaseHttpHandler):
             self.context.params.service_endpoint_base
         ).hostname
         propel_uri_base_hostname = (
-            r"https?:\/\/[a-zA-Z0-9]{16}.agent\.propel\.(staging\.)?autonolas\.tech"
+            r"[a-zA-Z0-9]{16}\.agent\.propel\.(staging\.)?autonolas\.tech"
         )
 
-        # Route regexes
-        hostname_regex = rf".*({service_endpoint_base}|{propel_uri_base_hostname}|localhost|127.0.0.1|0.0.0.0)(:\d+)?"
-        self.handler_url_regex = rf"{hostname_regex}\/.*"
-        request_url_regex = rf"{hostname_regex}\/request"
-        health_url_regex = rf"{hostname_regex}\/healthcheck"
-
-        # Routes
-        self.routes = {
-            (HttpMethod.GET.value, HttpMethod.HEAD.value): [
-                (health_url_regex, self._handle_get_health),
-            ],
-            (HttpMethod.POST.value,): [
-                (request_url_regex, self._handle_post_request),
-            ],
-        }
+        # Router
+        hostname_regex = rf".*({re.escape(str(service_endpoint_base))}|{propel_uri_base_hostname}|localhost|127\.0\.0\.1|0\.0\.0\.0)"
+        self.router = Router(hostname_regex)
+        self.router.add_route(
+            (HttpMethod.GET.value, HttpMethod.HEAD.value),
+            "/healthcheck",
+            self._handle_get_health,
+        )
+        self.router.add_route(
+            (HttpMethod.POST.value,), "/request", self._handle_post_request
+        )
+        self.router.add_route(
+            (HttpMethod.POST.value,), "/requests", self._handle_post_requests
+        )
+        self.router.add_route(
+            (HttpMethod.POST.value,), "/transfer", self._handle_post_transfer
+        )
+        self.router.add_route(
+            (HttpMethod.GET.value, HttpMethod.HEAD.value),
+            "/request/{request_id}",
+            self._handle_get_request_status,
+        )
+        self.router.add_route(
+            (HttpMethod.GET.value, HttpMethod.HEAD.value),
+            "/dead-letters",
+            self._handle_get_dead_letters,
+        )
+        self.router.add_route(
+            (HttpMethod.GET.value,),
+            "/request/{request_id}/result",
+            self._handle_get_request_result,
+        )
+        self.router.add_route(
+            (HttpMethod.GET.value, HttpMethod.HEAD.value),
+            "/safe",
+            self._handle_get_safe,
+        )
+
+        max_long_poll_timeout = self.context.params.max_long_poll_timeout
+        if max_long_poll_timeout > MAX_LONG_POLL_TIMEOUT:
+            self.context.logger.warning(
+                f"The long polls are answered within {MAX_LONG_POLL_TIMEOUT}s instead of {max_long_poll_timeout}s, "
+                f"as the http server times out the requests after {HTTPChannel.RESPONSE_TIMEOUT}s."
+            )
 
         self.json_content_header = "Content-Type: application/json\n"
 
+    @property
+    def queue_depth(self) -> int:
+        """Get the number of user requests waiting in the local queue."""
+        return len(self.context.state.user_requests)
+
+    @property
+    def backlog(self) -> int:
+        """Get the number of user requests and mech responses that are waiting to be processed."""
+        return self.queue_depth + self.synchronized_data.n_pending_mech_responses
+
     @property
     def synchronized_data(self) -> SynchronizedData:
         """Return the synchronized data."""
@@ -132,31 +307,23 @@ class HttpHandler(BaseHttpHandler):
             http://pfp.staging.autonolas.tech/120
 
         :param url: the url to check
-        :returns: the handling method if the message is intended to be handled by this handler, None otherwise, and the regex captures
+        :param method: the method of the request
+        :returns: the handling method if the message is intended to be handled by this handler, None otherwise, and the path parameters
         """
-        # Check base url
-        if not re.match(self.handler_url_regex, url):
+        is_handled, handler, kwargs = self.router.match(url, method)
+        if not is_handled:
             self.context.logger.info(
                 f"The url {url} does not match the {self.HANDLER_NAME}'s pattern"
             )
             return None, {}
 
-        # Check if there is a route for this request
-        for methods, routes in self.routes.items():
-            if method not in methods:
-                continue
-
-            for route in routes:
-                # Routes are tuples like (route_regex, handle_method)
-                m = re.match(route[0], url)
-                if m:
-                    return route[1], m.groupdict()
+        if handler is None:
+            self.context.logger.info(
+                f"The message [{method}] {url} is intended for the {self.HANDLER_NAME} but did not match any valid pattern"
+            )
+            return self._handle_bad_request, {}
 
-        # No route found
-        self.context.logger.info(
-            f"The message [{method}] {url} is intended for the {self.HANDLER_NAME} but did not match any valid pattern"
-        )
-        return self._handle_bad_request, {}
+        return handler, kwargs
 
     def handle(self, message: Message) -> None:
         """
@@ -166,6 +333,9 @@ class HttpHandler(BaseHttpHandler):
         """
         http_msg = cast(HttpMessage, message)
 
+        # Respond to the long-polling clients whose timeout has expired
+        cast(SharedState, self.context.state).request_statuses.expire_waiters()
+
         # Check if this is a request sent from the http_server skill
         if (
             http_msg.performative != HttpMessage.Performative.REQUEST
@@ -195,10 +365,10 @@ class HttpHandler(BaseHttpHandler):
 
         # Handle message
         self.context.logger.info(
-            "Received http request with method={}, url={} and body={!r}".format(
+            "Received http request with method={}, url={} and a body of {} bytes".format(
                 http_msg.method,
                 http_msg.url,
-                http_msg.body,
+                len(http_msg.body),
             )
         )
         handler(http_msg, http_dialogue, **kwargs)
@@ -223,7 +393,55 @@ class HttpHandler(BaseHttpHandler):
         )
 
         # Send response
-        self.context.logger.info("Responding with: {}".format(http_response))
+        self._log_response(http_response)
+        self.context.outbox.put_message(message=http_response)
+
+    def _handle_not_found(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue, msg: str = ""
+    ) -> None:
+        """
+        Handle a Http request for a resource which does not exist.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        :param msg: the message to respond with
+        """
+        http_response = http_dialogue.reply(
+            performative=HttpMessage.Performative.RESPONSE,
+            target_message=http_msg,
+            version=http_msg.version,
+            status_code=NOT_FOUND_CODE,
+            status_text="Not found",
+            headers=http_msg.headers,
+            body=msg.encode(),
+        )
+
+        # Send response
+        self._log_response(http_response)
+        self.context.outbox.put_message(message=http_response)
+
+    def _handle_service_unavailable(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue, msg: str = ""
+    ) -> None:
+        """
+        Handle a Http request which cannot be served in the current state of the service.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        :param msg: the message to respond with
+        """
+        http_response = http_dialogue.reply(
+            performative=HttpMessage.Performative.RESPONSE,
+            target_message=http_msg,
+            version=http_msg.version,
+            status_code=SERVICE_UNAVAILABLE_CODE,
+            status_text="Service unavailable",
+            headers=http_msg.headers,
+            body=msg.encode(),
+        )
+
+        # Send response
+        self._log_response(http_response)
         self.context.outbox.put_message(message=http_response)
 
     def _handle_get_health(
@@ -241,7 +459,8 @@ class HttpHandler(BaseHttpHandler):
         current_round = None
         previous_rounds = None
 
-        round_sequence = cast(SharedState, self.context.state).round_sequence
+        state = cast(SharedState, self.context.state)
+        round_sequence = state.round_sequence
 
         if round_sequence._last_round_transition_timestamp:
             is_tm_unhealthy = cast(
@@ -273,6 +492,17 @@ class HttpHandler(BaseHttpHandler):
             "current_round": current_round,
             "previous_rounds": previous_rounds,
             "is_transitioning_fast": is_transitioning_fast,
+            "queue_depth": self.queue_depth,
+            "queue_capacity": self.context.params.user_requests_queue_capacity,
+            "backlog": self.backlog,
+            "high_water_mark": self.context.params.user_requests_high_water_mark,
+            "prompt_cache": {
+                "size": len(json.loads(self.synchronized_data.prompt_cache)),
+                "max_size": self.context.params.prompt_cache_size,
+                "hits": state.prompt_cache_hits,
+                "misses": state.prompt_cache_misses,
+            },
+            "local_tool_executions": state.local_tools.n_executions,
         }
 
         self._send_ok_response(http_msg, http_dialogue, data)
@@ -287,14 +517,82 @@ class HttpHandler(BaseHttpHandler):
             version=http_msg.version,
             status_code=OK_CODE,
             status_text="Success",
-            headers=f"{self.json_content_header}{http_msg.headers}",
+            headers=f"{self.json_content_header}{self.queue_depth_header}{http_msg.headers}",
             body=json.dumps(data).encode("utf-8"),
         )
 
         # Send response
-        self.context.logger.info("Responding with: {}".format(http_response))
+        n_items = {
+            key: len(value)
+            for key, value in data.items()
+            if isinstance(value, (list, dict))
+        }
+        self._log_response(http_response, n_items)
+        self.context.outbox.put_message(message=http_response)
+
+    def _log_response(
+        self, http_response: HttpMessage, n_items: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Log a response by its status and size only, as its body may be large and echo the users' data.
+
+        :param http_response: the response.
+        :param n_items: the number of items of each of the listed fields of the response's data, if any.
+        """
+        msg = "Responding with status={} and a body of {} bytes".format(
+            http_response.status_code, len(http_response.body)
+        )
+        if n_items:
+            msg += f" and item counts {n_items}"
+        self.context.logger.info(msg)
+
+    @property
+    def queue_depth_header(self) -> str:
+        """Get the header which exposes the depth of the local queue."""
+        return f"{QUEUE_DEPTH_HEADER}: {self.queue_depth}\n"
+
+    def _send_too_many_requests_response(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue, retry_after: int
+    ) -> None:
+        """Send a Too Many Requests response, asking the client to retry after the given number of seconds"""
+        data = {
+            "error": "The service is at capacity. Please retry later.",
+            "retry_after": retry_after,
+            "queue_depth": self.queue_depth,
+        }
+        http_response = http_dialogue.reply(
+            performative=HttpMessage.Performative.RESPONSE,
+            target_message=http_msg,
+            version=http_msg.version,
+            status_code=TOO_MANY_REQUESTS_CODE,
+            status_text="Too Many Requests",
+            headers=f"{self.json_content_header}{self.queue_depth_header}Retry-After: {retry_after}\n{http_msg.headers}",
+            body=json.dumps(data).encode("utf-8"),
+        )
+
+        # Send response
+        self._log_response(http_response)
         self.context.outbox.put_message(message=http_response)
 
+    def _get_retry_after(self, n_new: int = 1) -> Optional[int]:
+        """
+        Check whether the given number of new user requests can be accepted.
+
+        :param n_new: the number of new user requests.
+        :return: `None` if the requests can be accepted, otherwise the estimated seconds after which to retry.
+        """
+        params = self.context.params
+        n_excess = max(
+            self.queue_depth - params.user_requests_queue_capacity,
+            self.backlog - params.user_requests_high_water_mark,
+        )
+        n_excess += n_new - 1
+        if n_excess < 0:
+            return None
+
+        state = cast(SharedState, self.context.state)
+        return state.drain_rate.retry_after(n_excess + 1, params.reset_pause_duration)
+
     def _handle_post_request(
         self, http_msg: HttpMessage, http_dialogue: HttpDialogue
     ) -> None:
@@ -304,7 +602,287 @@ class HttpHandler(BaseHttpHandler):
             msg = f"Received invalid JSON request: {http_msg.body}."
             return self._handle_bad_request(http_msg, http_dialogue, msg)
 
-        self.context.logger.info(f"Received user request: {request}")
-        self.context.state.user_requests.append(request)
-        response_body_data = {}
+        reason = self._validate_prompt_request(request)
+        if reason is not None:
+            msg = f"{reason} Received: {request}."
+            return self._handle_bad_request(http_msg, http_dialogue, msg)
+
+        retry_after = self._get_retry_after()
+        if retry_after is not None:
+            self.context.logger.warning(
+                f"Rejecting user request, as the queue is at capacity: "
+                f"queue depth {self.queue_depth}, backlog {self.backlog}."
+            )
+            return self._send_too_many_requests_response(
+                http_msg, http_dialogue, retry_after
+            )
+
+        max_balance = cast(SharedState, self.context.state).safe_states.max_balance(
+            self.context.params.safe_pool
+        )
+        if max_balance == 0:
+            msg = "The service's Safes have no funds to settle any transfer. Please retry later."
+            return self._handle_service_unavailable(http_msg, http_dialogue, msg)
+
+        request_id = self._add_prompt_request(request[PROMPT_KEY])
+        self.context.logger.info(
+            f"Received user request {request_id!r}, with a prompt of {len(request[PROMPT_KEY])} characters."
+        )
+        response_body_data = {REQUEST_ID_KEY: request_id}
         self._send_ok_response(http_msg, http_dialogue, response_body_data)
+
+    @staticmethod
+    def _validate_prompt_request(request: Any) -> Optional[str]:
+        """
+        Validate a user request with a prompt.
+
+        :param request: the user request, as received.
+        :return: `None` if the request is valid, otherwise the reason why it is not.
+        """
+        if not isinstance(request, dict) or not isinstance(
+            request.get(PROMPT_KEY, None), str
+        ):
+            return f"Expected a JSON object with a {PROMPT_KEY!r} string."
+        return None
+
+    def _add_prompt_request(self, prompt: str) -> str:
+        """
+        Add a new user request with the given prompt to the local queue.
+
+        :param prompt: the user's prompt.
+        :return: the id of the user request.
+        """
+        user_request = {REQUEST_ID_KEY: uuid.uuid4().hex, PROMPT_KEY: prompt}
+        self.context.state.add_user_request(user_request)
+        return user_request[REQUEST_ID_KEY]
+
+    def _handle_post_requests(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue
+    ) -> None:
+        """
+        Handle a Http request which submits several user requests at once.
+
+        The body is either a JSON array of user requests, or one user request per line (NDJSON).
+        The items are parsed, validated and queued in a single pass, and each of them is accepted or rejected on its own.
+        Once the queue is at capacity, the rest of the items are rejected, along with the estimated seconds after which to retry.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        """
+        try:
+            body = http_msg.body.decode("utf-8")
+        except UnicodeDecodeError:
+            msg = "Expected a UTF-8 encoded body."
+            return self._handle_bad_request(http_msg, http_dialogue, msg)
+
+        max_balance = cast(SharedState, self.context.state).safe_states.max_balance(
+            self.context.params.safe_pool
+        )
+        if max_balance == 0:
+            msg = "The service's Safes have no funds to settle any transfer. Please retry later."
+            return self._handle_service_unavailable(http_msg, http_dialogue, msg)
+
+        results: List[Dict[str, Any]] = []
+        retry_after: Optional[int] = None
+        for request, reason in iter_bulk_items(body):
+            if reason is None:
+                reason = self._validate_prompt_request(request)
+            if reason is not None:
+                results.append({"error": reason})
+                continue
+
+            if retry_after is None:
+                retry_after = self._get_retry_after()
+            if retry_after is not None:
+                results.append(
+                    {
+                        "error": "The service is at capacity. Please retry later.",
+                        "retry_after": retry_after,
+                    }
+                )
+                continue
+
+            request_id = self._add_prompt_request(request[PROMPT_KEY])
+            results.append({REQUEST_ID_KEY: request_id})
+
+        n_accepted = sum(REQUEST_ID_KEY in result for result in results)
+        self.context.logger.info(
+            f"Received {len(results)} user request(s) in bulk, {n_accepted} of which were accepted."
+        )
+        response_body_data = {
+            "n_accepted": n_accepted,
+            "n_rejected": len(results) - n_accepted,
+            "results": results,
+        }
+        self._send_ok_response(http_msg, http_dialogue, response_body_data)
+
+    def _handle_post_transfer(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue
+    ) -> None:
+        """
+        Handle a Http request for one or more structured transfers.
+
+        The transfers are queued straight for settlement, without going through the mech.
+        Each transfer becomes a user request of its own, and either all or none of them are accepted.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        """
+        try:
+            body = json.loads(http_msg.body)
+        except json.decoder.JSONDecodeError:
+            msg = f"Received invalid JSON request: {http_msg.body}."
+            return self._handle_bad_request(http_msg, http_dialogue, msg)
+
+        is_bulk = isinstance(body, list)
+        transfers = body if is_bulk else [body]
+        if not transfers:
+            msg = "Expected at least one transfer."
+            return self._handle_bad_request(http_msg, http_dialogue, msg)
+
+        for i, transfer in enumerate(transfers):
+            reason = validate_transfer(
+                transfer, self.context.params.max_transfer_value_wei
+            )
+            if reason is not None:
+                msg = f"Invalid transfer at index {i}: {reason} Received: {transfer}."
+                return self._handle_bad_request(http_msg, http_dialogue, msg)
+
+        retry_after = self._get_retry_after(len(transfers))
+        if retry_after is not None:
+            self.context.logger.warning(
+                f"Rejecting {len(transfers)} transfer(s), as the queue is at capacity: "
+                f"queue depth {self.queue_depth}, backlog {self.backlog}."
+            )
+            return self._send_too_many_requests_response(
+                http_msg, http_dialogue, retry_after
+            )
+
+        max_balance = cast(SharedState, self.context.state).safe_states.max_balance(
+            self.context.params.safe_pool
+        )
+        # the transfers of a request are settled together, so their total value has to be covered by a single Safe
+        total_value = sum(transfer[VALUE_KEY] for transfer in transfers)
+        if max_balance is not None and total_value > max_balance:
+            msg = f"The total value of the transfers exceeds the balance of the service's Safes: {total_value} > {max_balance}."
+            return self._handle_service_unavailable(http_msg, http_dialogue, msg)
+
+        request_ids = []
+        for transfer in transfers:
+            user_request = {
+                REQUEST_ID_KEY: uuid.uuid4().hex,
+                TRANSFER_KEY: {
+                    TO_ADDRESS_KEY: transfer[TO_ADDRESS_KEY],
+                    VALUE_KEY: transfer[VALUE_KEY],
+                },
+            }
+            self.context.state.add_user_request(user_request)
+            request_ids.append(user_request[REQUEST_ID_KEY])
+
+        if is_bulk:
+            self.context.logger.info(f"Received {len(transfers)} transfer(s) in bulk.")
+        else:
+            self.context.logger.info(f"Received transfer request {request_ids[0]!r}.")
+        response_body_data = (
+            {"request_ids": request_ids}
+            if is_bulk
+            else {REQUEST_ID_KEY: request_ids[0]}
+        )
+        self._send_ok_response(http_msg, http_dialogue, response_body_data)
+
+    def _handle_get_request_status(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue, request_id: str
+    ) -> None:
+        """
+        Handle a Http request for the status of a user request.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        :param request_id: the id of the user request
+        """
+        state = cast(SharedState, self.context.state)
+        status = state.request_statuses.get(request_id)
+        if status is None:
+            msg = f"Unknown request id {request_id!r}."
+            return self._handle_not_found(http_msg, http_dialogue, msg)
+
+        self._send_ok_response(
+            http_msg, http_dialogue, {REQUEST_ID_KEY: request_id, **status}
+        )
+
+    def _handle_get_dead_letters(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue
+    ) -> None:
+        """
+        Handle a Http request for the transfers which could not be settled.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        """
+        state = cast(SharedState, self.context.state)
+        data = {"dead_letters": list(state.dead_letters)}
+        self._send_ok_response(http_msg, http_dialogue, data)
+
+    def _handle_get_safe(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue
+    ) -> None:
+        """
+        Handle a Http request for the cached state of the service's Safes.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        """
+        safe_states = cast(SharedState, self.context.state).safe_states
+        safes = []
+        for safe_address in self.context.params.safe_pool:
+            state = safe_states.get(safe_address)
+            if state is not None:
+                safes.append({"address": safe_address, **state.to_json()})
+        if not safes:
+            msg = "The Safes' state has not been fetched yet."
+            return self._handle_not_found(http_msg, http_dialogue, msg)
+
+        self._send_ok_response(http_msg, http_dialogue, {"safes": safes})
+
+    def _handle_get_request_result(
+        self, http_msg: HttpMessage, http_dialogue: HttpDialogue, request_id: str
+    ) -> None:
+        """
+        Handle a Http long-polling request for the final status of a user request.
+
+        The response is deferred until the request is settled or rejected, or until the timeout expires,
+        in which case the current status is returned.
+
+        :param http_msg: the http message
+        :param http_dialogue: the http dialogue
+        :param request_id: the id of the user request
+        """
+        params = self.context.params
+        query = parse_qs(urlparse(http_msg.url).query)
+        try:
+            timeout = float(
+                query.get(TIMEOUT_QUERY_KEY, [params.max_long_poll_timeout])[0]
+            )
+        except ValueError:
+            msg = f"Invalid {TIMEOUT_QUERY_KEY!r} query parameter: {query[TIMEOUT_QUERY_KEY]}."
+            return self._handle_bad_request(http_msg, http_dialogue, msg)
+        timeout = max(
+            0.0, min(timeout, params.max_long_poll_timeout, MAX_LONG_POLL_TIMEOUT)
+        )
+
+        request_statuses = cast(SharedState, self.context.state).request_statuses
+        if request_statuses.n_waiters >= params.max_long_poll_waiters:
+            # too many clients are waiting, degrade to plain polling
+            timeout = 0.0
+
+        def respond(status: Optional[Dict]) -> None:
+            """Respond with the given status of the request."""
+            if status is None:
+                msg = f"Unknown request id {request_id!r}."
+                self._handle_not_found(http_msg, http_dialogue, msg)
+                return
+            self._send_ok_response(
+                http_msg, http_dialogue, {REQUEST_ID_KEY: request_id, **status}
+            )
+
+        request_statuses.wait(request_id, respond, timeout)
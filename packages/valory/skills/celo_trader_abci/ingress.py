@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the backpressure helpers for the skill's ingress queue."""
+
+import math
+import time
+from typing import Optional
+
+
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 300
+
+
+class DrainRateTracker:
+    """
+    Tracks the rate at which the local queue of user requests is drained.
+
+    The rate is kept as an exponentially weighted moving average of the requests drained per second,
+    so that a single slow or fast period does not dominate the estimate.
+    """
+
+    def __init__(self, smoothing: float = 0.3) -> None:
+        """Initialize the tracker."""
+        self.smoothing = smoothing
+        self.rate: Optional[float] = None
+        self._last_drain: Optional[float] = None
+
+    def record(self, n_drained: int, now: Optional[float] = None) -> None:
+        """Record that the given number of requests left the queue."""
+        now = time.monotonic() if now is None else now
+        if self._last_drain is not None and now > self._last_drain:
+            rate = n_drained / (now - self._last_drain)
+            self.rate = (
+                rate
+                if self.rate is None
+                else self.smoothing * rate + (1 - self.smoothing) * self.rate
+            )
+        self._last_drain = now
+
+    def mark_idle(self, now: Optional[float] = None) -> None:
+        """Mark that the queue is empty, so that the idle time does not count against the drain rate."""
+        self._last_drain = time.monotonic() if now is None else now
+
+    def retry_after(self, n_excess: int, default: float) -> int:
+        """
+        Estimate after how many seconds the queue will have drained the given number of excess requests.
+
+        :param n_excess: the number of requests that need to be drained before new ones are accepted.
+        :param default: the estimate to use if no drain rate has been observed yet.
+        :return: the estimate in seconds, bounded to `[MIN_RETRY_AFTER, MAX_RETRY_AFTER]`.
+        """
+        estimate = n_excess / self.rate if self.rate else default
+        return max(MIN_RETRY_AFTER, min(MAX_RETRY_AFTER, math.ceil(estimate)))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains a write-ahead journal for the pending user requests."""
+
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, IO, Iterable, List, Optional
+
+
+OPERATION_KEY = "op"
+ADD_OPERATION = "add"
+ACK_OPERATION = "ack"
+REQUEST_KEY = "request"
+IDS_KEY = "ids"
+
+
+class RequestJournal:
+    """
+    An append-only, on-disk journal of the pending user requests.
+
+    Every accepted request is appended and flushed immediately, so that it survives a crash of the agent process.
+    The more expensive `fsync`s, which protect against a crash of the host, are grouped in batches.
+    Requests are acknowledged once their status is final, i.e., once they are settled, rejected or dead-lettered,
+    and the journal is compacted to the pending requests once enough acknowledgements have piled up.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        request_id_key: str,
+        fsync_batch_size: int,
+        fsync_interval: float,
+        compaction_threshold: int,
+    ) -> None:
+        """Initialize the journal."""
+        self.path = path
+        self.request_id_key = request_id_key
+        self.fsync_batch_size = fsync_batch_size
+        self.fsync_interval = fsync_interval
+        self.compaction_threshold = compaction_threshold
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._n_unsynced = 0
+        self._n_acked = 0
+        self._last_sync = time.monotonic()
+        self._file: Optional[IO[str]] = None
+
+    def replay(self) -> List[Dict[str, Any]]:
+        """
+        Replay the journal and open it for appending.
+
+        :return: the pending requests, in the order in which they were received.
+        """
+        self._pending.clear()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # a partially written record, caused by a crash
+                        continue
+                    self._apply(record)
+
+        # rewrite the journal to get rid of the acknowledged requests before appending to it
+        self.compact()
+        return list(self._pending.values())
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply a journal record to the pending requests."""
+        operation = record.get(OPERATION_KEY, None)
+        if operation == ADD_OPERATION:
+            request = record[REQUEST_KEY]
+            self._pending[request[self.request_id_key]] = request
+        elif operation == ACK_OPERATION:
+            for request_id in record[IDS_KEY]:
+                self._pending.pop(request_id, None)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Write a record to the journal."""
+        if self._file is None:
+            self._file = open(  # pylint: disable=consider-using-with
+                self.path, "a", encoding="utf-8"
+            )
+        self._file.write(json.dumps(record, sort_keys=True) + "\n")
+        self._file.flush()
+        self._n_unsynced += 1
+
+    def append(self, request: Dict[str, Any]) -> None:
+        """Append a newly accepted request to the journal."""
+        self._pending[request[self.request_id_key]] = request
+        self._write({OPERATION_KEY: ADD_OPERATION, REQUEST_KEY: request})
+        self.maybe_sync()
+
+    def ack(self, request_ids: Iterable[str]) -> None:
+        """Acknowledge the given requests, so that they are not replayed."""
+        acked = [
+            request_id
+            for request_id in request_ids
+            if self._pending.pop(request_id, None) is not None
+        ]
+        if not acked:
+            return
+
+        self._write({OPERATION_KEY: ACK_OPERATION, IDS_KEY: acked})
+        self._n_acked += len(acked)
+        if self._n_acked >= self.compaction_threshold:
+            self.compact()
+            return
+        self.maybe_sync()
+
+    def sync(self) -> None:
+        """Force the written records to the disk."""
+        if self._file is not None and self._n_unsynced:
+            os.fsync(self._file.fileno())
+        self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def maybe_sync(self) -> None:
+        """Sync the journal if enough records have been written or enough time has passed since the last sync."""
+        if not self._n_unsynced:
+            return
+        if (
+            self._n_unsynced >= self.fsync_batch_size
+            or time.monotonic() - self._last_sync >= self.fsync_interval
+        ):
+            self.sync()
+
+    def compact(self) -> None:
+        """Atomically rewrite the journal so that it only contains the pending requests."""
+        self.close()
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as journal:
+            for request in self._pending.values():
+                record = {OPERATION_KEY: ADD_OPERATION, REQUEST_KEY: request}
+                journal.write(json.dumps(record, sort_keys=True) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.path)
+        self._n_acked = 0
+        self._n_unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tools which turn the prompts of trusted formats into call data in-process."""
+
+import importlib
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+
+class LocalTool(ABC):
+    """A tool which turns the prompts of a trusted format into call data, without requesting the mech."""
+
+    @abstractmethod
+    def execute(self, prompt: str) -> Optional[Any]:
+        """
+        Execute the tool on a prompt.
+
+        :param prompt: the user's prompt.
+        :return: the call data, in the same form as the mech's result, or `None` if the prompt is not supported.
+        """
+
+
+class WeiTransferTool(LocalTool):
+    """Handles the prompts of the form `Transfer <amount> wei to <address>`."""
+
+    PATTERN = re.compile(
+        r"\s*(?:transfer|send|pay)\s+(\d+)\s+wei\s+to\s+(0x[0-9a-fA-F]{40})\s*\.?\s*",
+        re.IGNORECASE,
+    )
+
+    def execute(self, prompt: str) -> Optional[Any]:
+        """Execute the tool on a prompt."""
+        match = self.PATTERN.fullmatch(prompt)
+        if match is None:
+            return None
+        value, to_address = match.groups()
+        return {"value": int(value), "to_address": to_address}
+
+
+BUILTIN_TOOLS: Dict[str, Type[LocalTool]] = {
+    "wei_transfer": WeiTransferTool,
+}
+
+
+def load_tool(name: str) -> LocalTool:
+    """
+    Load a local tool.
+
+    :param name: the name of a builtin tool, or the import path of a `LocalTool` class, in the form `module:ClassName`.
+    :return: the tool.
+    """
+    tool_class = BUILTIN_TOOLS.get(name, None)
+    if tool_class is None:
+        module_name, _, class_name = name.partition(":")
+        if not class_name:
+            raise ValueError(
+                f"Unknown local tool {name!r}. Expected one of {sorted(BUILTIN_TOOLS)}, "
+                "or an import path in the form `module:ClassName`."
+            )
+        tool_class = getattr(importlib.import_module(module_name), class_name)
+
+    if not isinstance(tool_class, type) or not issubclass(tool_class, LocalTool):
+        raise ValueError(f"Local tool {name!r} is not a `LocalTool`.")
+    return tool_class()
+
+
+class LocalToolExecutor:
+    """Executes the registered local tools on a prompt, in order, until one of them supports it."""
+
+    def __init__(self, tools: List[LocalTool]) -> None:
+        """Initialize the executor."""
+        self.tools = tools
+        self.n_executions = 0
+
+    @classmethod
+    def from_names(cls, names: List[str]) -> "LocalToolExecutor":
+        """Create an executor for the tools with the given names."""
+        return cls([load_tool(name) for name in names])
+
+    def execute(self, prompt: str) -> Optional[str]:
+        """
+        Execute the registered tools on a prompt.
+
+        A tool which fails is treated as if it did not support the prompt, so that the prompt falls back to the mech.
+
+        :param prompt: the user's prompt.
+        :return: the encoded call data, as the mech would return them, or `None` if no tool supports the prompt.
+        """
+        for tool in self.tools:
+            try:
+                call_data = tool.execute(prompt)
+                if call_data is None:
+                    continue
+                result = json.dumps(call_data, sort_keys=True)
+            except Exception:  # pylint: disable=broad-except
+                continue
+            self.n_executions += 1
+            return result
+        return None
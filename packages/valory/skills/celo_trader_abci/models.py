@@ -19,7 +19,8 @@
 
 """This module contains the shared state for the abci skill of CeloTraderAbciApp."""
 
-from typing import Any, List
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 from aea.skills.base import SkillContext
 
@@ -31,7 +32,24 @@ from packages.valory.skills.abstract_round_abci.models import Requests as BaseRe
 from packages.valory.skills.abstract_round_abci.models import (
     SharedState as BaseSharedState,
 )
-from packages.valory.skills.celo_trader_abci.rounds import CeloTraderAbciApp
+from packages.valory.skills.celo_trader_abci.ingress import DrainRateTracker
+from packages.valory.skills.celo_trader_abci.journal import RequestJournal
+from packages.valory.skills.celo_trader_abci.local_tools import LocalToolExecutor
+from packages.valory.skills.celo_trader_abci.rounds import (
+    CeloTraderAbciApp,
+    REQUEST_ID_KEY,
+)
+from packages.valory.skills.celo_trader_abci.safe import (
+    SafeStateCache,
+    SafeTxHashEngine,
+)
+from packages.valory.skills.celo_trader_abci.status import (
+    RequestStatus,
+    RequestStatusIndex,
+)
+
+
+DEFAULT_STATUS_RETENTION = 10_000
 
 
 class SharedState(BaseSharedState):
@@ -42,7 +60,88 @@ class SharedState(BaseSharedState):
     def __init__(self, *args: Any, skill_context: SkillContext, **kwargs: Any) -> None:
         """Init"""
         super().__init__(*args, skill_context=skill_context, **kwargs)
-        self.user_requests: List = []
+        self.user_requests: List[Dict[str, Any]] = []
+        self.safe_tx_hash_engine = SafeTxHashEngine()
+        self.safe_states = SafeStateCache()
+        # the hash of the last settled tx which the local state has been updated for
+        self.last_settled_tx_hash: Optional[str] = None
+        self.request_journal: Optional[RequestJournal] = None
+        self.drain_rate = DrainRateTracker()
+        self.request_statuses = RequestStatusIndex(DEFAULT_STATUS_RETENTION)
+        self.dead_letters: Deque[Dict[str, Any]] = deque(
+            maxlen=DEFAULT_STATUS_RETENTION
+        )
+        # recipient -> (whether a transfer to it succeeds, period in which it was simulated)
+        self.preflight_results: Dict[str, Tuple[bool, int]] = {}
+        self.prompt_cache_hits = 0
+        self.prompt_cache_misses = 0
+        self.local_tools = LocalToolExecutor([])
+
+    def setup(self) -> None:
+        """Set up the model."""
+        super().setup()
+        params = self.context.params
+        self.request_statuses.max_size = params.request_status_retention
+        self.dead_letters = deque(maxlen=params.request_status_retention)
+        self.local_tools = LocalToolExecutor.from_names(params.local_tools)
+        if not params.request_journal_path:
+            return
+
+        self.request_journal = RequestJournal(
+            params.request_journal_path,
+            REQUEST_ID_KEY,
+            params.journal_fsync_batch_size,
+            params.journal_fsync_interval,
+            params.journal_compaction_threshold,
+        )
+        self.request_statuses.on_final = self.ack_user_request
+        self.user_requests = self.request_journal.replay()
+        for request in self.user_requests:
+            self.request_statuses.set_status(
+                request[REQUEST_ID_KEY], RequestStatus.QUEUED
+            )
+        if self.user_requests:
+            self.context.logger.info(
+                f"Recovered {len(self.user_requests)} pending user request(s) "
+                f"from {params.request_journal_path!r}."
+            )
+
+    def add_user_request(self, request: Dict[str, Any]) -> None:
+        """Add an accepted user request to the local queue."""
+        if self.request_journal is not None:
+            self.request_journal.append(request)
+        self.user_requests.append(request)
+        self.request_statuses.set_status(request[REQUEST_ID_KEY], RequestStatus.QUEUED)
+
+    def ack_user_request(self, request_id: str) -> None:
+        """Acknowledge a user request in the journal, as its status is final."""
+        if self.request_journal is not None:
+            self.request_journal.ack((request_id,))
+
+    def commit_user_requests(self, request_ids: Set[str]) -> None:
+        """
+        Remove the given requests from the local queue, as they have been committed to the synchronized data.
+
+        They are only acknowledged in the journal once their status is final,
+        so that a crash before that point replays them instead of losing them.
+        """
+        if self.request_journal is not None:
+            self.request_journal.maybe_sync()
+
+        n_pending = len(self.user_requests)
+        if not n_pending:
+            self.drain_rate.mark_idle()
+            return
+        if not request_ids:
+            return
+
+        self.user_requests = [
+            request
+            for request in self.user_requests
+            if request[REQUEST_ID_KEY] not in request_ids
+        ]
+        n_drained = n_pending - len(self.user_requests)
+        self.drain_rate.record(n_drained)
 
 
 Requests = BaseRequests
@@ -59,4 +158,69 @@ class Params(BaseParams):
         self.max_transfer_value_wei: int = self._ensure(
             "max_transfer_value_wei", kwargs, int
         )
+        self.safe_chain_id: int = self._ensure("safe_chain_id", kwargs, int)
+        self.request_journal_path: Optional[str] = self._ensure(
+            "request_journal_path", kwargs, Optional[str]
+        )
+        self.journal_fsync_batch_size: int = self._ensure(
+            "journal_fsync_batch_size", kwargs, int
+        )
+        self.journal_fsync_interval: float = self._ensure(
+            "journal_fsync_interval", kwargs, float
+        )
+        self.journal_compaction_threshold: int = self._ensure(
+            "journal_compaction_threshold", kwargs, int
+        )
+        # the capacity bounds the local queue, while the high-water mark bounds the whole backlog,
+        # i.e., the local queue along with the mech responses which are pending settlement
+        self.user_requests_queue_capacity: int = self._ensure(
+            "user_requests_queue_capacity", kwargs, int
+        )
+        self.user_requests_high_water_mark: int = self._ensure(
+            "user_requests_high_water_mark", kwargs, int
+        )
+        self.request_status_retention: int = self._ensure(
+            "request_status_retention", kwargs, int
+        )
+        self.max_long_poll_timeout: float = self._ensure(
+            "max_long_poll_timeout", kwargs, float
+        )
+        self.max_long_poll_waiters: int = self._ensure(
+            "max_long_poll_waiters", kwargs, int
+        )
+        self.pipelined_mech_requests: bool = self._ensure(
+            "pipelined_mech_requests", kwargs, bool
+        )
+        self.max_settlement_attempts: int = self._ensure(
+            "max_settlement_attempts", kwargs, int
+        )
+        self.settlement_retry_backoff: float = self._ensure(
+            "settlement_retry_backoff", kwargs, float
+        )
+        self.max_settlement_retry_backoff: float = self._ensure(
+            "max_settlement_retry_backoff", kwargs, float
+        )
+        self.preflight_transfers: bool = self._ensure(
+            "preflight_transfers", kwargs, bool
+        )
+        self.safe_pool_addresses: List[str] = self._ensure(
+            "safe_pool_addresses", kwargs, List[str]
+        )
+        self.coalesce_transfers: bool = self._ensure("coalesce_transfers", kwargs, bool)
+        self.prompt_cache_size: int = self._ensure("prompt_cache_size", kwargs, int)
+        self.prompt_cache_ttl: float = self._ensure("prompt_cache_ttl", kwargs, float)
+        self.local_tools: List[str] = self._ensure("local_tools", kwargs, List[str])
+        # the multisend params are shared with the `mech_interact_abci` skill, therefore we do not pop them
+        self.multisend_address: str = kwargs.get("multisend_address", "")
+        self.multisend_batch_size: int = kwargs.get("multisend_batch_size", 1)
         super().__init__(*args, **kwargs)
+
+    @property
+    def safe_pool(self) -> List[str]:
+        """Get the Safes which settle the transfers, starting with the service's Safe."""
+        service_safe = self.setup_params["safe_contract_address"]
+        return [service_safe] + [
+            safe_address
+            for safe_address in self.safe_pool_addresses
+            if safe_address != service_safe
+        ]
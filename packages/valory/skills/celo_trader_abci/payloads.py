@@ -32,7 +32,14 @@ class DecisionMakingPayload(BaseTxPayload):
 
 
 @dataclass(frozen=True)
-class PostTxDecisionMakingPayload(BaseTxPayload):
-    """Represent a transaction payload for the PostTxDecisionMakingRound."""
+class SettlementRetryPayload(BaseTxPayload):
+    """Represent a transaction payload for the SettlementRetryRound."""
 
-    event: str
+    content: str
+
+
+@dataclass(frozen=True)
+class UserRequestsPayload(BaseTxPayload):
+    """Represent a transaction payload for the CollectUserRequestsRound."""
+
+    content: str
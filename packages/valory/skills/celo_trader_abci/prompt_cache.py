@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the cache of the mech's results per prompt."""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+
+def get_cache_key(tool: str, prompt: str) -> str:
+    """Get the cache key of a prompt for the given tool, ignoring differences in casing and whitespace."""
+    normalized_prompt = " ".join(prompt.split()).casefold()
+    seed = json.dumps([tool, normalized_prompt])
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """
+    A cache of the validated results of the mech, per tool and normalized prompt.
+
+    The entries expire after a TTL, and the least recently used ones are evicted once the cache is full.
+    The cache is part of the synchronized data, therefore, it is only updated by the rounds,
+    using the timestamps which the agents have agreed on, so that all the agents observe the same hits.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Initialize the cache."""
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (result, expiry timestamp), from the least to the most recently used
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        return len(self._entries)
+
+    @classmethod
+    def from_json(cls, serialized: str, max_size: int, ttl: float) -> "PromptCache":
+        """Decode a serialized cache."""
+        cache = cls(max_size, ttl)
+        for key, result, expires_at in json.loads(serialized):
+            cache._entries[key] = (result, expires_at)
+        return cache
+
+    def to_json(self) -> str:
+        """Serialize the cache."""
+        return json.dumps(
+            [
+                [key, result, expires_at]
+                for key, (result, expires_at) in self._entries.items()
+            ]
+        )
+
+    def get(self, key: str, now: float) -> Optional[str]:
+        """Get the cached result for the given key, or `None` if it is missing or has expired."""
+        result, expires_at = self._entries.get(key, (None, 0.0))
+        if result is None or expires_at <= now:
+            return None
+        return result
+
+    def update(
+        self, entries: Iterable[List[str]], hits: Iterable[str], now: float
+    ) -> None:
+        """
+        Update the cache.
+
+        :param entries: the newly received `[key, result]` pairs to store.
+        :param hits: the keys which have been served from the cache.
+        :param now: the agreed current timestamp.
+        """
+        for key in hits:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+
+        expires_at = now + self.ttl
+        for key, result in entries:
+            self._entries[key] = (result, expires_at)
+            self._entries.move_to_end(key)
+
+        expired = [key for key, (_, expiry) in self._entries.items() if expiry <= now]
+        for key in expired:
+            del self._entries[key]
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -20,14 +20,19 @@
 """This package contains the rounds of CeloTraderAbciApp."""
 
 import json
+from dataclasses import asdict, replace
 from enum import Enum
-from typing import Dict, FrozenSet, Optional, Set, Tuple
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from packages.valory.skills.abstract_round_abci.base import (
     AbciApp,
     AbciAppTransitionFunction,
+    AbstractRound,
     AppState,
     BaseSynchronizedData,
+    BaseTxPayload,
+    CollectDifferentUntilThresholdRound,
     CollectSameUntilThresholdRound,
     DegenerateRound,
     EventToTimeout,
@@ -35,24 +40,69 @@ from packages.valory.skills.abstract_round_abci.base import (
 )
 from packages.valory.skills.celo_trader_abci.payloads import (
     DecisionMakingPayload,
-    PostTxDecisionMakingPayload,
+    SettlementRetryPayload,
+    UserRequestsPayload,
+)
+from packages.valory.skills.celo_trader_abci.prompt_cache import PromptCache
+from packages.valory.skills.mech_interact_abci.states.base import (
+    MechInteractionResponse,
 )
 from packages.valory.skills.mech_interact_abci.states.base import (
     SynchronizedData as MechSyncedData,
 )
 
 
+EMPTY_MECH_RESPONSES = "[]"
+EMPTY_USER_REQUESTS = "[]"
+EMPTY_MECH_DELIVERIES = "[]"
+EMPTY_SETTLEMENT_ATTEMPTS = "{}"
+EMPTY_RETRY_DEADLINES = "{}"
+EMPTY_PROMPT_CACHE = "[]"
+EMPTY_MECH_REQUEST_FOLLOWERS = "{}"
+REQUEST_ID_KEY = "request_id"
+TRANSFER_KEY = "transfer"
+
+
+def fan_out_mech_responses(
+    mech_responses: Iterable[MechInteractionResponse],
+    followers: Dict[str, List[str]],
+) -> Tuple[MechInteractionResponse, ...]:
+    """Copy every mech response to the deduplicated mech requests which have followed it, right after it."""
+    fanned_out = []
+    for mech_response in mech_responses:
+        fanned_out.append(mech_response)
+        for nonce in followers.get(mech_response.nonce, []):
+            fanned_out.append(replace(mech_response, nonce=nonce))
+    return tuple(fanned_out)
+
+
+@lru_cache(maxsize=1)
+def decode_mech_responses(
+    serialized: str, serialized_followers: str
+) -> Tuple[MechInteractionResponse, ...]:
+    """Decode the serialized mech responses, reusing the result while the serialized values do not change."""
+    return fan_out_mech_responses(
+        (MechInteractionResponse(**response) for response in json.loads(serialized)),
+        json.loads(serialized_followers),
+    )
+
+
 class Event(Enum):
     """CeloTraderAbciApp Events"""
 
     DECISION_MAKING = "decision_making"
     MECH = "mech"
+    MECH_RESPONSE = "mech_response"
     SETTLE = "settle"
     DONE = "done"
     NO_MAJORITY = "no_majority"
     ROUND_TIMEOUT = "round_timeout"
 
 
+# the post-tx event which goes back to decision making, which the decision making round itself cannot emit
+DECISION_MAKING_POST_TX_EVENT = Event.DECISION_MAKING.value
+
+
 class SynchronizedData(MechSyncedData):
     """
     Class to represent the synchronized data.
@@ -65,6 +115,221 @@ class SynchronizedData(MechSyncedData):
         """Get the post_tx_event."""
         return self.db.get("post_tx_event", None)
 
+    def _get_user_requests(self, key: str) -> List[Dict[str, Any]]:
+        """Get the user requests stored under the given key."""
+        serialized = self.db.get(key, EMPTY_USER_REQUESTS)
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def dispatched_user_requests(self) -> List[Dict[str, Any]]:
+        """Get the user requests whose mech requests are being sent, until their transaction is settled."""
+        return self._get_user_requests("dispatched_user_requests")
+
+    @property
+    def settled_user_requests(self) -> List[Dict[str, Any]]:
+        """Get the user requests whose mech requests have been sent by the last settled transaction."""
+        return self._get_user_requests("settled_user_requests")
+
+    @property
+    def user_requests(self) -> List[Dict[str, Any]]:
+        """
+        Get the user requests which have been agreed by the service.
+
+        The dispatched user requests are only pending until the transaction of their mech requests is settled.
+        If we are back here, their mech requests have been skipped or have failed to be sent, so they are pending again.
+
+        :return: the user requests.
+        """
+        return self.dispatched_user_requests + self._get_user_requests("user_requests")
+
+    @property
+    def mech_responses_queue(self) -> Tuple[MechInteractionResponse, ...]:
+        """
+        Get the mech responses as an immutable queue.
+
+        The queue is only advanced through the `mech_responses_cursor`, so it is decoded once per mech interaction,
+        instead of once per decision making round.
+        Every response is followed by its copies for the deduplicated mech requests which have been waiting for it.
+
+        :return: the mech responses.
+        """
+        serialized = self.db.get("mech_responses", EMPTY_MECH_RESPONSES)
+        serialized_followers = self.serialized_mech_request_followers
+        if not isinstance(serialized, str):
+            return fan_out_mech_responses(
+                self.mech_responses, json.loads(serialized_followers)
+            )
+        return decode_mech_responses(serialized, serialized_followers)
+
+    @property
+    def serialized_mech_request_followers(self) -> str:
+        """Get the serialized nonces of the deduplicated mech requests, per the nonce of the mech request they follow."""
+        # the followers are persisted across periods, therefore, they may have been reset to `None`
+        return str(
+            self.db.get("mech_request_followers", None) or EMPTY_MECH_REQUEST_FOLLOWERS
+        )
+
+    @property
+    def mech_request_followers(self) -> Dict[str, List[str]]:
+        """Get the nonces of the deduplicated mech requests, per the nonce of the mech request they follow."""
+        return json.loads(self.serialized_mech_request_followers)
+
+    @property
+    def dispatching_mech_requests(self) -> bool:
+        """Get whether mech requests are being dispatched without waiting for their responses."""
+        return bool(self.db.get("dispatching_mech_requests", False))
+
+    @property
+    def prompt_cache(self) -> str:
+        """Get the serialized cache of the mech's results per prompt."""
+        # the cache is persisted across periods, therefore, it may have been reset to `None`
+        return str(self.db.get("prompt_cache", None) or EMPTY_PROMPT_CACHE)
+
+    @property
+    def pending_mech_deliveries(self) -> List[Dict[str, Any]]:
+        """
+        Get the mech requests which have been dispatched, but whose responses have not been received yet.
+
+        Each delivery contains the hash of the tx which sent the mech requests, the mech requests,
+        and the period during which they were dispatched, oldest first.
+
+        :return: the pending mech deliveries.
+        """
+        # the deliveries are persisted across periods, therefore, they may have been reset to `None`
+        serialized = (
+            self.db.get("pending_mech_deliveries", None) or EMPTY_MECH_DELIVERIES
+        )
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def settlement_attempts(self) -> Dict[str, int]:
+        """Get the failed settlement attempts of the mech responses, keyed by their nonce."""
+        # the retries are persisted across periods, therefore, they may have been reset to `None`
+        serialized = (
+            self.db.get("settlement_attempts", None) or EMPTY_SETTLEMENT_ATTEMPTS
+        )
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def retry_deadlines(self) -> Dict[str, float]:
+        """Get the timestamps after which the settlements of the mech responses may be retried, keyed by their nonce."""
+        serialized = self.db.get("retry_deadlines", None) or EMPTY_RETRY_DEADLINES
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def retry_nonces(self) -> List[str]:
+        """Get the nonces of the mech responses whose settlement should be retried, one at a time."""
+        serialized = self.db.get("retry_nonces", None) or "[]"
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def retry_mech_responses(self) -> List[MechInteractionResponse]:
+        """Get the mech responses whose settlement should be retried, which are kept apart from the queue of mech responses."""
+        serialized = self.db.get("retry_mech_responses", None) or EMPTY_MECH_RESPONSES
+        if isinstance(serialized, str):
+            serialized = json.loads(serialized)
+        return [MechInteractionResponse(**response) for response in serialized]
+
+    @property
+    def mech_request_tx_attempts(self) -> int:
+        """Get the failed settlement attempts of the mech requests' tx."""
+        return int(self.db.get("mech_request_tx_attempts", None) or 0)
+
+    @property
+    def mech_request_tx_deadline(self) -> float:
+        """Get the timestamp after which the mech requests whose tx has failed may be sent again."""
+        return float(self.db.get("mech_request_tx_deadline", None) or 0.0)
+
+    @property
+    def settling_nonces(self) -> List[str]:
+        """Get the nonces of the mech responses which are being settled."""
+        serialized = self.db.get("settling_nonces", "[]")
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def settled_tx_hash(self) -> Optional[str]:
+        """Get the hash of the last settled tx, if any has been settled during the current period."""
+        return self.db.get("settled_tx_hash", None)
+
+    @property
+    def settled_nonces(self) -> List[str]:
+        """Get the nonces of the mech responses which have been settled by the last settled tx."""
+        serialized = self.db.get("settled_nonces", "[]")
+        if isinstance(serialized, str):
+            return json.loads(serialized)
+        return serialized
+
+    @property
+    def settled_safe_address(self) -> Optional[str]:
+        """Get the address of the Safe which has settled the last settled tx."""
+        return self.db.get("settled_safe_address", None)
+
+    @property
+    def settling_safe_address(self) -> Optional[str]:
+        """Get the address of the Safe of the pool which settles the current tx, or which has settled the last one."""
+        return self.db.get("settling_safe_address", None)
+
+    @property
+    def mech_responses_cursor(self) -> int:
+        """Get the index of the next mech response to be processed."""
+        return int(self.db.get("mech_responses_cursor", 0))
+
+    @property
+    def n_pending_mech_responses(self) -> int:
+        """Get the number of mech responses which have not been processed yet."""
+        return len(self.mech_responses_queue) - self.mech_responses_cursor
+
+
+class CollectUserRequestsRound(CollectDifferentUntilThresholdRound):
+    """A round in which the agents share their locally received user requests."""
+
+    payload_class = UserRequestsPayload
+    synchronized_data_class = SynchronizedData
+    done_event = Event.DONE
+
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+        if self.collection_threshold_reached:
+            self.block_confirmations += 1
+
+        if (
+            self.collection_threshold_reached
+            and self.block_confirmations > self.required_block_confirmations
+        ):
+            # the service-wide queue is the union of the agreed requests and the ones contributed by each agent
+            user_requests = {
+                request[REQUEST_ID_KEY]: request
+                for request in self.synchronized_data.user_requests
+            }
+            for sender in sorted(self.collection):
+                payload = self.collection[sender]
+                for request in json.loads(payload.content):
+                    user_requests.setdefault(request[REQUEST_ID_KEY], request)
+
+            synchronized_data = self.synchronized_data.update(
+                synchronized_data_class=self.synchronized_data_class,
+                user_requests=json.dumps(list(user_requests.values()), sort_keys=True),
+                dispatched_user_requests=EMPTY_USER_REQUESTS,
+            )
+            return synchronized_data, Event.DONE
+
+            # Static checker needs events to be mentioned:
+            # Event.ROUND_TIMEOUT
+
+        return None
+
 
 class DecisionMakingRound(CollectSameUntilThresholdRound):
     """DecisionMakingRound"""
@@ -79,12 +344,121 @@ class DecisionMakingRound(CollectSameUntilThresholdRound):
             event = Event(payload["event"])
 
             updates = {
-                "mech_requests": json.dumps(payload["mech_requests"], sort_keys=True),
-                "mech_responses": json.dumps(payload["mech_responses"], sort_keys=True),
+                "mech_responses_cursor": payload["mech_responses_cursor"],
                 "most_voted_tx_hash": payload["tx_hash"],
+                "settling_nonces": json.dumps(payload["settling_nonces"]),
+                "retry_nonces": json.dumps(payload["retry_nonces"]),
                 "post_tx_event": payload["post_tx_event"],
                 "chain_id": payload["chain_id"],
+                # the Safe which settles the next transaction, as the transaction settlement reads it from this key
+                "safe_contract_address": payload["safe_contract_address"],
             }
+            # the settling Safe is only replaced when a transaction is settled, so that the pool is used in a round-robin fashion
+            updates["settling_safe_address"] = (
+                payload["safe_contract_address"]
+                if event in (Event.SETTLE, Event.MECH)
+                else self.synchronized_data.settling_safe_address
+            )
+
+            # the user requests which are served without a mech request of their own are consumed
+            served_request_ids = set(payload["served_request_ids"])
+            user_requests = [
+                request
+                for request in self.synchronized_data.user_requests
+                if request[REQUEST_ID_KEY] not in served_request_ids
+            ]
+            updates["user_requests"] = json.dumps(user_requests, sort_keys=True)
+            updates["dispatched_user_requests"] = EMPTY_USER_REQUESTS
+            # the results which have been obtained locally are settled as if the mech had just returned them
+            if event == Event.SETTLE and payload["local_mech_responses"]:
+                updates["mech_responses"] = json.dumps(
+                    payload["local_mech_responses"], sort_keys=True
+                )
+
+            # the cache is persisted across periods, so it must be written before the first reset, even if it is empty
+            updates["prompt_cache"] = self.synchronized_data.prompt_cache
+            if payload["prompt_cache_entries"] or payload["prompt_cache_hits"]:
+                params = self.context.params
+                prompt_cache = PromptCache.from_json(
+                    self.synchronized_data.prompt_cache,
+                    params.prompt_cache_size,
+                    params.prompt_cache_ttl,
+                )
+                prompt_cache.update(
+                    payload["prompt_cache_entries"],
+                    payload["prompt_cache_hits"],
+                    payload["prompt_cache_timestamp"],
+                )
+                updates["prompt_cache"] = prompt_cache.to_json()
+
+            # the agreed user requests are consumed by the mech requests, once their transaction is settled
+            if event == Event.MECH:
+                updates["dispatched_user_requests"] = updates["user_requests"]
+                updates["user_requests"] = EMPTY_USER_REQUESTS
+                updates["mech_requests"] = json.dumps(
+                    payload["mech_requests"], sort_keys=True
+                )
+
+            # in the pipelined mode, the mech requests' tx is followed by decision making instead of the mech responses
+            updates["dispatching_mech_requests"] = (
+                event == Event.MECH
+                and payload["post_tx_event"] == DECISION_MAKING_POST_TX_EVENT
+            )
+
+            # the oldest pending delivery is awaited, as if its mech requests had just been sent
+            pending_mech_deliveries = self.synchronized_data.pending_mech_deliveries
+            if event == Event.MECH_RESPONSE:
+                delivery = pending_mech_deliveries.pop(0)
+                updates["final_tx_hash"] = delivery["tx_hash"]
+                updates["mech_requests"] = json.dumps(
+                    delivery["mech_requests"], sort_keys=True
+                )
+            updates["pending_mech_deliveries"] = json.dumps(
+                pending_mech_deliveries, sort_keys=True
+            )
+
+            # the deduplicated mech requests follow the mech requests which are queued or in flight
+            followers = self.synchronized_data.mech_request_followers
+            if event != Event.SETTLE:
+                # the responses which are about to be cleared have already been fanned out
+                for mech_response in self.synchronized_data.mech_responses_queue:
+                    followers.pop(mech_response.nonce, None)
+            for nonce, follower_nonces in payload["mech_request_followers"].items():
+                followers.setdefault(nonce, []).extend(follower_nonces)
+            updates["mech_request_followers"] = json.dumps(followers, sort_keys=True)
+
+            # the mech responses are only cleared once we are done with them, otherwise only the cursor is advanced
+            if event != Event.SETTLE:
+                updates["mech_responses"] = EMPTY_MECH_RESPONSES
+                updates["mech_responses_cursor"] = 0
+
+            # the retries are kept apart from the mech responses, until they are settled or dead-lettered, even across periods
+            retrying = {*payload["retry_nonces"], *payload["settling_nonces"]}
+            attempts = self.synchronized_data.settlement_attempts
+            deadlines = self.synchronized_data.retry_deadlines
+            retry_mech_responses = self.synchronized_data.retry_mech_responses
+            updates["settlement_attempts"] = json.dumps(
+                {nonce: attempts[nonce] for nonce in retrying & attempts.keys()},
+                sort_keys=True,
+            )
+            updates["retry_deadlines"] = json.dumps(
+                {nonce: deadlines[nonce] for nonce in retrying & deadlines.keys()},
+                sort_keys=True,
+            )
+            updates["retry_mech_responses"] = json.dumps(
+                [
+                    asdict(mech_response)
+                    for mech_response in retry_mech_responses
+                    if mech_response.nonce in retrying
+                ],
+                sort_keys=True,
+            )
+            updates["mech_request_tx_attempts"] = (
+                self.synchronized_data.mech_request_tx_attempts
+            )
+            updates["mech_request_tx_deadline"] = (
+                self.synchronized_data.mech_request_tx_deadline
+            )
 
             synchronized_data = self.synchronized_data.update(
                 synchronized_data_class=self.synchronized_data_class,
@@ -94,7 +468,7 @@ class DecisionMakingRound(CollectSameUntilThresholdRound):
             return synchronized_data, event
 
             # Static checker needs events to be mentioned:
-            # Event.DONE, Event.MECH, Event.SETTLE, Event.ROUND_TIMEOUT
+            # Event.DONE, Event.MECH, Event.MECH_RESPONSE, Event.SETTLE, Event.ROUND_TIMEOUT
 
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
@@ -103,19 +477,40 @@ class DecisionMakingRound(CollectSameUntilThresholdRound):
         return None
 
 
-class PostTxDecisionMakingRound(CollectSameUntilThresholdRound):
-    """PostTxDecisionMakingRound"""
+class SettlementRetryRound(CollectSameUntilThresholdRound):
+    """A round in which the agents agree on how to retry a failed settlement."""
 
-    payload_class = PostTxDecisionMakingPayload
+    payload_class = SettlementRetryPayload
     synchronized_data_class = SynchronizedData
 
     def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
         """Process the end of the block."""
         if self.threshold_reached:
-            return self.synchronized_data, Event(self.most_voted_payload)
+            payload = json.loads(self.most_voted_payload)
+            event = Event(payload["event"])
+            synchronized_data = self.synchronized_data.update(
+                synchronized_data_class=self.synchronized_data_class,
+                settlement_attempts=json.dumps(
+                    payload["settlement_attempts"], sort_keys=True
+                ),
+                retry_nonces=json.dumps(payload["retry_nonces"]),
+                retry_deadlines=json.dumps(payload["retry_deadlines"], sort_keys=True),
+                retry_mech_responses=json.dumps(
+                    payload["retry_mech_responses"], sort_keys=True
+                ),
+                mech_request_tx_attempts=payload["mech_request_tx_attempts"],
+                mech_request_tx_deadline=payload["mech_request_tx_deadline"],
+            )
+            if payload["drop_dispatched_user_requests"]:
+                # the mech requests have been given up, so their user requests must not be dispatched again
+                synchronized_data = synchronized_data.update(
+                    synchronized_data_class=self.synchronized_data_class,
+                    dispatched_user_requests=EMPTY_USER_REQUESTS,
+                )
+            return synchronized_data, event
 
             # Static checker needs events to be mentioned:
-            # Event.MECH, Event.DECISION_MAKING, Event.ROUND_TIMEOUT
+            # Event.DECISION_MAKING, Event.ROUND_TIMEOUT
 
         if not self.is_majority_possible(
             self.collection, self.synchronized_data.nb_participants
@@ -124,6 +519,67 @@ class PostTxDecisionMakingRound(CollectSameUntilThresholdRound):
         return None
 
 
+class PostTxDecisionMakingRound(AbstractRound):
+    """
+    A zero-vote round which routes the service after a settlement.
+
+    The route is given by the `post_tx_event`, which has already been agreed during the decision making,
+    therefore, no payloads are collected and the round ends on the first block.
+    As the round may end before its behaviour acts, the settlement is recorded in the synchronized data,
+    from which the behaviours of the next rounds update the local state.
+    """
+
+    payload_class = None
+    synchronized_data_class = SynchronizedData
+
+    def check_payload(self, payload: BaseTxPayload) -> None:
+        """No logic required here."""
+
+    def process_payload(self, payload: BaseTxPayload) -> None:
+        """No logic required here."""
+
+    def end_block(self) -> Optional[Tuple[BaseSynchronizedData, Event]]:
+        """Process the end of the block."""
+        synchronized_data = self.synchronized_data.update(
+            synchronized_data_class=self.synchronized_data_class,
+            settled_tx_hash=self.synchronized_data.final_tx_hash,
+            settled_nonces=json.dumps(self.synchronized_data.settling_nonces),
+            settled_safe_address=self.synchronized_data.settling_safe_address,
+            settled_user_requests=json.dumps(
+                self.synchronized_data.dispatched_user_requests, sort_keys=True
+            ),
+        )
+        if synchronized_data.dispatched_user_requests:
+            # the settled tx has sent the mech requests for the dispatched user requests
+            synchronized_data = synchronized_data.update(
+                synchronized_data_class=self.synchronized_data_class,
+                dispatched_user_requests=EMPTY_USER_REQUESTS,
+                mech_request_tx_attempts=0,
+                mech_request_tx_deadline=0.0,
+            )
+        if synchronized_data.dispatching_mech_requests:
+            # the settled tx has dispatched mech requests, whose responses are awaited later on
+            delivery = {
+                "tx_hash": synchronized_data.final_tx_hash,
+                "mech_requests": [
+                    asdict(request) for request in synchronized_data.mech_requests
+                ],
+                "period": synchronized_data.period_count,
+            }
+            synchronized_data = synchronized_data.update(
+                synchronized_data_class=self.synchronized_data_class,
+                dispatching_mech_requests=False,
+                pending_mech_deliveries=json.dumps(
+                    [*synchronized_data.pending_mech_deliveries, delivery],
+                    sort_keys=True,
+                ),
+            )
+        return synchronized_data, Event(synchronized_data.post_tx_event)
+
+        # Static checker needs events to be mentioned:
+        # Event.MECH, Event.DECISION_MAKING
+
+
 class FinishedDecisionMakingMechRound(DegenerateRound):
     """FinishedDecisionMakingMechRound"""
 
@@ -136,6 +592,10 @@ class FinishedPostTxDecisionMakingMechRound(DegenerateRound):
     """FinishedPostTxDecisionMakingMechRound"""
 
 
+class FinishedDecisionMakingMechResponseRound(DegenerateRound):
+    """FinishedDecisionMakingMechResponseRound"""
+
+
 class FinishedDecisionMakingResetRound(DegenerateRound):
     """FinishedDecisionMakingResetRound"""
 
@@ -143,15 +603,22 @@ class FinishedDecisionMakingResetRound(DegenerateRound):
 class CeloTraderAbciApp(AbciApp[Event]):
     """CeloTraderAbciApp"""
 
-    initial_round_cls: AppState = DecisionMakingRound
+    initial_round_cls: AppState = CollectUserRequestsRound
     initial_states: Set[AppState] = {
+        CollectUserRequestsRound,
         PostTxDecisionMakingRound,
         DecisionMakingRound,
+        SettlementRetryRound,
     }
     transition_function: AbciAppTransitionFunction = {
+        CollectUserRequestsRound: {
+            Event.DONE: DecisionMakingRound,
+            Event.ROUND_TIMEOUT: CollectUserRequestsRound,
+        },
         DecisionMakingRound: {
             Event.MECH: FinishedDecisionMakingMechRound,
             Event.SETTLE: FinishedDecisionMakingSettleRound,
+            Event.MECH_RESPONSE: FinishedDecisionMakingMechResponseRound,
             Event.NO_MAJORITY: DecisionMakingRound,
             Event.ROUND_TIMEOUT: DecisionMakingRound,
             Event.DONE: FinishedDecisionMakingResetRound,
@@ -159,25 +626,47 @@ class CeloTraderAbciApp(AbciApp[Event]):
         PostTxDecisionMakingRound: {
             Event.MECH: FinishedPostTxDecisionMakingMechRound,
             Event.DECISION_MAKING: DecisionMakingRound,
-            Event.NO_MAJORITY: PostTxDecisionMakingRound,
-            Event.ROUND_TIMEOUT: PostTxDecisionMakingRound,
+        },
+        SettlementRetryRound: {
+            Event.DECISION_MAKING: DecisionMakingRound,
+            Event.NO_MAJORITY: SettlementRetryRound,
+            Event.ROUND_TIMEOUT: SettlementRetryRound,
         },
         FinishedDecisionMakingMechRound: {},
         FinishedDecisionMakingSettleRound: {},
         FinishedPostTxDecisionMakingMechRound: {},
+        FinishedDecisionMakingMechResponseRound: {},
         FinishedDecisionMakingResetRound: {},
     }
     final_states: Set[AppState] = {
         FinishedDecisionMakingMechRound,
         FinishedDecisionMakingSettleRound,
         FinishedPostTxDecisionMakingMechRound,
+        FinishedDecisionMakingMechResponseRound,
         FinishedDecisionMakingResetRound,
     }
     event_to_timeout: EventToTimeout = {}
-    cross_period_persisted_keys: FrozenSet[str] = frozenset()
+    cross_period_persisted_keys: FrozenSet[str] = frozenset(
+        {
+            get_name(SynchronizedData.user_requests),
+            get_name(SynchronizedData.dispatched_user_requests),
+            get_name(SynchronizedData.pending_mech_deliveries),
+            get_name(SynchronizedData.prompt_cache),
+            get_name(SynchronizedData.mech_request_followers),
+            get_name(SynchronizedData.settling_safe_address),
+            get_name(SynchronizedData.retry_nonces),
+            get_name(SynchronizedData.retry_deadlines),
+            get_name(SynchronizedData.settlement_attempts),
+            get_name(SynchronizedData.retry_mech_responses),
+            get_name(SynchronizedData.mech_request_tx_attempts),
+            get_name(SynchronizedData.mech_request_tx_deadline),
+        }
+    )
     db_pre_conditions: Dict[AppState, Set[str]] = {
+        CollectUserRequestsRound: set(),
         DecisionMakingRound: set(),
         PostTxDecisionMakingRound: set(),
+        SettlementRetryRound: set(),
     }
     db_post_conditions: Dict[AppState, Set[str]] = {
         FinishedDecisionMakingMechRound: set(),
@@ -185,5 +674,8 @@ class CeloTraderAbciApp(AbciApp[Event]):
             get_name(SynchronizedData.most_voted_tx_hash)
         },
         FinishedPostTxDecisionMakingMechRound: set(),
+        FinishedDecisionMakingMechResponseRound: {
+            get_name(SynchronizedData.final_tx_hash)
+        },
         FinishedDecisionMakingResetRound: set(),
     }
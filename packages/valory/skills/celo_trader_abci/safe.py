@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the local computation of the Safe's transaction hashes and the cache of the Safe's state."""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from packaging.version import Version
+
+from packages.valory.contracts.gnosis_safe.contract import NULL_ADDRESS
+from packages.valory.contracts.gnosis_safe.encode import create_struct_hash, sha3
+
+
+EIP712_PREFIX = bytes.fromhex("1901")
+# Safes >= 1.0.0 renamed `dataGas` to `baseGas`
+BASE_GAS_VERSION = Version("1.0.0")
+# Safes >= 1.3.0 added the `chainId` to the domain
+CHAIN_ID_DOMAIN_VERSION = Version("1.3.0")
+
+
+def get_base_gas_name(version: str) -> str:
+    """Get the name of the base gas field of the transactions of the Safes with the given version."""
+    return "baseGas" if Version(version) >= BASE_GAS_VERSION else "dataGas"
+
+
+def get_safe_tx_types(version: str) -> Dict[str, List[Dict[str, str]]]:
+    """Get the EIP-712 types of the transactions of the Safes with the given version."""
+    domain = [{"name": "verifyingContract", "type": "address"}]
+    if Version(version) >= CHAIN_ID_DOMAIN_VERSION:
+        domain.insert(0, {"name": "chainId", "type": "uint256"})
+    return {
+        "EIP712Domain": domain,
+        "SafeTx": [
+            {"name": "to", "type": "address"},
+            {"name": "value", "type": "uint256"},
+            {"name": "data", "type": "bytes"},
+            {"name": "operation", "type": "uint8"},
+            {"name": "safeTxGas", "type": "uint256"},
+            {"name": get_base_gas_name(version), "type": "uint256"},
+            {"name": "gasPrice", "type": "uint256"},
+            {"name": "gasToken", "type": "address"},
+            {"name": "refundReceiver", "type": "address"},
+            {"name": "nonce", "type": "uint256"},
+        ],
+    }
+
+
+class SafeState:  # pylint: disable=too-few-public-methods
+    """A locally cached view of a Safe's on-chain state, as fetched during a period."""
+
+    def __init__(self, period: int) -> None:
+        """Initialize the state."""
+        self.period = period
+        self.nonce: Optional[int] = None
+        self.balance: Optional[int] = None
+        self.owners: Optional[List[str]] = None
+        self.threshold: Optional[int] = None
+        self.updated_at = time.time()
+
+    def to_json(self) -> Dict[str, Any]:
+        """Get the state in a JSON serializable form."""
+        return {
+            "nonce": self.nonce,
+            "balance": self.balance,
+            "owners": self.owners,
+            "threshold": self.threshold,
+            "period": self.period,
+            "updated_at": self.updated_at,
+        }
+
+
+class SafeStateCache:
+    """
+    Caches the on-chain state of the Safes.
+
+    The state is refreshed once per period, so that the contract only needs to be queried once per period
+    instead of once per transaction. Settling a transaction advances the cached nonce and invalidates the cached balance.
+    The Safes' EIP-712 domains, i.e., their versions and chain ids, do not change, therefore, they are read only once per Safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._states: Dict[str, SafeState] = {}
+        # Safe address -> (version, chain id)
+        self._domains: Dict[str, Tuple[str, int]] = {}
+
+    def get_domain(self, safe_address: str) -> Optional[Tuple[str, int]]:
+        """Get the cached version and chain id of the given Safe, if they have been read."""
+        return self._domains.get(safe_address, None)
+
+    def set_domain(self, safe_address: str, version: str, chain_id: int) -> None:
+        """Cache the version and chain id of the given Safe."""
+        self._domains[safe_address] = (version, chain_id)
+
+    def get(
+        self, safe_address: str, period: Optional[int] = None
+    ) -> Optional[SafeState]:
+        """Get the cached state of the given Safe, or `None` if it was not fetched during the given period, if any."""
+        state = self._states.get(safe_address, None)
+        if state is None or period is not None and state.period != period:
+            return None
+        return state
+
+    def update(self, safe_address: str, period: int, **fields: Any) -> SafeState:
+        """Update the given fields of the Safe's cached state, as fetched during the given period."""
+        state = self.get(safe_address, period)
+        if state is None:
+            state = self._states[safe_address] = SafeState(period)
+        for name, value in fields.items():
+            setattr(state, name, value)
+        state.updated_at = time.time()
+        return state
+
+    def max_balance(
+        self, safe_addresses: Iterable[str], period: Optional[int] = None
+    ) -> Optional[int]:
+        """Get the largest cached balance of the given Safes, or `None` if any of their balances is unknown."""
+        balances = []
+        for safe_address in safe_addresses:
+            state = self.get(safe_address, period)
+            if state is None or state.balance is None:
+                return None
+            balances.append(state.balance)
+        return max(balances, default=None)
+
+    def on_settled(self, safe_address: str) -> None:
+        """Update the cached state of the given Safe, after a transaction of it has been settled."""
+        state = self._states.get(safe_address, None)
+        if state is None:
+            return
+        if state.nonce is not None:
+            state.nonce += 1
+        # the settled value is not known here, hence the balance needs to be fetched again
+        state.balance = None
+
+    def invalidate(self, safe_address: str) -> None:
+        """Invalidate the cached state of the given Safe, including its domain, which might have been upgraded."""
+        self._states.pop(safe_address, None)
+        self._domains.pop(safe_address, None)
+
+
+class SafeTxHashEngine:
+    """
+    Computes the EIP-712 hashes of Safe transactions locally.
+
+    The domain separator is cached per `(chain id, Safe address, version)`,
+    while the Safe's nonce, version and chain id are provided by the caller.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the engine."""
+        self._domain_separators: Dict[Tuple[int, str, str], bytes] = {}
+
+    def domain_separator(self, chain_id: int, safe_address: str, version: str) -> bytes:
+        """Get the domain separator of the given Safe."""
+        key = (chain_id, safe_address, version)
+        separator = self._domain_separators.get(key, None)
+        if separator is None:
+            domain: Dict[str, Any] = {"verifyingContract": safe_address}
+            if Version(version) >= CHAIN_ID_DOMAIN_VERSION:
+                domain["chainId"] = chain_id
+            types = get_safe_tx_types(version)
+            separator = create_struct_hash("EIP712Domain", domain, types)
+            self._domain_separators[key] = separator
+        return separator
+
+    def get_safe_tx_hash(  # pylint: disable=too-many-arguments
+        self,
+        chain_id: int,
+        safe_address: str,
+        version: str,
+        to_address: str,
+        value: int,
+        data: bytes,
+        operation: int,
+        safe_tx_gas: int,
+        nonce: int,
+    ) -> str:
+        """
+        Get the hash of a Safe transaction.
+
+        The result is the same as `GnosisSafeContract.get_raw_safe_transaction_hash`'s.
+
+        :param chain_id: the id of the chain on which the Safe is deployed.
+        :param safe_address: the Safe's address.
+        :param version: the Safe's version.
+        :param to_address: the tx recipient address.
+        :param value: the value of the transaction.
+        :param data: the data of the transaction.
+        :param operation: the operation type of the Safe transaction.
+        :param safe_tx_gas: the gas that should be used for the Safe transaction.
+        :param nonce: the Safe's nonce.
+        :return: the hex encoded hash, without the "0x" prefix.
+        """
+        message = {
+            "to": to_address,
+            "value": value,
+            "data": data.hex(),
+            "operation": operation,
+            "safeTxGas": safe_tx_gas,
+            get_base_gas_name(version): 0,
+            "gasPrice": 0,
+            "gasToken": NULL_ADDRESS,
+            "refundReceiver": NULL_ADDRESS,
+            "nonce": nonce,
+        }
+        types = get_safe_tx_types(version)
+        message_hash = create_struct_hash("SafeTx", message, types)
+        domain_separator = self.domain_separator(chain_id, safe_address, version)
+        return sha3(EIP712_PREFIX + domain_separator + message_hash).hex()
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the index of the user requests' statuses."""
+
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+StatusCallback = Callable[[Optional[Dict[str, Any]]], None]
+FinalCallback = Callable[[str], None]
+
+
+STATUS_KEY = "status"
+
+
+class RequestStatus(Enum):
+    """The status of a user request."""
+
+    QUEUED = "queued"
+    MECH_REQUESTED = "mech_requested"
+    MECH_RESPONDED = "mech_responded"
+    SETTLED = "settled"
+    REJECTED = "rejected"
+
+
+FINAL_STATUSES = frozenset({RequestStatus.SETTLED.value, RequestStatus.REJECTED.value})
+
+
+class _Waiter:  # pylint: disable=too-few-public-methods
+    """A client waiting for the final status of a request."""
+
+    __slots__ = ("callback", "done")
+
+    def __init__(self, callback: StatusCallback) -> None:
+        """Initialize the waiter."""
+        self.callback = callback
+        self.done = False
+
+    def notify(self, status: Optional[Dict[str, Any]]) -> None:
+        """Notify the waiter, unless it has already been notified."""
+        if not self.done:
+            self.done = True
+            self.callback(status)
+
+
+class RequestStatusIndex:
+    """
+    An in-memory index of the user requests' statuses, keyed by the request id.
+
+    The retention is bounded: once the index is full, the least recently updated requests are evicted.
+    The mech request nonces are indexed as well, so that the mech responses can be traced back to the user requests.
+    Clients may wait for the final status of a request, in which case they are all notified at once when it is set,
+    or with the current status once their deadline expires.
+    The optional `on_final` callback is called with the id of every request whose status becomes final.
+    """
+
+    def __init__(self, max_size: int, on_final: Optional[FinalCallback] = None) -> None:
+        """Initialize the index."""
+        self.max_size = max_size
+        self.on_final = on_final
+        self._statuses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._nonces: "OrderedDict[str, str]" = OrderedDict()
+        self._waiters: Dict[str, List[_Waiter]] = {}
+        self._n_waiters = 0
+        # (deadline, sequence number, request id, waiter), ordered by the deadline
+        self._deadlines: List[Tuple[float, int, str, _Waiter]] = []
+        self._sequence = itertools.count()
+
+    @staticmethod
+    def _put(
+        index: "OrderedDict[str, Any]", key: str, value: Any, max_size: int
+    ) -> None:
+        """Put a value in the given index, evicting the least recently updated entries if it is full."""
+        index[key] = value
+        index.move_to_end(key)
+        while len(index) > max_size:
+            index.popitem(last=False)
+
+    def set_status(
+        self, request_id: str, status: RequestStatus, **details: Any
+    ) -> None:
+        """
+        Set the status of a request.
+
+        :param request_id: the id of the request.
+        :param status: the new status.
+        :param details: any details about the status, e.g., the settlement's tx hash or the rejection's reason.
+        """
+        entry = {STATUS_KEY: status.value, **details}
+        self._put(self._statuses, request_id, entry, self.max_size)
+        if status.value in FINAL_STATUSES:
+            if self.on_final is not None:
+                self.on_final(request_id)
+            waiters = self._waiters.pop(request_id, ())
+            self._n_waiters -= len(waiters)
+            for waiter in waiters:
+                waiter.notify(entry)
+            # the notified waiters are dropped from the deadlines once they outnumber the ones still waiting
+            if len(self._deadlines) > 2 * self._n_waiters:
+                self._deadlines = [
+                    deadline for deadline in self._deadlines if not deadline[-1].done
+                ]
+                heapq.heapify(self._deadlines)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Get the status of a request, or `None` if it is unknown or has been evicted."""
+        return self._statuses.get(request_id, None)
+
+    def map_nonce(self, nonce: str, request_id: str) -> None:
+        """Map a mech request's nonce to the user request which it was made for."""
+        self._put(self._nonces, nonce, request_id, self.max_size)
+
+    def get_request_id(self, nonce: str) -> Optional[str]:
+        """Get the id of the request which the mech request with the given nonce was made for, if it is known."""
+        return self._nonces.get(nonce, None)
+
+    def set_status_by_nonce(
+        self, nonce: str, status: RequestStatus, **details: Any
+    ) -> None:
+        """Set the status of the request which the mech request with the given nonce was made for, if it is known."""
+        request_id = self.get_request_id(nonce)
+        if request_id is not None:
+            self.set_status(request_id, status, **details)
+
+    @property
+    def n_waiters(self) -> int:
+        """Get the number of waiters which have not been notified yet."""
+        return self._n_waiters
+
+    def wait(self, request_id: str, callback: StatusCallback, timeout: float) -> None:
+        """
+        Wait for the final status of a request.
+
+        :param request_id: the id of the request.
+        :param callback: the callback to call with the status, once it is final or the timeout expires.
+        :param timeout: the seconds after which the callback is called with the current status.
+        """
+        status = self.get(request_id)
+        waiter = _Waiter(callback)
+        if status is None or status[STATUS_KEY] in FINAL_STATUSES:
+            waiter.notify(status)
+            return
+
+        self._waiters.setdefault(request_id, []).append(waiter)
+        self._n_waiters += 1
+        deadline = time.monotonic() + timeout
+        heapq.heappush(
+            self._deadlines, (deadline, next(self._sequence), request_id, waiter)
+        )
+
+    def expire_waiters(self) -> None:
+        """Notify the waiters whose deadline has expired with the current status of their request."""
+        now = time.monotonic()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, _, request_id, waiter = heapq.heappop(self._deadlines)
+            if waiter.done:
+                continue
+
+            waiters = self._waiters.get(request_id, [])
+            if waiter in waiters:
+                waiters.remove(waiter)
+                self._n_waiters -= 1
+                if not waiters:
+                    del self._waiters[request_id]
+            waiter.notify(self.get(request_id))
@@ -19,7 +19,9 @@
 
 """This package contains round behaviours of CeloTraderChainedSkillAbci."""
 
-from typing import Set, Type
+import hashlib
+from datetime import datetime
+from typing import Generator, Set, Type, cast
 
 from packages.valory.skills.abstract_round_abci.behaviours import (
     AbstractRoundBehaviour,
@@ -29,6 +31,7 @@ from packages.valory.skills.celo_trader_abci.behaviours import CeloTraderRoundBe
 from packages.valory.skills.celo_trader_chained_abci.composition import (
     CeloTraderChainedSkillAbciApp,
 )
+from packages.valory.skills.celo_trader_chained_abci.models import SharedState
 from packages.valory.skills.mech_interact_abci.behaviours.round_behaviour import (
     MechInteractRoundBehaviour,
 )
@@ -37,17 +40,111 @@ from packages.valory.skills.registration_abci.behaviours import (
     RegistrationStartupBehaviour,
 )
 from packages.valory.skills.reset_pause_abci.behaviours import (
+    ResetAndPauseBehaviour,
     ResetPauseABCIConsensusBehaviour,
 )
+from packages.valory.skills.reset_pause_abci.payloads import ResetPausePayload
 from packages.valory.skills.termination_abci.behaviours import (
     BackgroundBehaviour,
     TerminationAbciBehaviours,
 )
 from packages.valory.skills.transaction_settlement_abci.behaviours import (
+    RandomnessTransactionSubmissionBehaviour,
     TransactionSettlementRoundBehaviour,
 )
 
 
+class AdaptiveResetAndPauseBehaviour(ResetAndPauseBehaviour):
+    """
+    Reset and pause behaviour which adapts the pause to the incoming work.
+
+    The pause is cut short as soon as user requests are received and backs off while the service is idle.
+    The wait of the Tendermint hard resets is left as is.
+    """
+
+    def async_act(self) -> Generator:
+        """Do the action, pausing adaptively between the periods which do not reset Tendermint."""
+        # + 1 because `period_count` starts from 0
+        n_periods_done = self.synchronized_data.period_count + 1
+        reset_tm_nodes = n_periods_done % self.params.reset_tendermint_after == 0
+        if reset_tm_nodes:
+            tendermint_reset = yield from self.reset_tendermint_with_wait()
+            if not tendermint_reset:
+                return
+        else:
+            yield from self.adaptive_pause(self.params.reset_pause_duration)
+        self.context.logger.info("Period end.")
+        self.context.benchmark_tool.save(self.synchronized_data.period_count)
+
+        payload = ResetPausePayload(
+            self.context.agent_address, self.synchronized_data.period_count
+        )
+        yield from self.send_a2a_transaction(payload, reset_tm_nodes)
+        yield from self.wait_until_round_end()
+        self.set_done()
+
+    def adaptive_pause(self, seconds: float) -> Generator:
+        """
+        Wait until the adaptive pause has passed since the last timestamp, or until work arrives.
+
+        :param seconds: the maximum seconds to wait.
+        :yield: None
+        """
+        if seconds < 0:
+            raise ValueError("Can only wait for a positive amount of time")
+
+        state = cast(SharedState, self.context.state)
+        scheduler = state.pause_scheduler
+        start = self.round_sequence.abci_app.last_timestamp.timestamp()
+        deadline = start + scheduler.next_pause(seconds)
+        earliest = start + min(scheduler.min_pause, seconds)
+
+        def has_work() -> bool:
+            """Check whether there are any user requests to process."""
+            return bool(state.user_requests)
+
+        def should_resume() -> bool:
+            """Check whether the pause should end."""
+            now = datetime.now().timestamp()
+            return now >= deadline or (now >= earliest and has_work())
+
+        yield from self.wait_for_condition(should_resume)
+        if has_work():
+            scheduler.on_work()
+        else:
+            scheduler.on_idle(seconds)
+
+
+class SingleAgentRandomnessTransactionSubmissionBehaviour(
+    RandomnessTransactionSubmissionBehaviour
+):
+    """
+    Randomness behaviour which skips fetching randomness when the service consists of a single agent.
+
+    The randomness is only used to select the keeper, who is always the single agent in that case,
+    therefore, it is derived locally instead of being fetched from the randomness api.
+    """
+
+    def async_act(self) -> Generator:
+        """Do the action."""
+        if self.synchronized_data.nb_participants > 1:
+            yield from super().async_act()
+            return
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).local():
+            seed = f"{self.context.agent_address}{self.synchronized_data.period_count}"
+            randomness = hashlib.sha256(seed.encode()).hexdigest()
+            payload = self.payload_class(  # type: ignore
+                self.context.agent_address, round_id=0, randomness=randomness
+            )
+
+        with self.context.benchmark_tool.measure(self.behaviour_id).consensus():
+            yield from self.send_a2a_transaction(payload)
+            yield from self.wait_until_round_end()
+
+        self.set_done()
+
+
 class CeloTraderChainedConsensusBehaviour(AbstractRoundBehaviour):
     """Class to define the behaviours this AbciApp has."""
 
@@ -55,8 +152,20 @@ class CeloTraderChainedConsensusBehaviour(AbstractRoundBehaviour):
     abci_app_cls = CeloTraderChainedSkillAbciApp
     behaviours: Set[Type[BaseBehaviour]] = {
         *AgentRegistrationRoundBehaviour.behaviours,
-        *ResetPauseABCIConsensusBehaviour.behaviours,
-        *TransactionSettlementRoundBehaviour.behaviours,
+        *(
+            # the reset and pause behaviour is replaced by its adaptive version
+            behaviour
+            for behaviour in ResetPauseABCIConsensusBehaviour.behaviours
+            if behaviour is not ResetAndPauseBehaviour
+        ),
+        AdaptiveResetAndPauseBehaviour,
+        *(
+            # the randomness behaviour is replaced by its single agent aware version
+            behaviour
+            for behaviour in TransactionSettlementRoundBehaviour.behaviours
+            if behaviour is not RandomnessTransactionSubmissionBehaviour
+        ),
+        SingleAgentRandomnessTransactionSubmissionBehaviour,
         *TerminationAbciBehaviours.behaviours,
         *MechInteractRoundBehaviour.behaviours,
         *CeloTraderRoundBehaviour.behaviours,
@@ -40,18 +40,19 @@ from packages.valory.skills.termination_abci.rounds import (
 
 
 abci_app_transition_mapping: AbciAppTransitionMapping = {
-    RegistrationAbci.FinishedRegistrationRound: CeloTraderAbci.DecisionMakingRound,
+    RegistrationAbci.FinishedRegistrationRound: CeloTraderAbci.CollectUserRequestsRound,
     CeloTraderAbci.FinishedDecisionMakingMechRound: MechRequestStates.MechRequestRound,
     CeloTraderAbci.FinishedDecisionMakingSettleRound: TxSettlementAbci.RandomnessTransactionSubmissionRound,
     MechFinalStates.FinishedMechRequestRound: TxSettlementAbci.RandomnessTransactionSubmissionRound,
     CeloTraderAbci.FinishedDecisionMakingResetRound: ResetAndPauseAbci.ResetAndPauseRound,
     TxSettlementAbci.FinishedTransactionSubmissionRound: CeloTraderAbci.PostTxDecisionMakingRound,
-    TxSettlementAbci.FailedRound: TxSettlementAbci.RandomnessTransactionSubmissionRound,
+    TxSettlementAbci.FailedRound: CeloTraderAbci.SettlementRetryRound,
     MechFinalStates.FinishedMechResponseRound: CeloTraderAbci.DecisionMakingRound,
     MechFinalStates.FinishedMechRequestSkipRound: CeloTraderAbci.DecisionMakingRound,
     MechFinalStates.FinishedMechResponseTimeoutRound: MechResponseStates.MechResponseRound,
     CeloTraderAbci.FinishedPostTxDecisionMakingMechRound: MechResponseStates.MechResponseRound,
-    ResetAndPauseAbci.FinishedResetAndPauseRound: CeloTraderAbci.DecisionMakingRound,
+    CeloTraderAbci.FinishedDecisionMakingMechResponseRound: MechResponseStates.MechResponseRound,
+    ResetAndPauseAbci.FinishedResetAndPauseRound: CeloTraderAbci.CollectUserRequestsRound,
     ResetAndPauseAbci.FinishedResetAndPauseErrorRound: ResetAndPauseAbci.ResetAndPauseRound,
 }
 
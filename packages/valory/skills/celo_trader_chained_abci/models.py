@@ -19,6 +19,10 @@
 
 """This module contains the shared state for the abci skill of CeloTraderChainedSkillAbciApp."""
 
+from typing import Any
+
+from aea.skills.base import SkillContext
+
 from packages.valory.skills.abstract_round_abci.models import (
     BenchmarkTool as BaseBenchmarkTool,
 )
@@ -34,6 +38,7 @@ from packages.valory.skills.celo_trader_abci.rounds import Event as CeloTraderEv
 from packages.valory.skills.celo_trader_chained_abci.composition import (
     CeloTraderChainedSkillAbciApp,
 )
+from packages.valory.skills.celo_trader_chained_abci.scheduler import PauseScheduler
 from packages.valory.skills.mech_interact_abci.models import (
     MechResponseSpecs as MechInteractMechResponseSpecs,
 )
@@ -61,9 +66,18 @@ class SharedState(BaseSharedState):
 
     abci_app_cls = CeloTraderChainedSkillAbciApp
 
+    def __init__(self, *args: Any, skill_context: SkillContext, **kwargs: Any) -> None:
+        """Init"""
+        super().__init__(*args, skill_context=skill_context, **kwargs)
+        self.pause_scheduler = PauseScheduler(0.0, 1.0)
+
     def setup(self) -> None:
         """Set up."""
         super().setup()
+        self.pause_scheduler = PauseScheduler(
+            self.context.params.min_reset_pause_duration,
+            self.context.params.idle_pause_backoff_factor,
+        )
 
         CeloTraderChainedSkillAbciApp.event_to_timeout[
             ResetPauseEvent.ROUND_TIMEOUT
@@ -84,3 +98,13 @@ class Params(
     TerminationParams,
 ):
     """A model to represent params for multiple abci apps."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the parameters object."""
+        self.min_reset_pause_duration: float = self._ensure(
+            "min_reset_pause_duration", kwargs, float
+        )
+        self.idle_pause_backoff_factor: float = self._ensure(
+            "idle_pause_backoff_factor", kwargs, float
+        )
+        super().__init__(*args, **kwargs)
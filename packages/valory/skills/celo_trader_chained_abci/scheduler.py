@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the scheduler of the pause between the periods."""
+
+
+class PauseScheduler:
+    """
+    Adapts the pause between the periods to the observed load.
+
+    The pause starts from its minimum and is multiplied by the backoff factor after every idle period,
+    up to the configured reset pause. As soon as work arrives, it drops back to its minimum.
+    """
+
+    def __init__(self, min_pause: float, backoff_factor: float) -> None:
+        """Initialize the scheduler."""
+        self.min_pause = min_pause
+        self.backoff_factor = backoff_factor
+        self._pause = min_pause
+
+    def next_pause(self, max_pause: float) -> float:
+        """Get the pause before the next period, bounded by the given maximum."""
+        return max(min(self._pause, max_pause), 0.0)
+
+    def on_work(self) -> None:
+        """Reset the pause, as the pause has been interrupted by incoming work."""
+        self._pause = self.min_pause
+
+    def on_idle(self, max_pause: float) -> None:
+        """Back off, as the pause elapsed without any incoming work."""
+        self._pause = min(self._pause * self.backoff_factor, max_pause)
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Helpers to test the behaviours of the Celo trader without a running agent."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple, Type, TypeVar
+from unittest import mock
+
+from packages.valory.protocols.ledger_api import LedgerApiMessage
+from packages.valory.skills.abstract_round_abci.base import AbciAppDB
+from packages.valory.skills.celo_trader_abci.behaviours import CeloTraderBaseBehaviour
+from packages.valory.skills.celo_trader_abci.models import SharedState
+from packages.valory.skills.celo_trader_abci.rounds import (
+    CeloTraderAbciApp,
+    SynchronizedData,
+)
+
+
+SAFE_ADDRESS = "0x" + "ab" * 20
+MULTISEND_ADDRESS = "0x" + "cd" * 20
+
+BehaviourType = TypeVar("BehaviourType", bound=CeloTraderBaseBehaviour)
+
+DEFAULT_PARAMS: Dict[str, Any] = dict(
+    celo_tool_name="transfer_native_token",
+    max_transfer_value_wei=10**18,
+    safe_chain_id=42220,
+    pipelined_mech_requests=False,
+    max_settlement_attempts=3,
+    settlement_retry_backoff=2.0,
+    max_settlement_retry_backoff=60.0,
+    preflight_transfers=False,
+    safe_pool=[SAFE_ADDRESS],
+    coalesce_transfers=True,
+    prompt_cache_size=0,
+    prompt_cache_ttl=86400.0,
+    multisend_address=MULTISEND_ADDRESS,
+    multisend_batch_size=50,
+)
+
+
+def get_synchronized_data(**data: Any) -> SynchronizedData:
+    """Get synchronized data which hold the given values."""
+    return SynchronizedData(
+        AbciAppDB(
+            setup_data=AbciAppDB.data_to_lists(data),
+            cross_period_persisted_keys=CeloTraderAbciApp.cross_period_persisted_keys,
+        )
+    )
+
+
+def make_behaviour(
+    behaviour_cls: Type[BehaviourType],
+    synchronized_data: Optional[SynchronizedData] = None,
+    **params: Any,
+) -> BehaviourType:
+    """
+    Make a behaviour whose skill context is mocked, apart from the skill's shared state.
+
+    :param behaviour_cls: the class of the behaviour.
+    :param synchronized_data: the synchronized data which the behaviour reads.
+    :param params: the parameters which override the `DEFAULT_PARAMS`.
+    :return: the behaviour.
+    """
+    context = mock.MagicMock()
+    context.params = SimpleNamespace(**{**DEFAULT_PARAMS, **params})
+    state = SharedState(name="state", skill_context=context)
+    state._round_sequence = mock.MagicMock(  # pylint: disable=protected-access
+        latest_synchronized_data=synchronized_data or get_synchronized_data(),
+        last_round_transition_timestamp=datetime.fromtimestamp(0),
+    )
+    context.state = state
+    return behaviour_cls(name=behaviour_cls.__name__, skill_context=context)
+
+
+def make_next_behaviour(
+    behaviour_cls: Type[BehaviourType], previous: CeloTraderBaseBehaviour
+) -> BehaviourType:
+    """Make a behaviour which shares the skill context of the given one, like the next behaviour of the same agent."""
+    return behaviour_cls(name=behaviour_cls.__name__, skill_context=previous.context)
+
+
+def set_synchronized_data(
+    behaviour: CeloTraderBaseBehaviour, synchronized_data: SynchronizedData
+) -> None:
+    """Replace the synchronized data which the given behaviour reads."""
+    behaviour.local_state.round_sequence.latest_synchronized_data = synchronized_data
+
+
+def run(generator: Generator) -> Any:
+    """Run a behaviour's generator which never waits, and return its result."""
+    try:
+        while True:
+            next(generator)
+    except StopIteration as stop:
+        return stop.value
+
+
+def returning(result: Any) -> Any:
+    """Get a side effect for a generator method, which returns the given result without waiting."""
+
+    def side_effect(*_args: Any, **_kwargs: Any) -> Generator[None, None, Any]:
+        """Return the result."""
+        return result
+        yield  # pylint: disable=unreachable
+
+    return side_effect
+
+
+class MockLedger:  # pylint: disable=too-few-public-methods
+    """A mocked ledger, which serves the Safe's balance and estimates the gas of the transfers."""
+
+    def __init__(
+        self, balance: Optional[int], reverting_recipients: Iterable[str] = ()
+    ) -> None:
+        """Initialize the ledger."""
+        self.balance = balance
+        self.reverting_recipients = set(reverting_recipients)
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def get_response(
+        self, ledger_callable: str, **kwargs: Any
+    ) -> Generator[None, None, mock.MagicMock]:
+        """Get the response of the ledger connection, as `BaseBehaviour.get_ledger_api_response` does."""
+        self.calls.append((ledger_callable, kwargs))
+        body: Optional[Dict[str, Any]] = None
+        if ledger_callable == "get_balance" and self.balance is not None:
+            body = {"get_balance_result": self.balance}
+        elif ledger_callable == "estimate_gas":
+            recipient = kwargs["transaction"]["to"]
+            if recipient not in self.reverting_recipients:
+                body = {"estimate_gas_result": 21_000}
+
+        performative = (
+            LedgerApiMessage.Performative.ERROR
+            if body is None
+            else LedgerApiMessage.Performative.STATE
+        )
+        return mock.MagicMock(
+            performative=performative, state=mock.MagicMock(body=body)
+        )
+        yield  # pylint: disable=unreachable
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for draining the mech responses through the cursor."""
+
+import json
+from typing import Tuple
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.celo_trader_abci.behaviours import DecisionMakingBehaviour
+from packages.valory.skills.celo_trader_abci.rounds import decode_mech_responses
+
+from tests.helpers import get_synchronized_data, make_behaviour, set_synchronized_data
+
+
+BATCH_SIZE = 50
+
+
+def get_mech_responses(n_responses: int) -> str:
+    """Get the serialized mech responses of `n_responses` valid transfers to distinct recipients."""
+    return json.dumps(
+        [
+            dict(
+                nonce=f"nonce_{i}",
+                requestId=i,
+                data="",
+                error="",
+                result=json.dumps(
+                    {"to_address": f"0x{i:040x}", "value": 1}, sort_keys=True
+                ),
+            )
+            for i in range(n_responses)
+        ]
+    )
+
+
+def drain(n_responses: int) -> Tuple[int, int]:
+    """
+    Drain `n_responses` mech responses in batches, reading the synchronized data in every round.
+
+    :param n_responses: the number of mech responses.
+    :return: the number of processed mech responses and the number of times the queue was decoded.
+    """
+    serialized = get_mech_responses(n_responses)
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour,
+        multisend_batch_size=BATCH_SIZE,
+        max_transfer_value_wei=0,
+    )
+    decode_mech_responses.cache_clear()
+    process = mock.patch.object(
+        behaviour,
+        "process_next_mech_response",
+        wraps=behaviour.process_next_mech_response,
+    )
+
+    cursor = 0
+    with process as processed:
+        while cursor < n_responses:
+            # every decision making round reads the synchronized data which the previous round has written
+            set_synchronized_data(
+                behaviour,
+                get_synchronized_data(
+                    mech_responses=serialized, mech_responses_cursor=cursor
+                ),
+            )
+            synchronized_data = behaviour.synchronized_data
+            assert synchronized_data.n_pending_mech_responses == n_responses - cursor
+            transfers, _, cursor = behaviour.get_transfers_batch(
+                synchronized_data.mech_responses_queue,
+                synchronized_data.mech_responses_cursor,
+            )
+            assert 0 < len(transfers) <= BATCH_SIZE
+    return processed.call_count, decode_mech_responses.cache_info().misses
+
+
+@pytest.mark.parametrize("n_responses", (1, BATCH_SIZE - 1, BATCH_SIZE + 1, 1000))
+def test_every_response_is_processed_once(n_responses: int) -> None:
+    """Test that every mech response is processed once, and that the queue is decoded once."""
+    n_processed, n_decoded = drain(n_responses)
+    # the first response which does not fit in a batch is processed again in the next one
+    n_batches = -(-n_responses // BATCH_SIZE)
+    assert n_processed == n_responses + n_batches - 1
+    assert n_decoded == 1
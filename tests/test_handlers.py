@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the routing and the parsing of the HTTP requests."""
+
+import json
+import timeit
+from typing import Any, List, Optional, Tuple
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.celo_trader_abci.handlers import (
+    HttpHandler,
+    Router,
+    iter_bulk_items,
+)
+
+
+HOSTNAME_REGEX = r".*(celo_trader\.staging\.autonolas\.tech|localhost)"
+N_BENCHMARK_ROUTES = 1000
+# a lookup is expected to take about as long regardless of the number of routes
+MAX_DURATION_RATIO = 2
+
+
+def handle_health() -> None:
+    """Handle a health check."""
+
+
+def handle_status() -> None:
+    """Handle a status request."""
+
+
+def get_router(n_parametrized_routes: int = 0) -> Router:
+    """Get a router with a static and a parametrized route, along with the given number of other parametrized routes."""
+    router = Router(HOSTNAME_REGEX)
+    router.add_route(("get", "head"), "/healthcheck", handle_health)
+    router.add_route(("get",), "/request/{request_id}", handle_status)
+    for i in range(n_parametrized_routes):
+        router.add_route(("get",), f"/route_{i}/{{value}}", handle_status)
+    return router
+
+
+@pytest.mark.parametrize(
+    "url, method, expected",
+    (
+        ("http://localhost:8000/healthcheck", "get", (True, handle_health, {})),
+        ("localhost:8000/healthcheck/", "head", (True, handle_health, {})),
+        ("//localhost/healthcheck", "get", (True, handle_health, {})),
+        (
+            "https://celo_trader.staging.autonolas.tech/request/abc",
+            "get",
+            (True, handle_status, {"request_id": "abc"}),
+        ),
+        (
+            "localhost:8000/request/abc?callback=http://example.com",
+            "get",
+            (True, handle_status, {"request_id": "abc"}),
+        ),
+        ("localhost:8000/healthcheck", "post", (True, None, {})),
+        ("localhost:8000/request/abc/def", "get", (True, None, {})),
+        ("http://example.com/healthcheck", "get", (False, None, {})),
+        ("example.com/healthcheck?next=//localhost", "get", (False, None, {})),
+    ),
+)
+def test_match(url: str, method: str, expected: Tuple) -> None:
+    """Test matching the urls to the routes."""
+    assert get_router().match(url, method) == expected
+
+
+def test_match_is_independent_of_the_number_of_routes() -> None:
+    """Benchmark the lookups of a static and a parametrized path against many more routes."""
+    small, large = get_router(), get_router(N_BENCHMARK_ROUTES)
+    for url in ("localhost/healthcheck", "localhost/request/abc"):
+        durations = [
+            min(
+                timeit.repeat(
+                    "router.match(url, 'get')",
+                    globals=dict(router=router, url=url),
+                    number=1000,
+                    repeat=5,
+                )
+            )
+            for router in (small, large)
+        ]
+        assert durations[1] / durations[0] < MAX_DURATION_RATIO
+
+
+@pytest.mark.parametrize(
+    "body, expected",
+    (
+        ("[]", []),
+        (" [ ] ", []),
+        ('[{"a": 1}, 2, "b"]', [({"a": 1}, None), (2, None), ("b", None)]),
+        ('{"a": 1}\n\n{"b": 2}\n', [({"a": 1}, None), ({"b": 2}, None)]),
+        ('{"a": 1}\n{"b": \n3', [({"a": 1}, None), (None, "Invalid JSON"), (3, None)]),
+        (
+            "[1, 2 3]",
+            [(1, None), (2, None), (None, "Invalid JSON: expected ',' or ']'")],
+        ),
+        ("[1, }]", [(1, None), (None, "Invalid JSON")]),
+        ("[1] 2", [(1, None), (None, "Invalid JSON: extra data after the array")]),
+    ),
+)
+def test_iter_bulk_items(body: str, expected: List[Tuple[Any, Optional[str]]]) -> None:
+    """Test parsing the items of the JSON arrays and the NDJSON bodies."""
+    items = list(iter_bulk_items(body))
+    assert len(items) == len(expected)
+    for (item, reason), (expected_item, expected_reason) in zip(items, expected):
+        assert item == expected_item
+        if expected_reason is None:
+            assert reason is None
+        else:
+            assert reason is not None and reason.startswith(expected_reason)
+
+
+SECRET_ADDRESS = "0x" + "5e" * 20
+
+
+def make_handler() -> Tuple[HttpHandler, mock.MagicMock]:
+    """Make an http handler whose skill context is mocked, and which accepts every request."""
+    context = mock.MagicMock()
+    context.state.safe_states.max_balance.return_value = None
+    context.params.max_transfer_value_wei = 0
+    handler = HttpHandler(name="http", skill_context=context)
+    handler.json_content_header = ""
+    return handler, context
+
+
+def handle(handler: HttpHandler, method: str, body: Any) -> mock.MagicMock:
+    """Handle a request with the given body, and return the response."""
+    dialogue = mock.MagicMock()
+    dialogue.reply.side_effect = lambda **kwargs: mock.MagicMock(**kwargs)
+    http_msg = mock.MagicMock(body=body if isinstance(body, bytes) else body.encode())
+    with mock.patch.object(
+        HttpHandler, "queue_depth_header", new_callable=mock.PropertyMock
+    ) as queue_depth_header, mock.patch.object(
+        handler, "_get_retry_after", return_value=None
+    ):
+        queue_depth_header.return_value = ""
+        getattr(handler, method)(http_msg, dialogue)
+    return dialogue.reply.call_args.kwargs
+
+
+def get_logs(context: mock.MagicMock) -> str:
+    """Get everything which has been logged."""
+    return "\n".join(
+        str(call)
+        for logger_method in (context.logger.info, context.logger.warning)
+        for call in logger_method.call_args_list
+    )
+
+
+def test_responses_are_logged_without_their_body() -> None:
+    """Test that only the size of a response is logged, as its body may be large and contain the users' data."""
+    handler, context = make_handler()
+    dialogue = mock.MagicMock()
+    dialogue.reply.side_effect = lambda **kwargs: mock.MagicMock(**kwargs)
+    data = {"requests": [{"prompt": "secret"}] * 3, "n_requests": 3}
+    with mock.patch.object(
+        HttpHandler, "queue_depth_header", new_callable=mock.PropertyMock
+    ) as queue_depth_header:
+        queue_depth_header.return_value = ""
+        handler._send_ok_response(mock.MagicMock(), dialogue, data)
+
+    (message,), _ = context.logger.info.call_args
+    assert "secret" not in message
+    assert "{'requests': 3}" in message
+
+
+@pytest.mark.parametrize(
+    "method, body",
+    (
+        ("_handle_post_request", json.dumps({"prompt": "secret"})),
+        (
+            "_handle_post_transfer",
+            json.dumps([{"to_address": SECRET_ADDRESS, "value": 1}] * 2),
+        ),
+    ),
+)
+def test_requests_are_logged_without_their_body(method: str, body: str) -> None:
+    """Test that the accepted user requests are logged without their prompts or transfers."""
+    handler, context = make_handler()
+    response = handle(handler, method, body)
+    assert response["status_code"] == 200
+    logs = get_logs(context)
+    assert "secret" not in logs
+    assert SECRET_ADDRESS not in logs
+
+
+@pytest.mark.parametrize(
+    "method, body",
+    (
+        ("_handle_post_request", "{'prompt': 'secret'"),
+        ("_handle_post_request", json.dumps({"secret": "secret"})),
+        ("_handle_post_transfer", json.dumps([{"to_address": SECRET_ADDRESS}])),
+    ),
+)
+def test_error_responses_are_logged_without_their_body(method: str, body: str) -> None:
+    """Test that the error responses are logged without their bodies, which echo the user's input."""
+    handler, context = make_handler()
+    response = handle(handler, method, body)
+    assert response["status_code"] == 400
+    assert b"secret" in response["body"] or SECRET_ADDRESS.encode() in response["body"]
+    logs = get_logs(context)
+    assert "secret" not in logs
+    assert SECRET_ADDRESS not in logs
+    assert "status=400" in logs
+
+
+@pytest.mark.parametrize("values, status_code", (([2, 3], 200), ([3, 3], 503)))
+def test_transfers_are_covered_by_the_balance_in_total(
+    values: List[int], status_code: int
+) -> None:
+    """Test that the transfers are rejected if their total value exceeds the balance, even if none of them does."""
+    handler, context = make_handler()
+    context.state.safe_states.max_balance.return_value = 5
+    body = json.dumps(
+        [{"to_address": SECRET_ADDRESS, "value": value} for value in values]
+    )
+    response = handle(handler, "_handle_post_transfer", body)
+    assert response["status_code"] == status_code
+    assert context.state.add_user_request.call_count == (status_code == 200) * len(
+        values
+    )
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for settling the user requests whose results are obtained locally."""
+
+import json
+from typing import Any, Dict, Tuple
+from unittest import mock
+
+from packages.valory.skills.celo_trader_abci.behaviours import DecisionMakingBehaviour
+from packages.valory.skills.celo_trader_abci.rounds import Event
+from packages.valory.skills.celo_trader_abci.status import RequestStatus
+
+from tests.helpers import (
+    SAFE_ADDRESS,
+    get_synchronized_data,
+    make_behaviour,
+    returning,
+    run,
+)
+
+
+SAFE_TX_HASH = "0x" + "ef" * 32
+USER_REQUESTS = [
+    {"request_id": f"id_{i}", "transfer": {"to_address": f"0x{i + 1:040x}", "value": 1}}
+    for i in range(2)
+]
+
+
+def decide(tx_hash: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Get the decision making payload data for structured transfers, and their requests' statuses."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour,
+        get_synchronized_data(
+            safe_contract_address=SAFE_ADDRESS,
+            user_requests=json.dumps(USER_REQUESTS, sort_keys=True),
+            mech_responses_cursor=0,
+        ),
+    )
+    behaviour.local_state.safe_states.update(SAFE_ADDRESS, 0, nonce=0, balance=10**18)
+    with mock.patch.object(
+        behaviour, "build_settlement_tx_hash", side_effect=returning(tx_hash)
+    ):
+        data = run(behaviour.get_payload_data())
+    statuses = {
+        request["request_id"]: behaviour.local_state.request_statuses.get(
+            request["request_id"]
+        )["status"]
+        for request in USER_REQUESTS
+    }
+    return data, statuses
+
+
+def test_local_responses_are_settled() -> None:
+    """Test that the structured transfers are settled together, without a mech request."""
+    data, statuses = decide(SAFE_TX_HASH)
+    assert data["event"] == Event.SETTLE.value
+    assert data["tx_hash"] == SAFE_TX_HASH
+    assert data["served_request_ids"] == ["id_0", "id_1"]
+    assert len(data["local_mech_responses"]) == 2
+    assert data["mech_responses_cursor"] == 2
+    assert set(statuses.values()) == {RequestStatus.MECH_RESPONDED.value}
+
+
+def test_unsettled_local_responses_are_rejected() -> None:
+    """Test that the served requests are rejected when the transaction to settle them cannot be prepared."""
+    data, statuses = decide("")
+    assert data["event"] != Event.SETTLE.value
+    assert data["served_request_ids"] == ["id_0", "id_1"]
+    assert not data["local_mech_responses"]
+    assert data["mech_responses_cursor"] == 0
+    assert set(statuses.values()) == {RequestStatus.REJECTED.value}
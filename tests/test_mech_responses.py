@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for validating the transfers which are returned by the mech."""
+
+import json
+from typing import Any
+
+import pytest
+
+from packages.valory.skills.celo_trader_abci.behaviours import (
+    DecisionMakingBehaviour,
+    validate_transfer,
+)
+from packages.valory.skills.celo_trader_abci.status import RequestStatus
+
+from tests.helpers import get_synchronized_data, make_behaviour
+
+
+VALID_TRANSFER = {"to_address": "0x" + "01" * 20, "value": 1}
+INVALID_TRANSFERS = [
+    {"to_address": "0x" + "02" * 20, "value": "1"},
+    {"to_address": "0x" + "02" * 20, "value": True},
+    {"to_address": "0x" + "02" * 20, "value": -1},
+    {"to_address": "0x" + "02" * 20, "value": 1.0},
+    {"to_address": 2, "value": 1},
+    {"to_address": "0xnot_an_address", "value": 1},
+    {"to_address": "0x" + "02" * 20},
+    ["0x" + "02" * 20, 1],
+]
+
+
+@pytest.mark.parametrize("transfer", INVALID_TRANSFERS)
+def test_invalid_transfer(transfer: Any) -> None:
+    """Test that the invalid transfers are detected."""
+    assert validate_transfer(transfer, 0) is not None
+
+
+def test_transfer_value_limit() -> None:
+    """Test that the transfers which exceed the maximum value are detected, unless the value is not limited."""
+    assert validate_transfer(VALID_TRANSFER, 1) is None
+    assert validate_transfer(VALID_TRANSFER, 0) is None
+    assert validate_transfer({**VALID_TRANSFER, "value": 2}, 1) is not None
+
+
+@pytest.mark.parametrize("transfer", INVALID_TRANSFERS)
+def test_invalid_mech_response_is_rejected(transfer: Any) -> None:
+    """Test that a mech response with an invalid transfer is rejected, without dropping the valid ones of the batch."""
+    mech_responses = [
+        dict(
+            nonce="invalid",
+            requestId=0,
+            data="",
+            error="",
+            result=json.dumps([VALID_TRANSFER, transfer]),
+        ),
+        dict(
+            nonce="valid",
+            requestId=1,
+            data="",
+            error="",
+            result=json.dumps(VALID_TRANSFER),
+        ),
+    ]
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour,
+        get_synchronized_data(mech_responses=json.dumps(mech_responses)),
+    )
+    request_statuses = behaviour.local_state.request_statuses
+    for response in mech_responses:
+        request_statuses.map_nonce(response["nonce"], f"id_{response['nonce']}")
+        request_statuses.set_status(
+            f"id_{response['nonce']}", RequestStatus.MECH_RESPONDED
+        )
+
+    transfers, nonces, cursor = behaviour.get_transfers_batch(
+        behaviour.synchronized_data.mech_responses, 0
+    )
+    assert transfers == [VALID_TRANSFER]
+    assert nonces == ["valid"]
+    assert cursor == 2
+    status = request_statuses.get("id_invalid")
+    assert status is not None
+    assert status["status"] == RequestStatus.REJECTED.value
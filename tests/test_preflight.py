@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the pre-flight checks of the transfers, against a mocked ledger."""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from packages.valory.skills.celo_trader_abci.behaviours import DecisionMakingBehaviour
+from packages.valory.skills.celo_trader_abci.status import RequestStatus
+
+from tests.helpers import MockLedger, SAFE_ADDRESS, make_behaviour, run
+
+
+RECIPIENTS = tuple(f"0x{i + 1:040x}" for i in range(3))
+NONCES = tuple(f"nonce_{i}" for i in range(3))
+
+
+def get_transfers(*values: int) -> List[Dict[str, Any]]:
+    """Get a transfer of each of the given values, to a distinct recipient."""
+    return [
+        {"to_address": recipient, "value": value}
+        for recipient, value in zip(RECIPIENTS, values)
+    ]
+
+
+def preflight(
+    ledger: MockLedger,
+    transfers: List[Dict[str, Any]],
+    nonces: List[str],
+    runs: int = 1,
+    **params: Any,
+) -> Tuple[Tuple[List[Dict[str, Any]], List[str]], DecisionMakingBehaviour]:
+    """Run the pre-flight checks of the given transfers against the given ledger, as many times as given."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour, **{"preflight_transfers": True, **params}
+    )
+    behaviour.get_ledger_api_response = ledger.get_response  # type: ignore
+    for nonce in NONCES:
+        behaviour.local_state.request_statuses.map_nonce(nonce, nonce)
+        behaviour.local_state.request_statuses.set_status(
+            nonce, RequestStatus.MECH_RESPONDED
+        )
+    result: Tuple[List[Dict[str, Any]], List[str]] = ([], [])
+    for _ in range(runs):
+        result = run(behaviour.preflight_transfers(transfers, nonces, SAFE_ADDRESS))
+    return result, behaviour
+
+
+def get_status(behaviour: DecisionMakingBehaviour, nonce: str) -> Optional[str]:
+    """Get the status of the request of the mech response with the given nonce."""
+    status = behaviour.local_state.request_statuses.get(nonce)
+    return None if status is None else status["status"]
+
+
+def test_valid_transfers_are_kept() -> None:
+    """Test that the transfers which are funded and do not revert are kept, and that every recipient is simulated once."""
+    ledger = MockLedger(balance=10)
+    transfers, nonces = get_transfers(1, 2, 3), list(NONCES)
+    result, _ = preflight(ledger, transfers, nonces, runs=2)
+    assert result == (transfers, nonces)
+    simulated = [
+        kwargs["transaction"]["to"]
+        for ledger_callable, kwargs in ledger.calls
+        if ledger_callable == "estimate_gas"
+    ]
+    assert simulated == list(RECIPIENTS)
+
+
+def test_reverting_transfers_are_dropped_with_their_response() -> None:
+    """Test that all the transfers of a mech response are dropped if any of them would revert."""
+    ledger = MockLedger(balance=10, reverting_recipients=[RECIPIENTS[1]])
+    transfers = get_transfers(1, 2, 3)
+    nonces = [NONCES[0], NONCES[0], NONCES[2]]
+    (kept, kept_nonces), behaviour = preflight(ledger, transfers, nonces)
+    assert kept == transfers[2:]
+    assert kept_nonces == [NONCES[2]]
+    assert get_status(behaviour, NONCES[0]) == RequestStatus.REJECTED.value
+    assert get_status(behaviour, NONCES[2]) == RequestStatus.MECH_RESPONDED.value
+
+
+def test_transfers_exceeding_the_balance_are_dropped() -> None:
+    """Test that the transfers are funded in order, and that the ones which the remaining balance cannot fund are dropped."""
+    ledger = MockLedger(balance=4)
+    transfers, nonces = get_transfers(3, 2, 1), list(NONCES)
+    (kept, kept_nonces), behaviour = preflight(ledger, transfers, nonces)
+    assert kept == [transfers[0], transfers[2]]
+    assert kept_nonces == [NONCES[0], NONCES[2]]
+    assert get_status(behaviour, NONCES[1]) == RequestStatus.REJECTED.value
+
+
+@pytest.mark.parametrize(
+    "ledger, params",
+    (
+        (MockLedger(balance=None), {}),
+        (MockLedger(balance=0), {"preflight_transfers": False}),
+    ),
+)
+def test_transfers_are_kept_without_checks(
+    ledger: MockLedger, params: Dict[str, Any]
+) -> None:
+    """Test that the transfers are kept when the balance cannot be read, or when the checks are disabled."""
+    transfers, nonces = get_transfers(1, 2, 3), list(NONCES)
+    result, _ = preflight(ledger, transfers, nonces, **params)
+    assert result == (transfers, nonces)
+    assert all(ledger_callable != "estimate_gas" for ledger_callable, _ in ledger.calls)
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the local computation of the Safe's transaction hashes."""
+
+from typing import Any, Dict
+
+import pytest
+from hexbytes import HexBytes
+from packaging.version import Version
+
+from packages.valory.contracts.gnosis_safe.contract import NULL_ADDRESS
+from packages.valory.contracts.gnosis_safe.encode import encode_typed_data
+from packages.valory.skills.celo_trader_abci.safe import (
+    SafeStateCache,
+    SafeTxHashEngine,
+)
+
+
+CHAIN_ID = 42220
+SAFE_ADDRESS = "0x" + "ab" * 20
+TO_ADDRESS = "0x" + "12" * 20
+
+
+def get_reference_hash(version: str, value: int, data: bytes, nonce: int) -> str:
+    """Get a Safe tx hash the way `GnosisSafeContract.get_raw_safe_transaction_hash` computes it."""
+    safe_version = Version(version)
+    base_gas_name = "baseGas" if safe_version >= Version("1.0.0") else "dataGas"
+    structured_data: Dict[str, Any] = {
+        "types": {
+            "EIP712Domain": [{"name": "verifyingContract", "type": "address"}],
+            "SafeTx": [
+                {"name": "to", "type": "address"},
+                {"name": "value", "type": "uint256"},
+                {"name": "data", "type": "bytes"},
+                {"name": "operation", "type": "uint8"},
+                {"name": "safeTxGas", "type": "uint256"},
+                {"name": base_gas_name, "type": "uint256"},
+                {"name": "gasPrice", "type": "uint256"},
+                {"name": "gasToken", "type": "address"},
+                {"name": "refundReceiver", "type": "address"},
+                {"name": "nonce", "type": "uint256"},
+            ],
+        },
+        "primaryType": "SafeTx",
+        "domain": {"verifyingContract": SAFE_ADDRESS},
+        "message": {
+            "to": TO_ADDRESS,
+            "value": value,
+            "data": HexBytes(data).hex(),
+            "operation": 0,
+            "safeTxGas": 0,
+            base_gas_name: 0,
+            "gasPrice": 0,
+            "gasToken": NULL_ADDRESS,
+            "refundReceiver": NULL_ADDRESS,
+            "nonce": nonce,
+        },
+    }
+    if safe_version >= Version("1.3.0"):
+        structured_data["types"]["EIP712Domain"].insert(
+            0, {"name": "chainId", "type": "uint256"}
+        )
+        structured_data["domain"]["chainId"] = CHAIN_ID
+    return HexBytes(encode_typed_data(structured_data)).hex()[2:]
+
+
+@pytest.mark.parametrize("version", ("0.1.0", "1.1.1", "1.2.0", "1.3.0", "1.4.1"))
+@pytest.mark.parametrize(
+    "value, data, nonce", ((0, b"0x", 0), (10**18, b"\x01\x02", 7))
+)
+def test_safe_tx_hash_matches_the_contract(
+    version: str, value: int, data: bytes, nonce: int
+) -> None:
+    """Test that the local hashes match the contract's, for every domain version."""
+    engine = SafeTxHashEngine()
+    tx_hash = engine.get_safe_tx_hash(
+        CHAIN_ID, SAFE_ADDRESS, version, TO_ADDRESS, value, data, 0, 0, nonce
+    )
+    assert tx_hash == get_reference_hash(version, value, data, nonce)
+
+
+def test_domain_is_dropped_on_invalidation() -> None:
+    """Test that the cached domain of a Safe is read again after its state is invalidated."""
+    cache = SafeStateCache()
+    cache.set_domain(SAFE_ADDRESS, "1.3.0", CHAIN_ID)
+    cache.update(SAFE_ADDRESS, 0, nonce=1)
+    assert cache.get_domain(SAFE_ADDRESS) == ("1.3.0", CHAIN_ID)
+
+    # a new period does not invalidate the domain
+    cache.update(SAFE_ADDRESS, 1, nonce=2)
+    assert cache.get_domain(SAFE_ADDRESS) == ("1.3.0", CHAIN_ID)
+
+    cache.invalidate(SAFE_ADDRESS)
+    assert cache.get_domain(SAFE_ADDRESS) is None
+    assert cache.get(SAFE_ADDRESS) is None
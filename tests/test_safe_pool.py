@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for using the pool of Safes in a round-robin fashion."""
+
+import json
+from typing import Any, Dict
+from unittest import mock
+
+from packages.valory.protocols.contract_api import ContractApiMessage
+from packages.valory.skills.celo_trader_abci.behaviours import DecisionMakingBehaviour
+from packages.valory.skills.celo_trader_abci.payloads import DecisionMakingPayload
+from packages.valory.skills.celo_trader_abci.rounds import (
+    DecisionMakingRound,
+    Event,
+    SynchronizedData,
+)
+
+from tests.helpers import get_synchronized_data, make_behaviour, returning, run
+
+
+AGENT = "agent"
+SAFE_POOL = [f"0x{i + 1:040x}" for i in range(3)]
+
+
+def get_initial_data(settling_safe_address: str) -> SynchronizedData:
+    """Get the synchronized data of a single agent, after the given Safe of the pool has settled a transaction."""
+    return get_synchronized_data(
+        participants=(AGENT,),
+        all_participants=(AGENT,),
+        consensus_threshold=1,
+        safe_contract_address=SAFE_POOL[0],
+        settling_safe_address=settling_safe_address,
+        post_tx_event="",
+    )
+
+
+def test_select_safe_continues_after_the_settling_safe() -> None:
+    """Test that the next Safe is selected after the one which has settled the last transaction."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour, get_initial_data(SAFE_POOL[1]), safe_pool=SAFE_POOL
+    )
+    for safe_address in SAFE_POOL:
+        behaviour.local_state.safe_states.update(safe_address, 0, balance=10**18)
+    transfers = [dict(to_address=SAFE_POOL[0], value=1)]
+    assert run(behaviour.select_safe(transfers)) == SAFE_POOL[2]
+
+
+def test_settling_safe_is_kept_when_nothing_is_settled() -> None:
+    """Test that a decision without any transaction does not reset the round-robin, not even across periods."""
+    synchronized_data = get_initial_data(SAFE_POOL[1])
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour, synchronized_data, safe_pool=SAFE_POOL
+    )
+    payload_data: Dict[str, Any] = run(behaviour.get_payload_data())
+    assert payload_data["event"] == Event.DONE.value
+
+    round_ = DecisionMakingRound(synchronized_data, mock.MagicMock())
+    round_.process_payload(
+        DecisionMakingPayload(AGENT, json.dumps(payload_data, sort_keys=True))
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data = SynchronizedData(result[0].db)
+    assert synchronized_data.safe_contract_address == SAFE_POOL[0]
+    assert synchronized_data.settling_safe_address == SAFE_POOL[1]
+
+    synchronized_data.create()
+    assert synchronized_data.settling_safe_address == SAFE_POOL[1]
+
+
+def test_safe_threshold_is_read_from_the_chain() -> None:
+    """Test that the threshold of the pool's Safes is read from their contracts."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour, get_initial_data(SAFE_POOL[0]), safe_pool=SAFE_POOL
+    )
+    response = mock.MagicMock(
+        performative=ContractApiMessage.Performative.STATE,
+        state=mock.MagicMock(body={"threshold": 2}),
+    )
+    with mock.patch.object(
+        behaviour, "_get_safe_nonce", side_effect=returning(None)
+    ), mock.patch.object(
+        behaviour, "_get_safe_balance", side_effect=returning(None)
+    ), mock.patch.object(
+        behaviour, "_get_safe_owners", side_effect=returning(None)
+    ), mock.patch.object(
+        behaviour, "get_contract_api_response", side_effect=returning(response)
+    ) as get_contract_api_response:
+        run(behaviour.refresh_safe_states())
+
+    for safe_address in SAFE_POOL:
+        assert behaviour.local_state.safe_states.get(safe_address, 0).threshold == 2
+    assert {
+        call.kwargs["contract_callable"]
+        for call in get_contract_api_response.call_args_list
+    } == {"get_threshold"}
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for retrying the failed settlements without blocking the rest of the work."""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence
+from unittest import mock
+
+from packages.valory.skills.celo_trader_abci.behaviours import (
+    DecisionMakingBehaviour,
+    SettlementRetryBehaviour,
+)
+from packages.valory.skills.celo_trader_abci.payloads import DecisionMakingPayload
+from packages.valory.skills.celo_trader_abci.rounds import DecisionMakingRound, Event
+from packages.valory.skills.celo_trader_abci.status import RequestStatus
+
+from tests.helpers import (
+    SAFE_ADDRESS,
+    get_synchronized_data,
+    make_behaviour,
+    make_next_behaviour,
+    returning,
+    run,
+    set_synchronized_data,
+)
+
+
+SAFE_TX_HASH = "0x" + "03" * 32
+BACKOFF = 2.0
+NONCES = ("failed", "pending")
+AGENT = "agent"
+
+
+def get_mech_responses(nonces: Sequence[str] = NONCES) -> str:
+    """Get a mech response whose settlement has failed, followed by one which is pending."""
+    return json.dumps(
+        [
+            dict(
+                nonce=nonce,
+                requestId=i,
+                data="",
+                error="",
+                result=json.dumps({"to_address": f"0x{i + 1:040x}", "value": 1}),
+            )
+            for i, nonce in enumerate(NONCES)
+            if nonce in nonces
+        ]
+    )
+
+
+def decide(
+    retry_deadline: float,
+    mech_responses_cursor: int,
+    tx_hash: str = SAFE_TX_HASH,
+    retried: Sequence[str] = ("failed",),
+) -> Dict[str, Any]:
+    """Get the decision making payload data when the failed settlement is due at the given timestamp."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour,
+        get_synchronized_data(
+            safe_contract_address=SAFE_ADDRESS,
+            mech_responses=get_mech_responses(),
+            mech_responses_cursor=mech_responses_cursor,
+            retry_nonces=json.dumps(["failed"]),
+            retry_deadlines=json.dumps({"failed": retry_deadline}),
+            retry_mech_responses=get_mech_responses(retried),
+            settlement_attempts=json.dumps({"failed": 1}),
+        ),
+    )
+    behaviour.local_state.safe_states.update(SAFE_ADDRESS, 0, nonce=0, balance=10**18)
+    for nonce in NONCES:
+        behaviour.local_state.request_statuses.map_nonce(nonce, f"id_{nonce}")
+        behaviour.local_state.request_statuses.set_status(
+            f"id_{nonce}", RequestStatus.MECH_RESPONDED
+        )
+    with mock.patch.object(
+        behaviour, "build_settlement_tx_hash", side_effect=returning(tx_hash)
+    ), mock.patch.object(behaviour, "sleep", side_effect=returning(None)) as sleep:
+        data = run(behaviour.get_payload_data())
+    data["slept"] = [call[0][0] for call in sleep.call_args_list]
+    data["dead_letters"] = list(behaviour.local_state.dead_letters)
+    data["status"] = behaviour.local_state.request_statuses.get("id_failed")
+    return data
+
+
+def test_retry_deadline_is_agreed_instead_of_waiting() -> None:
+    """Test that the failed settlements are given a deadline, instead of the behaviour waiting for the backoff."""
+    behaviour = make_behaviour(
+        SettlementRetryBehaviour,
+        get_synchronized_data(
+            settling_nonces=json.dumps(["failed"]),
+            mech_responses=get_mech_responses(),
+        ),
+        settlement_retry_backoff=BACKOFF,
+    )
+    data = behaviour.get_payload_data()
+    assert data["event"] == Event.DECISION_MAKING.value
+    assert data["retry_nonces"] == ["failed"]
+    assert data["settlement_attempts"] == {"failed": 1}
+    assert data["retry_deadlines"] == {"failed": BACKOFF}
+    assert data["retry_mech_responses"] == json.loads(get_mech_responses(["failed"]))
+
+
+def test_pending_settlements_go_on_until_the_retry_is_due() -> None:
+    """Test that the pending mech responses are settled while the retry is not due, and that the retry is kept."""
+    data = decide(retry_deadline=BACKOFF, mech_responses_cursor=1)
+    assert data["event"] == Event.SETTLE.value
+    assert data["settling_nonces"] == ["pending"]
+    assert data["retry_nonces"] == ["failed"]
+    assert data["slept"] == []
+
+
+def test_due_retry_is_settled_first() -> None:
+    """Test that a due retry is settled before the pending mech responses."""
+    data = decide(retry_deadline=0.0, mech_responses_cursor=1)
+    assert data["event"] == Event.SETTLE.value
+    assert data["settling_nonces"] == ["failed"]
+    assert data["retry_nonces"] == []
+    assert data["mech_responses_cursor"] == 1
+    assert data["slept"] == []
+
+
+def test_retry_is_kept_when_there_is_nothing_else_to_do() -> None:
+    """Test that the retry is kept for the next decisions, instead of being awaited, once nothing else is pending."""
+    data = decide(retry_deadline=BACKOFF, mech_responses_cursor=2)
+    assert data["event"] == Event.DONE.value
+    assert data["retry_nonces"] == ["failed"]
+    assert data["slept"] == []
+    assert not data["dead_letters"]
+
+
+def test_retry_is_dead_lettered_if_its_tx_cannot_be_prepared() -> None:
+    """Test that a retry whose tx hash cannot be built is moved to the dead-letter queue."""
+    data = decide(retry_deadline=0.0, mech_responses_cursor=2, tx_hash="")
+    assert data["event"] == Event.DONE.value
+    assert data["retry_nonces"] == []
+    status: Optional[Dict[str, Any]] = data["status"]
+    assert status is not None and status["status"] == RequestStatus.REJECTED.value
+    assert [letter["nonce"] for letter in data["dead_letters"]] == ["failed"]
+    assert data["dead_letters"][0]["attempts"] == 1
+
+
+def test_retry_is_dead_lettered_if_its_mech_response_is_missing() -> None:
+    """Test that a retry whose mech response cannot be found is moved to the dead-letter queue."""
+    data = decide(retry_deadline=0.0, mech_responses_cursor=2, retried=())
+    assert data["event"] == Event.DONE.value
+    assert data["retry_nonces"] == []
+    status: Optional[Dict[str, Any]] = data["status"]
+    assert status is not None and status["status"] == RequestStatus.REJECTED.value
+    assert [letter["nonce"] for letter in data["dead_letters"]] == ["failed"]
+
+
+def test_retries_survive_a_reset() -> None:
+    """Test that the retries which are not due yet are carried over to the next period."""
+    synchronized_data = get_synchronized_data(
+        participants=(AGENT,),
+        all_participants=(AGENT,),
+        consensus_threshold=1,
+        retry_nonces=json.dumps(["failed"]),
+        retry_deadlines=json.dumps({"failed": BACKOFF}),
+        settlement_attempts=json.dumps({"failed": 1}),
+        retry_mech_responses=get_mech_responses(["failed"]),
+        post_tx_event="",
+    )
+    behaviour = make_behaviour(DecisionMakingBehaviour, synchronized_data)
+    payload_data = run(behaviour.get_payload_data())
+    assert payload_data["event"] == Event.DONE.value
+    round_ = DecisionMakingRound(synchronized_data, mock.MagicMock())
+    round_.process_payload(
+        DecisionMakingPayload(AGENT, json.dumps(payload_data, sort_keys=True))
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data = result[0]
+    synchronized_data.create()
+
+    assert synchronized_data.retry_nonces == ["failed"]
+    assert synchronized_data.retry_deadlines == {"failed": BACKOFF}
+    assert synchronized_data.settlement_attempts == {"failed": 1}
+    assert [
+        mech_response.nonce for mech_response in synchronized_data.retry_mech_responses
+    ] == ["failed"]
+
+
+def test_failed_mech_requests_are_sent_again_after_the_backoff() -> None:
+    """Test that the mech requests whose tx has failed are dispatched again once their deadline is due, without waiting."""
+    behaviour = make_behaviour(
+        SettlementRetryBehaviour,
+        get_synchronized_data(settling_nonces="[]", mech_request_tx_attempts=0),
+        settlement_retry_backoff=BACKOFF,
+    )
+    data = behaviour.get_payload_data()
+    assert data["event"] == Event.DECISION_MAKING.value
+    assert data["mech_request_tx_attempts"] == 1
+    assert data["mech_request_tx_deadline"] == BACKOFF
+    assert not data["drop_dispatched_user_requests"]
+
+    user_requests = [{"prompt": "Transfer 1 wei to 0x1.", "request_id": "id_0"}]
+    for now, event in ((0.0, Event.DONE), (BACKOFF, Event.MECH)):
+        behaviour = make_behaviour(
+            DecisionMakingBehaviour,
+            get_synchronized_data(
+                user_requests=json.dumps(user_requests),
+                mech_request_tx_attempts=1,
+                mech_request_tx_deadline=BACKOFF,
+            ),
+        )
+        behaviour.round_sequence.last_round_transition_timestamp = (
+            datetime.fromtimestamp(now)
+        )
+        with mock.patch.object(behaviour, "sleep") as sleep:
+            payload_data = run(behaviour.get_payload_data())
+        assert payload_data["event"] == event.value
+        sleep.assert_not_called()
+
+
+def test_failed_mech_requests_are_given_up() -> None:
+    """Test that the user requests are not dispatched again once their mech requests' tx has exhausted its attempts."""
+    behaviour = make_behaviour(
+        SettlementRetryBehaviour,
+        get_synchronized_data(settling_nonces="[]", mech_request_tx_attempts=2),
+        max_settlement_attempts=3,
+    )
+    data = behaviour.get_payload_data()
+    assert data["event"] == Event.DECISION_MAKING.value
+    assert data["mech_request_tx_attempts"] == 0
+    assert data["drop_dispatched_user_requests"]
+
+
+def test_retry_survives_a_local_settlement() -> None:
+    """Test that a retry which is not due is still found after the local responses have replaced the mech responses."""
+    transfer_request = {
+        "request_id": "id_transfer",
+        "transfer": {"to_address": f"0x{9:040x}", "value": 1},
+    }
+    synchronized_data = get_synchronized_data(
+        participants=(AGENT,),
+        all_participants=(AGENT,),
+        consensus_threshold=1,
+        safe_contract_address=SAFE_ADDRESS,
+        mech_responses=get_mech_responses(["failed"]),
+        mech_responses_cursor=1,
+        retry_nonces=json.dumps(["failed"]),
+        retry_deadlines=json.dumps({"failed": BACKOFF}),
+        settlement_attempts=json.dumps({"failed": 1}),
+        retry_mech_responses=get_mech_responses(["failed"]),
+        user_requests=json.dumps([transfer_request], sort_keys=True),
+        post_tx_event="",
+    )
+    behaviour = make_behaviour(DecisionMakingBehaviour, synchronized_data)
+    behaviour.local_state.safe_states.update(SAFE_ADDRESS, 0, nonce=0, balance=10**18)
+    behaviour.local_state.request_statuses.map_nonce("failed", "id_failed")
+    build_settlement_tx_hash = mock.patch.object(
+        DecisionMakingBehaviour,
+        "build_settlement_tx_hash",
+        side_effect=returning(SAFE_TX_HASH),
+    )
+
+    # the structured transfer is settled locally, which replaces the mech responses
+    with build_settlement_tx_hash:
+        payload_data = run(behaviour.get_payload_data())
+    assert payload_data["event"] == Event.SETTLE.value
+    assert payload_data["retry_nonces"] == ["failed"]
+    round_ = DecisionMakingRound(synchronized_data, mock.MagicMock())
+    round_.process_payload(
+        DecisionMakingPayload(AGENT, json.dumps(payload_data, sort_keys=True))
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data = result[0]
+
+    # the retry is settled once it is due
+    behaviour = make_next_behaviour(DecisionMakingBehaviour, behaviour)
+    set_synchronized_data(behaviour, synchronized_data)
+    behaviour.round_sequence.last_round_transition_timestamp = datetime.fromtimestamp(
+        BACKOFF
+    )
+    with build_settlement_tx_hash:
+        payload_data = run(behaviour.get_payload_data())
+    assert payload_data["event"] == Event.SETTLE.value
+    assert payload_data["settling_nonces"] == ["failed"]
+    assert not behaviour.local_state.dead_letters
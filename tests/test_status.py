@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for the index of the user requests' statuses."""
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from packages.valory.skills.celo_trader_abci.journal import RequestJournal
+from packages.valory.skills.celo_trader_abci.models import SharedState
+from packages.valory.skills.celo_trader_abci.rounds import REQUEST_ID_KEY
+from packages.valory.skills.celo_trader_abci.status import (
+    RequestStatus,
+    RequestStatusIndex,
+)
+
+
+def make_journal(path: Path) -> RequestJournal:
+    """Make a journal which syncs every record."""
+    return RequestJournal(
+        str(path),
+        REQUEST_ID_KEY,
+        fsync_batch_size=1,
+        fsync_interval=0.0,
+        compaction_threshold=100,
+    )
+
+
+def test_n_waiters_only_counts_the_waiters_not_notified_yet() -> None:
+    """Test that the notified waiters are not counted, whether their request is final or their deadline has expired."""
+    index = RequestStatusIndex(max_size=10)
+    notified: List[Optional[Dict[str, Any]]] = []
+    for request_id in ("a", "b"):
+        index.set_status(request_id, RequestStatus.QUEUED)
+        index.wait(request_id, notified.append, timeout=10.0)
+        index.wait(request_id, notified.append, timeout=10.0)
+    assert index.n_waiters == 4
+
+    index.set_status("a", RequestStatus.SETTLED, tx_hash="0x1")
+    assert index.n_waiters == 2
+    assert notified == [{"status": "settled", "tx_hash": "0x1"}] * 2
+
+    with mock.patch("time.monotonic", return_value=float("inf")):
+        index.expire_waiters()
+    assert index.n_waiters == 0
+    assert notified[2:] == [{"status": "queued"}] * 2
+
+    # a final status does not notify the expired waiters again
+    index.set_status("b", RequestStatus.REJECTED)
+    assert len(notified) == 4
+
+
+def test_final_requests_do_not_wait() -> None:
+    """Test that the waiters of unknown or final requests are notified at once."""
+    index = RequestStatusIndex(max_size=10)
+    index.set_status("a", RequestStatus.SETTLED)
+    callback = mock.MagicMock()
+    index.wait("a", callback, timeout=10.0)
+    index.wait("unknown", callback, timeout=10.0)
+    assert callback.call_args_list == [
+        mock.call({"status": "settled"}),
+        mock.call(None),
+    ]
+    assert index.n_waiters == 0
+
+
+def test_requests_are_acked_once_final(tmp_path: Path) -> None:
+    """Test that the journal keeps the committed requests until their status is final."""
+    path = tmp_path / "journal.jsonl"
+    state = SharedState(name="state", skill_context=mock.MagicMock())
+    state.request_journal = make_journal(path)
+    state.request_journal.replay()
+    state.request_statuses.on_final = state.ack_user_request
+    for request_id in ("a", "b", "c"):
+        state.add_user_request({REQUEST_ID_KEY: request_id})
+
+    state.commit_user_requests({"a", "b", "c"})
+    assert not state.user_requests
+    state.request_statuses.set_status("a", RequestStatus.MECH_REQUESTED)
+    state.request_statuses.set_status("b", RequestStatus.SETTLED, tx_hash="0x1")
+    state.request_statuses.set_status("c", RequestStatus.REJECTED, reason="dead")
+    state.request_journal.close()
+
+    # the request which is not final yet is replayed after a crash
+    assert make_journal(path).replay() == [{REQUEST_ID_KEY: "a"}]
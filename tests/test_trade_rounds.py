@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Benchmark for the number of rounds per trade, and tests for tracking the settlements."""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple, Type
+from unittest import mock
+
+import pytest
+
+from packages.valory.skills.abstract_round_abci.base import AbstractRound
+from packages.valory.skills.celo_trader_abci.behaviours import (
+    CeloTraderBaseBehaviour,
+    DecisionMakingBehaviour,
+    SettlementRetryBehaviour,
+)
+from packages.valory.skills.celo_trader_abci.rounds import (
+    DecisionMakingRound,
+    Event,
+    PostTxDecisionMakingRound,
+)
+from packages.valory.skills.celo_trader_abci.status import RequestStatus
+
+from tests.helpers import (
+    MockLedger,
+    SAFE_ADDRESS,
+    get_synchronized_data,
+    make_behaviour,
+    make_next_behaviour,
+    returning,
+    run,
+    set_synchronized_data,
+)
+
+
+AGENT = "agent"
+SAFE_NONCE = 5
+SAFE_BALANCE = 10**18
+MECH_TX_HASH = "0x" + "01" * 32
+SETTLEMENT_TX_HASH = "0x" + "02" * 32
+SAFE_TX_HASH = "0x" + "03" * 32
+
+
+class Trade:
+    """Runs the rounds of the Celo trader for the user requests of a single agent service, with a mocked ledger."""
+
+    def __init__(self, n_requests: int) -> None:
+        """Initialize the trade."""
+        user_requests = [
+            {"prompt": f"Transfer {i + 1} wei to 0x{i:040x}", "request_id": f"id_{i}"}
+            for i in range(n_requests)
+        ]
+        self.request_ids = [request["request_id"] for request in user_requests]
+        self.synchronized_data = get_synchronized_data(
+            participants=(AGENT,),
+            all_participants=(AGENT,),
+            consensus_threshold=1,
+            safe_contract_address=SAFE_ADDRESS,
+            user_requests=json.dumps(user_requests, sort_keys=True),
+            post_tx_event="",
+        )
+        self.behaviour: CeloTraderBaseBehaviour = make_behaviour(
+            DecisionMakingBehaviour, self.synchronized_data
+        )
+        self.behaviour.local_state.safe_states.update(
+            SAFE_ADDRESS, 0, nonce=SAFE_NONCE, balance=SAFE_BALANCE
+        )
+        for request_id in self.request_ids:
+            self.behaviour.local_state.request_statuses.set_status(
+                request_id, RequestStatus.QUEUED
+            )
+        self.rounds: List[Tuple[Type[AbstractRound], Event]] = []
+
+    def act(self, behaviour_cls: Type[CeloTraderBaseBehaviour]) -> Dict[str, Any]:
+        """Run the next behaviour of the agent, and return the data of the payload which it sends."""
+        self.behaviour = make_next_behaviour(behaviour_cls, self.behaviour)
+        set_synchronized_data(self.behaviour, self.synchronized_data)
+        with mock.patch.object(
+            self.behaviour, "send_a2a_transaction", side_effect=returning(None)
+        ) as send, mock.patch.object(
+            self.behaviour, "wait_until_round_end", side_effect=returning(None)
+        ), mock.patch.object(
+            self.behaviour,
+            "get_ledger_api_response",
+            side_effect=MockLedger(SAFE_BALANCE).get_response,
+        ), mock.patch.object(
+            self.behaviour,
+            "build_settlement_tx_hash",
+            side_effect=returning(SAFE_TX_HASH),
+            create=True,
+        ):
+            run(self.behaviour.async_act())
+        return json.loads(send.call_args[0][0].content)
+
+    def end_round(self, round_: AbstractRound) -> Event:
+        """End the given round of this skill, and record it."""
+        result = round_.end_block()
+        assert result is not None
+        self.synchronized_data, event = result  # type: ignore
+        self.rounds.append((type(round_), event))
+        return event
+
+    def decide(self) -> Event:
+        """Run a decision making round."""
+        payload_data = self.act(DecisionMakingBehaviour)
+        round_ = DecisionMakingRound(self.synchronized_data, mock.MagicMock())
+        round_.process_payload(
+            DecisionMakingRound.payload_class(
+                AGENT, json.dumps(payload_data, sort_keys=True)
+            )
+        )
+        return self.end_round(round_)
+
+    def settle(self, tx_hash: str) -> Event:
+        """Settle a tx through the transaction settlement skill, and run the post-settlement round."""
+        self.synchronized_data = self.synchronized_data.update(final_tx_hash=tx_hash)
+        round_ = PostTxDecisionMakingRound(self.synchronized_data, mock.MagicMock())
+        return self.end_round(round_)
+
+    def respond(self, results: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Return the results of the mech requests through the mech interaction skill."""
+        mech_requests = self.synchronized_data.mech_requests
+        if results is None:
+            results = [
+                {"to_address": f"0x{i:040x}", "value": i + 1}
+                for i in range(len(mech_requests))
+            ]
+        mech_responses = [
+            dict(
+                nonce=mech_request.nonce,
+                requestId=i,
+                data="",
+                error="",
+                result=json.dumps(result),
+            )
+            for i, (mech_request, result) in enumerate(zip(mech_requests, results))
+        ]
+        self.synchronized_data = self.synchronized_data.update(
+            mech_responses=json.dumps(mech_responses)
+        )
+
+    def get_statuses(self) -> List[Optional[str]]:
+        """Get the local statuses of the user requests."""
+        request_statuses = self.behaviour.local_state.request_statuses
+        return [
+            (request_statuses.get(request_id) or {}).get("status")
+            for request_id in self.request_ids
+        ]
+
+    def run(self) -> None:
+        """Run a whole trade."""
+        assert self.decide() == Event.MECH
+        assert self.settle(MECH_TX_HASH) == Event.MECH
+        self.respond()
+        assert self.decide() == Event.SETTLE
+        assert self.settle(SETTLEMENT_TX_HASH) == Event.DECISION_MAKING
+        assert self.decide() == Event.DONE
+
+
+@pytest.mark.parametrize("n_requests", (1, 10))
+def test_rounds_per_trade(n_requests: int) -> None:
+    """Test that a trade takes the same rounds, with a single voting round per decision, regardless of its requests."""
+    trade = Trade(n_requests)
+    trade.run()
+    assert trade.rounds == [
+        (DecisionMakingRound, Event.MECH),
+        (PostTxDecisionMakingRound, Event.MECH),
+        (DecisionMakingRound, Event.SETTLE),
+        (PostTxDecisionMakingRound, Event.DECISION_MAKING),
+        (DecisionMakingRound, Event.DONE),
+    ]
+    voting_rounds = [
+        round_cls
+        for round_cls, _ in trade.rounds
+        if round_cls.payload_class is not None
+    ]
+    assert len(voting_rounds) == 3
+    assert trade.get_statuses() == [RequestStatus.SETTLED.value] * n_requests
+
+
+def test_settlement_is_tracked_once_from_the_synchronized_data() -> None:
+    """Test that the settlement is tracked by the next behaviours, even though the post-settlement behaviour never acts."""
+    trade = Trade(1)
+    assert trade.decide() == Event.MECH
+    assert trade.settle(MECH_TX_HASH) == Event.MECH
+    trade.respond()
+    assert trade.decide() == Event.SETTLE
+    assert trade.get_statuses() == [RequestStatus.MECH_RESPONDED.value]
+    safe_states = trade.behaviour.local_state.safe_states
+    # the mech requests' tx has been settled by the Safe as well
+    assert safe_states.get(SAFE_ADDRESS).nonce == SAFE_NONCE + 1  # type: ignore
+
+    assert trade.settle(SETTLEMENT_TX_HASH) == Event.DECISION_MAKING
+    trade.act(SettlementRetryBehaviour)
+    assert trade.get_statuses() == [RequestStatus.SETTLED.value]
+    safe_state = safe_states.get(SAFE_ADDRESS)
+    assert safe_state is None
+
+    # the settlement is not tracked again by the next behaviours
+    safe_states.update(SAFE_ADDRESS, 0, nonce=SAFE_NONCE + 2)
+    assert trade.decide() == Event.DONE
+    assert safe_states.get(SAFE_ADDRESS).nonce == SAFE_NONCE + 2  # type: ignore
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2024 Valory AG
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+
+"""Tests for keeping the agreed user requests until their mech requests are sent."""
+
+import json
+from typing import Any, Dict, List
+from unittest import mock
+
+from packages.valory.skills.celo_trader_abci.behaviours import DecisionMakingBehaviour
+from packages.valory.skills.celo_trader_abci.payloads import DecisionMakingPayload
+from packages.valory.skills.celo_trader_abci.rounds import (
+    DecisionMakingRound,
+    Event,
+    PostTxDecisionMakingRound,
+    SynchronizedData,
+)
+
+from tests.helpers import (
+    get_synchronized_data,
+    make_behaviour,
+    run,
+    set_synchronized_data,
+)
+
+
+AGENT = "agent"
+USER_REQUESTS = [
+    {"prompt": f"Transfer {i} wei to the first address.", "request_id": f"id_{i}"}
+    for i in range(2)
+]
+
+
+def get_initial_data() -> SynchronizedData:
+    """Get the synchronized data of a single agent, right after the user requests have been collected."""
+    return get_synchronized_data(
+        participants=(AGENT,),
+        all_participants=(AGENT,),
+        consensus_threshold=1,
+        user_requests=json.dumps(USER_REQUESTS, sort_keys=True),
+        post_tx_event="",
+    )
+
+
+def decide(synchronized_data: SynchronizedData) -> SynchronizedData:
+    """Run a decision making round, with the payload of a decision making behaviour."""
+    behaviour = make_behaviour(DecisionMakingBehaviour, synchronized_data)
+    payload_data: Dict[str, Any] = run(behaviour.get_payload_data())
+    round_ = DecisionMakingRound(synchronized_data, mock.MagicMock())
+    round_.process_payload(
+        DecisionMakingPayload(AGENT, json.dumps(payload_data, sort_keys=True))
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data, event = result
+    assert event == Event(payload_data["event"])
+    return synchronized_data
+
+
+def get_request_ids(user_requests: List[Dict[str, Any]]) -> List[str]:
+    """Get the ids of the given user requests."""
+    return [request["request_id"] for request in user_requests]
+
+
+def test_dispatched_requests_are_kept_until_sent() -> None:
+    """Test that the dispatched user requests are consumed once the transaction of their mech requests is settled."""
+    synchronized_data = decide(get_initial_data())
+    assert get_request_ids(synchronized_data.dispatched_user_requests) == [
+        "id_0",
+        "id_1",
+    ]
+    assert len(synchronized_data.mech_requests) == 2
+
+    round_ = PostTxDecisionMakingRound(
+        synchronized_data.update(
+            post_tx_event=Event.MECH.value, final_tx_hash="0x" + "01" * 32
+        ),
+        mock.MagicMock(),
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data, event = result
+    assert event == Event.MECH
+    assert not synchronized_data.dispatched_user_requests
+    assert not synchronized_data.user_requests
+
+
+def test_skipped_mech_requests_are_dispatched_again() -> None:
+    """Test that the user requests are dispatched again when decision making follows a skipped mech request."""
+    # the mech interaction skips the request and goes back to decision making
+    synchronized_data = decide(decide(get_initial_data()))
+    assert get_request_ids(synchronized_data.dispatched_user_requests) == [
+        "id_0",
+        "id_1",
+    ]
+    assert len(synchronized_data.mech_requests) == 2
+
+
+def test_user_requests_survive_a_reset() -> None:
+    """Test that the agreed user requests and the dispatched ones are carried over to the next period."""
+    synchronized_data = decide(get_initial_data())
+    synchronized_data = synchronized_data.create()
+    assert get_request_ids(synchronized_data.user_requests) == ["id_0", "id_1"]
+
+
+def test_cache_misses_are_counted_once_the_mech_requests_are_sent() -> None:
+    """Test that the prompts only count as cache misses once, when the transaction of their mech requests is settled."""
+    behaviour = make_behaviour(
+        DecisionMakingBehaviour, get_initial_data(), prompt_cache_size=10
+    )
+    # e.g., the decision making round is run again after no majority has been reached
+    for _ in range(2):
+        run(behaviour.get_payload_data())
+    assert behaviour.local_state.prompt_cache_misses == 0
+
+    round_ = PostTxDecisionMakingRound(
+        decide(get_initial_data()).update(
+            post_tx_event=Event.MECH.value, final_tx_hash="0x" + "01" * 32
+        ),
+        mock.MagicMock(),
+    )
+    result = round_.end_block()
+    assert result is not None
+    synchronized_data, _ = result
+    set_synchronized_data(behaviour, synchronized_data)
+    for _ in range(2):
+        behaviour.track_settlement()
+    assert behaviour.local_state.prompt_cache_misses == len(USER_REQUESTS)